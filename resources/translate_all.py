@@ -2,12 +2,14 @@ import argparse
 import json
 import re
 import asyncio
-import functools
-from aiolimiter import AsyncLimiter
+import sys
+from pathlib import Path
 
-from openai import OpenAI
-
-client = OpenAI()
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts"))
+from common.word_base import WordBase
+from common.fingerprints import Fingerprints, translations_fingerprint
+from common.journal import Journal, default_journal_path
+from common.openai_scheduler import RequestScheduler
 
 
 TARGET_LANGS = ["uk", "ar", "fa", "so", "es", "de", "fr", "pl", "id", "hi", "zh", "it", "tr", "sr", "fi", "et", "be", "lv", "lt"]
@@ -18,20 +20,19 @@ def extract_json(text):
         return match.group(1)
     return text
 
+def parse_translations(content):
+    parsed = json.loads(extract_json(content))
+    if not isinstance(parsed, dict):
+        raise ValueError("ответ не является JSON-словарём")
+    return parsed
+
 def merge_translations(existing, new):
     for lang, translation in new.items():
         if lang not in existing:
             existing[lang] = translation
     return existing
 
-def find_entry_by_id(data, entry_id):
-    for category in data:
-        for entry in category.get("entries", []):
-            if entry.get("id") == entry_id:
-                return entry
-    return None
-
-async def translate_from_ru_and_en_async(limiter, ru_text, en_text=""):
+async def translate_from_ru_and_en_async(scheduler, ru_text, en_text=""):
     messages = [
         {
             "role": "system",
@@ -48,59 +49,73 @@ async def translate_from_ru_and_en_async(limiter, ru_text, en_text=""):
         }
     ]
 
-    await limiter.acquire()
-
     try:
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None,
-            functools.partial(
-                client.chat.completions.create,
-                model="gpt-4o",
-                messages=messages,
-                temperature=0
-            )
-        )
-        content = response.choices[0].message.content
-        cleaned = extract_json(content)
-        parsed = json.loads(cleaned)
-        return parsed
+        content = await scheduler.chat(messages, model="gpt-4o", temperature=0, validate=parse_translations)
+        return parse_translations(content)
     except Exception as e:
         print(f"❌ Ошибка при переводе '{ru_text}': {e}")
         return {}
 
-async def process_entry(limiter, entry):
+async def process_entry(scheduler, entry, journal=None, replace=False):
     ru_word = entry.get("translations", {}).get("ru")
     en_word = entry.get("translations", {}).get("en", "")
     print(f"🔍 Слово: '{entry.get('word')}', ru: '{ru_word}', en: '{en_word}'")
     if ru_word:
-        translated = await translate_from_ru_and_en_async(limiter, ru_word, en_word)
+        translated = await translate_from_ru_and_en_async(scheduler, ru_word, en_word)
         print(f"➡️ Добавленные переводы: {translated}")
-        entry["translations"] = merge_translations(entry.get("translations", {}), translated)
+        if replace:
+            # ru/en изменились с прошлого перевода: производные переводы заменяются, а не дополняются
+            translated = {lang: text for lang, text in translated.items() if lang not in ("ru", "en")}
+            entry.setdefault("translations", {}).update(translated)
+        else:
+            entry["translations"] = merge_translations(entry.get("translations", {}), translated)
+        if journal is not None and translated:
+            journal.record("translate", entry.get("id"), {"translations": entry["translations"]})
 
-async def process_category(limiter, category):
+async def process_category(scheduler, category, journal=None, done=(), fingerprints=None):
     ru_cat = category.get("translations", {}).get("ru", "")
     en_cat = category.get("translations", {}).get("en", "")
-    if ru_cat:
-        translated_cat = await translate_from_ru_and_en_async(limiter, ru_cat, en_cat)
+    if ru_cat and category.get("id") not in done:
+        translated_cat = await translate_from_ru_and_en_async(scheduler, ru_cat, en_cat)
         category["translations"] = merge_translations(category.get("translations", {}), translated_cat)
+        if journal is not None and translated_cat:
+            journal.record("translate", category.get("id"), {"translations": category["translations"]}, kind="category")
 
     tasks = []
     for entry in category.get("entries", []):
-        tasks.append(process_entry(limiter, entry))
+        if entry.get("id") in done:
+            continue
+        stored = fingerprints.get(entry.get("id"), "translations") if fingerprints else None
+        if stored == translations_fingerprint(entry):
+            continue
+        tasks.append(process_entry(scheduler, entry, journal, replace=stored is not None))
     await asyncio.gather(*tasks)
 
 async def translate_all_async(input_path, args):
-    with open(input_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    limiter = AsyncLimiter(1, 2)  # 1 request every 2 seconds
-    for category in data:
-        await process_category(limiter, category)
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-    return data
+    # Каждый готовый перевод сразу дописывается в журнал; после сбоя повторный запуск пропускает уже переведённое.
+    word_base = WordBase.load(input_path)
+    journal = Journal(args.journal or default_journal_path(args.output, "translate"))
+    done = journal.replay(word_base, job="translate")
+    # Отпечатки ru/en хранятся рядом с выходным файлом: неизменённые записи повторно не переводятся
+    fingerprints = Fingerprints.for_base(args.output)
+
+    async with RequestScheduler.from_args(args) as scheduler:
+        with journal:
+            await asyncio.gather(*(process_category(scheduler, category, journal, done, fingerprints) for category in word_base.categories()))
+        scheduler.report()
+
+    for entry_id in done | journal.recorded:
+        entry = word_base.entry(entry_id)
+        if entry is not None:
+            fingerprints.record(entry_id, "translations", translations_fingerprint(entry))
+    word_base.save(args.output)
+    journal.discard()
+    fingerprints.save()
+    return word_base.data
+
+async def with_scheduler(args, work):
+    async with RequestScheduler.from_args(args) as scheduler:
+        return await work(scheduler)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -109,45 +124,44 @@ if __name__ == "__main__":
     parser.add_argument("--categories", help="IDs категорий, разделённые запятой")
     parser.add_argument("--input", default="word.json", help="Path to input JSON")
     parser.add_argument("--output", default="translated_words.json", help="Path to output JSON")
+    parser.add_argument("--journal", help="Журнал готовых переводов (по умолчанию <output>.translate.journal.jsonl рядом с output)")
+    RequestScheduler.add_arguments(parser)
     args = parser.parse_args()
 
     if args.id:
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        word_base = WordBase.load(args.input)
         print(f"🎯 Переводим только слово с ID: {args.id}")
-        entry = find_entry_by_id(data, args.id)
+        entry = word_base.entry(args.id)
         if entry:
             ru_text = entry.get("translations", {}).get("ru")
             en_text = entry.get("translations", {}).get("en", "")
             if ru_text:
-                translated = asyncio.run(translate_from_ru_and_en_async(AsyncLimiter(1,2), ru_text, en_text))
+                translated = asyncio.run(with_scheduler(args, lambda scheduler: translate_from_ru_and_en_async(scheduler, ru_text, en_text)))
                 entry["translations"] = merge_translations(entry.get("translations", {}), translated)
             else:
                 print("⚠️ Нет русского перевода у записи")
         else:
             print("❌ Запись с таким ID не найдена")
     elif args.category:
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        word_base = WordBase.load(args.input)
 
-        selected_category = next((cat for cat in data if cat.get("id") == args.category), None)
+        selected_category = word_base.category(args.category)
         if selected_category:
             print(f"🎯 Переводим только категорию с ID: {args.category}")
-            asyncio.run(process_category(AsyncLimiter(1,2), selected_category))
+            asyncio.run(with_scheduler(args, lambda scheduler: process_category(scheduler, selected_category)))
             with open(f"translated_{args.category}.json", "w", encoding="utf-8") as f:
                 json.dump(selected_category, f, ensure_ascii=False, indent=2)
         else:
             print("❌ Категория с таким ID не найдена")
     elif args.categories:
-        with open(args.input, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        word_base = WordBase.load(args.input)
 
         category_ids = [c.strip() for c in args.categories.split(",")]
         for cid in category_ids:
-            selected_category = next((cat for cat in data if cat.get("id") == cid), None)
+            selected_category = word_base.category(cid)
             if selected_category:
                 print(f"🎯 Переводим категорию с ID: {cid}")
-                asyncio.run(process_category(AsyncLimiter(1, 2), selected_category))
+                asyncio.run(with_scheduler(args, lambda scheduler: process_category(scheduler, selected_category)))
                 with open(f"translated_{cid}.json", "w", encoding="utf-8") as f:
                     json.dump(selected_category, f, ensure_ascii=False, indent=2)
             else:
@@ -2,14 +2,22 @@ import argparse
 import json
 import re
 import asyncio
-import functools
-import os
-from aiolimiter import AsyncLimiter
-import requests
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts"))
+from common.openai_scheduler import RequestScheduler
 
 TARGET_LANGS = ["uk", "ar", "es", "de", "fr", "pl", "id", "hi", "zh", "it", "tr", "fi"]
 
-async def translate_phrase(limiter, en_text, ru_text=""):
+def parse_translations(content):
+    # Вырезаем JSON из блока ```json ... ```
+    match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
+    if not match:
+        raise ValueError("Ответ не содержит JSON-блока")
+    return json.loads(match.group(1))
+
+async def translate_phrase(scheduler, en_text, ru_text=""):
     prompt = (
         "Translate the following English phrase into the following languages, using the Russian variant as an additional reference when needed: "
         + ", ".join(TARGET_LANGS) +
@@ -29,51 +37,21 @@ async def translate_phrase(limiter, en_text, ru_text=""):
         }
     ]
 
-    await limiter.acquire()
-
     try:
-        loop = asyncio.get_running_loop()
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"
-        }
+        content = await scheduler.chat(messages, model="gpt-4o", temperature=0, validate=parse_translations)
 
-        data = {
-            "model": "gpt-4o",
-            "messages": messages,
-            "temperature": 0
-        }
+        print("📡 Raw OpenAI response:", content)
 
-        response = await loop.run_in_executor(
-            None,
-            functools.partial(requests.post,
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data
-            )
-        )
-
-        print("📡 Raw OpenAI response:", response.text)
-
-        content = response.json()["choices"][0]["message"]["content"]
-
-        # Вырезаем JSON из блока ```json ... ```
-        match = re.search(r"```json\s*(\{.*?\})\s*```", content, re.DOTALL)
-        if not match:
-            raise ValueError("Ответ не содержит JSON-блока")
-        parsed = json.loads(match.group(1))
-        return parsed
+        return parse_translations(content)
     except Exception as e:
         print(f"❌ Ошибка при обработке ответа OpenAI для '{en_text}': {e}")
         return {}
 
-async def main(input_path, output_path):
+async def main(input_path, output_path, scheduler):
     # 1. Загрузить входной файл
     with open(input_path, "r", encoding="utf-8") as f:
         input_data = json.load(f)
 
-    limiter = AsyncLimiter(1, 2)  # 1 запрос каждые 2 секунды
-
     en_items = {}
     ru_items = {}
     sv_items = {}
@@ -95,11 +73,17 @@ async def main(input_path, output_path):
 
     result = {}
 
-    for key, en_text in en_items.items():
+    async def translate_key(key, en_text):
         ru_text = ru_items.get(key, "")
-        sv_text = sv_items.get(key, "")
         print(f"🔍 Переводим ключ: '{key}', en: '{en_text}', ru: '{ru_text}'")
-        translations = await translate_phrase(limiter, en_text, ru_text)
+        return await translate_phrase(scheduler, en_text, ru_text)
+
+    # Все ключи переводятся параллельно, результат собирается в исходном порядке
+    all_translations = await asyncio.gather(*(translate_key(key, en_text) for key, en_text in en_items.items()))
+
+    for (key, en_text), translations in zip(en_items.items(), all_translations):
+        ru_text = ru_items.get(key, "")
+        sv_text = sv_items.get(key, "")
         
         entry = {
             "extractionState": "manual",
@@ -148,7 +132,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", default="Localizable.xcstrings", help="Path to input JSON")
     parser.add_argument("--output", default="Localizable_translated.xcstrings", help="Path to output JSON")
+    RequestScheduler.add_arguments(parser)
     args = parser.parse_args()
 
-    asyncio.run(main(args.input, args.output))
+    async def run():
+        async with RequestScheduler.from_args(args) as scheduler:
+            await main(args.input, args.output, scheduler)
+            scheduler.report()
+
+    asyncio.run(run())
     print(f"✅ Сохранено в {args.output}")
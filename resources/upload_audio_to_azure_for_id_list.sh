@@ -623,7 +623,10 @@ WORD_IDS=(
  for id in "${WORD_IDS[@]}"; do
    CLEANED_WORD_IDS+=("$(echo "$id" | tr -d ',[:space:]')")
  done
+# Все слова загружаются одним запуском, параллельно
+ID_ARGS=()
 for WORD_ID in "${CLEANED_WORD_IDS[@]}"; do
-  echo "📤 Загрузка аудио для слова $WORD_ID"
-  ./upload_audio_to_azure.sh --id "$WORD_ID" --overwrite
+  ID_ARGS+=(--id "$WORD_ID")
 done
+echo "📤 Загрузка аудио для ${#CLEANED_WORD_IDS[@]} слов"
+./upload_audio_to_azure.sh "${ID_ARGS[@]}" --overwrite
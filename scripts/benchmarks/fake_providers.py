@@ -0,0 +1,339 @@
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LEVELS = ["a1", "a2", "b1", "b2", "c1", "c2"]
+# One silent MPEG-1 Layer III frame (128 kbit/s, 44.1 kHz): 417 bytes, about 26 ms of audio.
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)
+MALFORMED_KINDS = ["fenced", "prose", "truncated"]
+
+
+def parse_latency(spec):
+    """Returns a sampler of delays in seconds for specs like "fixed:50", "uniform:20:200",
+    "normal:100:30" or "lognormal:100:0.5" (median and sigma); all times are in milliseconds."""
+    kind, *params = spec.split(":")
+    params = [float(value) for value in params]
+    samplers = {
+        "fixed": lambda rng: params[0],
+        "uniform": lambda rng: rng.uniform(params[0], params[1]),
+        "normal": lambda rng: max(0.0, rng.gauss(params[0], params[1])),
+        "lognormal": lambda rng: rng.lognormvariate(math.log(params[0]), params[1]) if params[0] > 0 else 0.0,
+    }
+    if kind not in samplers:
+        raise argparse.ArgumentTypeError(f"unknown latency distribution '{kind}'")
+    sampler = samplers[kind]
+    return lambda rng: sampler(rng) / 1000
+
+
+class RequestBudget:
+    """Requests-per-minute bucket reported through OpenAI-style x-ratelimit-* headers; 0 means unlimited."""
+
+    def __init__(self, rpm):
+        self.rpm = rpm
+        self.available = rpm
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Returns (allowed, remaining, seconds until one request is available)."""
+        if not self.rpm:
+            return True, None, 0
+        with self.lock:
+            now = time.monotonic()
+            self.available = min(self.rpm, self.available + (now - self.updated) * self.rpm / 60)
+            self.updated = now
+            if self.available >= 1:
+                self.available -= 1
+                return True, int(self.available), 0
+            return False, 0, (1 - self.available) * 60 / self.rpm
+
+
+def chat_answer(messages):
+    """A plausible answer for each prompt the scripts send, in the JSON shape they parse."""
+    system = " ".join(message.get("content") or "" for message in messages if message.get("role") == "system")
+    user = messages[-1].get("content") or "" if messages else ""
+    prompt = system + "\n" + user
+    if "CEFR" in prompt:
+        if "JSON array" in system:
+            return [{"id": item.get("id"), "level": random.choice(LEVELS)} for item in json.loads(user)]
+        return {"level": random.choice(LEVELS)}
+    if "'forms'" in prompt or '"forms"' in prompt:
+        word = re.search(r"For the word '([^']*)'", prompt)
+        word = word.group(1) if word else "ord"
+        return {
+            "en": f"{word} (en)",
+            "forms": [{"form": word + suffix} for suffix in ("en", "ar", "arna")],
+            "examples": [{"text": f"Exempel {index} med {word}."} for index in range(1, 11)],
+        }
+    langs = re.search(r"following languages: ([a-z, ]+)\.", prompt)
+    if langs:
+        codes = [code.strip() for code in langs.group(1).split(",") if code.strip()]
+        source = user.splitlines()[0].split(":", 1)[-1].strip() if user else "text"
+        return {code: f"{source} [{code}]" for code in codes}
+    return {"answer": "ok"}
+
+
+def batch_responder(body):
+    """Responder for LocalBatchBackend (bulk_batch.py --backend local --local-responder ...)."""
+    return json.dumps(chat_answer(body["messages"]), ensure_ascii=False)
+
+
+def request_json(body):
+    """The request body as a JSON object; ValueError when it is anything else."""
+    request = json.loads(body or b"{}")
+    if not isinstance(request, dict):
+        raise ValueError("the request body must be a JSON object")
+    return request
+
+
+def malformed(content, rng):
+    """Content the way models sometimes send it: fenced in markdown, wrapped in prose or cut off."""
+    kind = rng.choice(MALFORMED_KINDS)
+    if kind == "fenced":
+        return f"```json\n{content}\n```"
+    if kind == "prose":
+        return f"Sure! Here is the result:\n{content}\nLet me know if you need anything else."
+    return content[:max(1, len(content) // 2)]
+
+
+def fake_mp3(text):
+    # Roughly the length real speech would have, so size-based tooling sees realistic files.
+    return MP3_FRAME * max(10, min(2000, len(text) * 3))
+
+
+class FakeProviders:
+    """Fault injection settings and counters shared by all request handler threads."""
+
+    def __init__(self, chat_latency, tts_latency, rpm=0, throttle_rate=0.0, retry_after=1.0,
+                 timeout_rate=0.0, hang_seconds=30.0, error_rate=0.0, malformed_rate=0.0, seed=None):
+        self.chat_latency = chat_latency
+        self.tts_latency = tts_latency
+        self.budget = RequestBudget(rpm)
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+
+    def count(self, provider, outcome):
+        with self.lock:
+            self.stats[f"{provider}.{outcome}"] += 1
+
+    def roll(self, rate):
+        with self.lock:
+            return self.rng.random() < rate
+
+    def delay(self, latency):
+        with self.lock:
+            return latency(self.rng)
+
+    def fault(self, provider):
+        """One injected fault for this request: "throttle", "timeout", "error" or None."""
+        for kind, rate in (("throttle", self.throttle_rate), ("timeout", self.timeout_rate), ("error", self.error_rate)):
+            if self.roll(rate):
+                self.count(provider, kind)
+                return kind
+        return None
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeProviders/1.0"
+
+    @property
+    def fakes(self):
+        return self.server.fakes
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send(self, status, body, content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def hang(self):
+        # Hold the connection past any sensible client timeout, then drop it without answering.
+        time.sleep(self.fakes.hang_seconds)
+        self.close_connection = True
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send(200, dict(self.fakes.stats))
+        else:
+            self.send(404, {"error": "not found"})
+
+    def do_POST(self):
+        body = self.read_body()
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/chat/completions"):
+            self.chat(body)
+        elif path.endswith("/cognitiveservices/v1"):
+            self.azure_tts(body)
+        elif path == "/v1/speech":
+            self.polly(body)
+        else:
+            self.send(404, {"error": "not found"})
+
+    def chat(self, body):
+        fakes = self.fakes
+        allowed, remaining, wait = fakes.budget.take()
+        limit_headers = {}
+        if fakes.budget.rpm:
+            limit_headers = {
+                "x-ratelimit-limit-requests": fakes.budget.rpm,
+                "x-ratelimit-remaining-requests": remaining,
+                "x-ratelimit-reset-requests": f"{wait:.3f}s",
+            }
+        fault = "throttle" if not allowed else fakes.fault("openai")
+        if fault == "throttle":
+            if not allowed:
+                fakes.count("openai", "throttle")
+            retry = max(wait, fakes.retry_after)
+            headers = dict(limit_headers, **{"retry-after": f"{retry:.3f}", "retry-after-ms": int(retry * 1000)})
+            self.send(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}, headers=headers)
+            return
+        if fault == "timeout":
+            self.hang()
+            return
+        time.sleep(fakes.delay(fakes.chat_latency))
+        if fault == "error":
+            self.send(500, {"error": {"message": "The server had an error while processing your request.", "type": "server_error"}})
+            return
+
+        try:
+            request = request_json(body)
+            messages = request.get("messages", [])
+            if not isinstance(messages, list) or not all(
+                isinstance(message, dict) and isinstance(message.get("content") or "", str) for message in messages
+            ):
+                raise ValueError("'messages' must be a list of objects with text content")
+        except (ValueError, AttributeError) as e:
+            fakes.count("openai", "invalid")
+            self.send(400, {"error": {"message": f"Invalid request: {e}", "type": "invalid_request_error"}}, headers=limit_headers)
+            return
+        try:
+            content = json.dumps(chat_answer(messages), ensure_ascii=False)
+        except (ValueError, AttributeError):
+            content = "{}"
+        if fakes.roll(fakes.malformed_rate):
+            fakes.count("openai", "malformed")
+            with fakes.lock:
+                content = malformed(content, fakes.rng)
+        fakes.count("openai", "ok")
+        prompt_tokens = sum(len(message.get("content") or "") for message in messages) // 4
+        completion_tokens = len(content) // 4
+        self.send(200, {
+            "id": f"chatcmpl-fake-{time.monotonic_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }, headers=limit_headers)
+
+    def azure_tts(self, body):
+        fakes = self.fakes
+        fault = fakes.fault("azure")
+        if fault == "throttle":
+            self.send(429, b"Too many requests", "text/plain", {"Retry-After": math.ceil(fakes.retry_after)})
+            return
+        if fault == "timeout":
+            self.hang()
+            return
+        time.sleep(fakes.delay(fakes.tts_latency))
+        if fault == "error":
+            self.send(503, b"Service unavailable", "text/plain")
+            return
+        text = re.sub(r"<[^>]+>", "", body.decode("utf-8", "replace")).strip()
+        fakes.count("azure", "ok")
+        self.send(200, fake_mp3(text), "audio/mpeg")
+
+    def polly(self, body):
+        fakes = self.fakes
+        fault = fakes.fault("polly")
+        if fault == "throttle":
+            headers = {"x-amzn-ErrorType": "ThrottlingException", "Retry-After": math.ceil(fakes.retry_after)}
+            self.send(400, {"__type": "ThrottlingException", "message": "Rate exceeded"}, "application/x-amz-json-1.1", headers)
+            return
+        if fault == "timeout":
+            self.hang()
+            return
+        time.sleep(fakes.delay(fakes.tts_latency))
+        if fault == "error":
+            self.send(500, {"__type": "ServiceFailureException", "message": "Internal failure"}, headers={"x-amzn-ErrorType": "ServiceFailureException"})
+            return
+        try:
+            text = request_json(body).get("Text", "")
+            if not isinstance(text, str):
+                raise ValueError("'Text' must be a string")
+        except (ValueError, AttributeError):
+            fakes.count("polly", "invalid")
+            self.send(400, {"__type": "InvalidSsmlException", "message": "Invalid request"}, headers={"x-amzn-ErrorType": "InvalidSsmlException"})
+            return
+        text = re.sub(r"<[^>]+>", "", text).strip()
+        fakes.count("polly", "ok")
+        self.send(200, fake_mp3(text), "audio/mpeg", {"x-amzn-RequestCharacters": len(text)})
+
+
+def serve(fakes, host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.fakes = fakes
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-ins for the OpenAI chat, Azure TTS and Polly endpoints with fault injection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--chat-latency", type=parse_latency, default="lognormal:400:0.5", help="Chat latency distribution in ms, e.g. fixed:50, uniform:20:200, normal:100:30, lognormal:400:0.5")
+    parser.add_argument("--tts-latency", type=parse_latency, default="lognormal:150:0.3", help="TTS latency distribution in ms")
+    parser.add_argument("--rpm", type=int, default=0, help="Chat requests per minute before answering 429 (0: unlimited)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429 / ThrottlingException")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with injected throttling")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of requests that hang and are dropped unanswered")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="How long a timed-out request holds its connection")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 5xx error")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of chat answers that are fenced, wrapped in prose or truncated")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible fault injection")
+    args = parser.parse_args()
+
+    fakes = FakeProviders(
+        args.chat_latency, args.tts_latency, rpm=args.rpm, throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+        timeout_rate=args.timeout_rate, hang_seconds=args.hang_seconds, error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate, seed=args.seed,
+    )
+    server = serve(fakes, args.host, args.port)
+    base = f"http://{args.host}:{args.port}"
+    print(f"🧪 Fake providers listening on {base}. Point the scripts at them with:")
+    print(f"   export OPENAI_BASE_URL={base}/v1 OPENAI_API_KEY=fake")
+    print(f"   export AZURE_TTS_ENDPOINT={base}/cognitiveservices/v1 AZURE_TTS_KEY=fake")
+    print(f"   export AWS_POLLY_ENDPOINT={base} AWS_ACCESS_KEY_ID=fake AWS_SECRET_ACCESS_KEY=fake")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(dict(sorted(fakes.stats.items())))}")
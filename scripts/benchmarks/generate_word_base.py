@@ -0,0 +1,90 @@
+import argparse
+import json
+import random
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.audio_layout import DEFAULT_VOICE_ID
+
+LANGS = ["ru", "en", "uk", "ar", "fa", "so", "es", "de", "fr", "pl", "id", "hi", "zh", "it", "tr", "sr", "fi", "et", "be", "lv", "lt"]
+LEVELS = ["a1", "a2", "b1", "b2", "c1", "c2"]
+VOICES = [DEFAULT_VOICE_ID, "a1e12345-1111-4e00-aaaa-000000000002"]
+SYLLABLES = ["ka", "lo", "sa", "ri", "be", "ta", "mö", "fä", "gå", "ny", "ste", "bro", "hus", "ord", "vän", "lek", "dag", "sjö"]
+WORDS_PER_CATEGORY = 500
+# fill_word_details.py asks for at least 10 examples; entries that were never filled (version -1) have a few at most.
+FILLED_EXAMPLES = (10, 15)
+UNFILLED_EXAMPLES = (0, 2)
+
+
+def random_uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def random_word(rng, syllables=(2, 4)):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(*syllables)))
+
+
+def random_sentence(rng):
+    words = [random_word(rng, (1, 3)) for _ in range(rng.randint(4, 10))]
+    return " ".join(words).capitalize() + "."
+
+
+def random_entry(rng):
+    base = random_word(rng)
+    word = rng.choice(["", "", "en ", "ett ", "att "]) + base
+    version = rng.choice([-1, 1, 1, 1, 2])
+    entry = {
+        "id": random_uuid(rng),
+        "word": word,
+        "version": version,
+    }
+    if version > -1:
+        entry["voiceEntries"] = [rng.choice(VOICES)]
+    forms = [{"form": base + suffix} for suffix in rng.sample(["en", "et", "ar", "or", "na", "de", "t"], rng.randint(0, 4))]
+    if forms:
+        entry["forms"] = forms
+    entry["translations"] = {lang: f"{random_word(rng, (1, 3))}, {random_word(rng, (1, 2))}" if rng.random() < 0.3 else random_word(rng, (1, 3)) for lang in LANGS}
+    if rng.random() < 0.9:
+        entry["level"] = rng.choice(LEVELS)
+    examples = FILLED_EXAMPLES if version > -1 else UNFILLED_EXAMPLES
+    entry["examples"] = [{"text": random_sentence(rng)} for _ in range(rng.randint(*examples))]
+    if rng.random() < 0.05:
+        entry["phoneme"] = base
+    return entry
+
+
+def generate_word_base(entries, seed=0, words_per_category=WORDS_PER_CATEGORY):
+    """Synthetic word.json data following the app's Category/WordEntry schema, deterministic for a seed."""
+    rng = random.Random(seed)
+    categories = []
+    remaining = entries
+    while remaining > 0:
+        count = min(remaining, rng.randint(words_per_category // 2, words_per_category * 3 // 2))
+        categories.append({
+            "id": random_uuid(rng),
+            "translations": {lang: random_word(rng) for lang in LANGS},
+            "entries": [random_entry(rng) for _ in range(count)],
+        })
+        remaining -= count
+    return categories
+
+
+def write_word_base(path, entries, seed=0):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_word_base(entries, seed), f, ensure_ascii=False, indent=2)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic word.json for benchmarks.")
+    parser.add_argument("--entries", type=int, default=1000, help="Number of word entries (1k to 500k)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same file")
+    parser.add_argument("--out", default="build/bench/word.json", help="Output path")
+    args = parser.parse_args()
+
+    path = write_word_base(args.out, args.entries, args.seed)
+    print(f"✅ Generated {args.entries} entries in {path} ({path.stat().st_size / 1024 / 1024:.1f} MiB)")
@@ -0,0 +1,317 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import Future
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(SCRIPTS_DIR))
+sys.path.append(str(SCRIPTS_DIR / "word"))
+sys.path.append(str(SCRIPTS_DIR / "release"))
+from generate_word_base import write_word_base
+from common.audio_inventory import AudioInventory
+from common.audio_layout import entry_audio_dir
+from common.blob_sync import BlobManifest, BlobSync
+from common.fingerprints import Fingerprints, clip_fingerprints
+from common.word_base import WordBase
+from common.word_stream import iter_entries
+from compile_word_base import compile_word_base
+from compute_level_word import determine_levels_batched
+from generate_audio_for_words import changed_clips, generate_entry_audio
+from shard_translations import export_shards
+from validate_word_base import Validator
+
+CHANGED_SHARE = 0.01
+LOOKUPS = 100_000
+VOICE_IDS = {"a1e12345-1111-4e00-aaaa-000000000001", "a1e12345-1111-4e00-aaaa-000000000002"}
+
+
+class FakeTTSEngine:
+    """In-process stand-in for TTSEngine: every clip is "synthesized" instantly and nothing is written."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def voice(self, voice_id):
+        return {"id": voice_id}
+
+    def submit(self, text, phoneme, output_path, voice_id=None):
+        self.submitted += 1
+        future = Future()
+        future.set_result(output_path)
+        return future
+
+
+class FakeScheduler:
+    """In-process stand-in for RequestScheduler that answers level batches immediately."""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def chat(self, messages, **kwargs):
+        self.requests += 1
+        items = json.loads(messages[-1]["content"])
+        return json.dumps([{"id": item["id"], "level": "b1"} for item in items])
+
+
+def sample(rng, items, share):
+    return set(rng.sample(items, max(1, int(len(items) * share)))) if items else set()
+
+
+def expected_clips(word_base):
+    """{root-relative clip path: (category id, entry)} for the whole base."""
+    clips = {}
+    for category, entry in word_base.entries():
+        directory = entry_audio_dir("", category["id"], entry).as_posix()
+        for name in clip_fingerprints(entry):
+            clips[f"{directory}/{name}"] = (category["id"], entry)
+    return clips
+
+
+class Context:
+    def __init__(self, input_path, work_dir, seed):
+        self.input_path = Path(input_path)
+        self.work_dir = Path(work_dir)
+        self.rng = random.Random(seed)
+        self._word_base = None
+        self._clips = None
+
+    def word_base(self):
+        if self._word_base is None:
+            self._word_base = WordBase.load(self.input_path)
+        return self._word_base
+
+    def clips(self):
+        if self._clips is None:
+            self._clips = expected_clips(self.word_base())
+        return self._clips
+
+
+# Each benchmark takes the context, does its untimed setup and returns the function to time,
+# or (reset, run) when state has to be rebuilt, untimed, before every run.
+
+def bench_load(ctx):
+    return lambda: WordBase.load(ctx.input_path)
+
+
+def bench_stream(ctx):
+    return lambda: sum(1 for _ in iter_entries(ctx.input_path))
+
+
+def bench_lookup(ctx):
+    word_base = ctx.word_base()
+    ids = list(word_base.entries_by_id)
+    queries = [ctx.rng.choice(ids) for _ in range(LOOKUPS)]
+
+    def run():
+        for word_id in queries:
+            word_base.entry(word_id)
+            word_base.category_of(word_id)
+    return run
+
+
+def bench_save(ctx):
+    word_base = ctx.word_base()
+    return lambda: word_base.save(ctx.work_dir / "saved.json")
+
+
+def bench_validate(ctx):
+    # Schema, duplicate and voice checks over the file, then the clip diff against a tree missing 1% of clips.
+    present = set(ctx.clips()) - sample(ctx.rng, list(ctx.clips()), CHANGED_SHARE)
+
+    def run():
+        validator = Validator(audio_dir=ctx.work_dir, voice_ids=VOICE_IDS)
+        expected, _, _ = validator.check_base(ctx.input_path)
+        validator.check_audio(expected, present)
+        return len(validator.issues)
+    return run
+
+
+def bench_audio_plan(ctx):
+    # Fingerprints match the base except for 1% of entries; the inventory misses 1% of clips.
+    word_base = ctx.word_base()
+    changed_ids = sample(ctx.rng, list(word_base.entries_by_id), CHANGED_SHARE)
+    fingerprints = Fingerprints(ctx.work_dir / "fingerprints.json")
+    for _, entry in word_base.entries():
+        clips = clip_fingerprints(entry)
+        if entry["id"] in changed_ids:
+            clips = {name: "0" for name in clips}
+        fingerprints.entries[entry["id"]] = {"audio": clips}
+    missing = sample(ctx.rng, list(ctx.clips()), CHANGED_SHARE)
+    present = [ctx.work_dir / "audio" / path for path in ctx.clips() if path not in missing]
+    inventory = None
+
+    def reset():
+        # Generated clips are added to the inventory, so every run starts from a fresh one.
+        nonlocal inventory
+        inventory = AudioInventory(ctx.work_dir / "audio", cache_path=ctx.work_dir / "inventory.json")
+        for path in present:
+            inventory.add(path)
+
+    def run():
+        engine = FakeTTSEngine()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for category, entry in word_base.entries():
+                force = changed_clips(fingerprints, entry)
+                generate_entry_audio(engine, category["id"], dict(entry), ctx.work_dir / "audio", inventory=inventory, force=force)
+        return engine.submitted
+    return reset, run
+
+
+def bench_export_sqlite(ctx):
+    return lambda: compile_word_base(ctx.input_path, ctx.work_dir / "word_base.sqlite")
+
+
+def bench_export_shards(ctx):
+    def run():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            export_shards(ctx.input_path, ctx.work_dir / "shards")
+    return run
+
+
+def bench_upload_diff(ctx):
+    # Manifest and listing agree except for 1% changed, 1% missing remotely and 1% remote-only blobs.
+    names = list(ctx.clips())
+    local = {name: (Path(name), 20_000, 1) for name in names}
+    changed = sample(ctx.rng, names, CHANGED_SHARE)
+    missing = sample(ctx.rng, names, CHANGED_SHARE)
+    manifest_entries = {name: {"size": 20_000, "mtime_ns": 1, "md5": "m", "etag": "e"} for name in names}
+    remote = {name: (20_000, "changed" if name in changed else "e", None) for name in names if name not in missing}
+    remote.update({f"gone/{index}.mp3": (20_000, "e", None) for index in range(len(missing))})
+
+    def run():
+        manifest = BlobManifest(ctx.work_dir / "manifest.json")
+        manifest.entries = {name: dict(entry) for name, entry in manifest_entries.items()}
+        uploads, deletes = BlobSync(None, ctx.work_dir, manifest, delete=True).plan(local, remote)
+        return len(uploads), len(deletes)
+    return run
+
+
+def bench_level_batching(ctx):
+    words = [dict(entry) for _, entry in ctx.word_base().entries()]
+
+    def run():
+        scheduler = FakeScheduler()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            asyncio.run(determine_levels_batched(words, scheduler))
+        return scheduler.requests
+    return run
+
+
+BENCHMARKS = {
+    "load": bench_load,
+    "stream": bench_stream,
+    "lookup": bench_lookup,
+    "save": bench_save,
+    "validate": bench_validate,
+    "audio_plan": bench_audio_plan,
+    "export_sqlite": bench_export_sqlite,
+    "export_shards": bench_export_shards,
+    "upload_diff": bench_upload_diff,
+    "level_batching": bench_level_batching,
+}
+
+
+def measure(bench, repeat, memory):
+    reset, run = bench if isinstance(bench, tuple) else (None, bench)
+    timings = []
+    for _ in range(repeat):
+        if reset:
+            reset()
+        started = time.perf_counter()
+        value = run()
+        timings.append(time.perf_counter() - started)
+    result = {"seconds": min(timings), "runs": timings}
+    if memory:
+        # A separate traced run, so tracing overhead does not distort the timings.
+        if reset:
+            reset()
+        tracemalloc.start()
+        run()
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    if isinstance(value, (int, float, tuple)):
+        result["result"] = value
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Prints the change against a baseline results file; returns the names that got slower than threshold."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["seconds"] / max(baseline[name]["seconds"], 1e-9)
+        marker = "🔴" if ratio > 1 + threshold else "🟢"
+        print(f"{marker} {name}: {ratio:.2f}x of baseline")
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the word-base tooling on a synthetic base.")
+    parser.add_argument("--entries", type=int, default=10_000, help="Size of the synthetic base (1k to 500k)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic base")
+    parser.add_argument("--file", help="Benchmark an existing word.json instead of a synthetic one")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark; the best is reported")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced run that measures peak memory")
+    parser.add_argument("--out", help="Results JSON (default: build/bench/results_<entries>.json)")
+    parser.add_argument("--compare", help="Baseline results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    input_path = Path(args.file) if args.file else Path(f"build/bench/word_{args.entries}_{args.seed}.json")
+    if not input_path.exists():
+        print(f"🧪 Generating {args.entries} synthetic entries...")
+        write_word_base(input_path, args.entries, args.seed)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="word_bench_") as work_dir:
+        ctx = Context(input_path, work_dir, args.seed)
+        for name in args.only or BENCHMARKS:
+            results[name] = measure(BENCHMARKS[name](ctx), args.repeat, not args.no_memory)
+            memory = f", peak {results[name]['peak_mb']:.1f} MiB" if "peak_mb" in results[name] else ""
+            print(f"⏱️ {name}: {results[name]['seconds'] * 1000:.1f} ms{memory}")
+
+    word_count = len(ctx.word_base().entries_by_id)
+    out = Path(args.out or f"build/bench/results_{word_count}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "input": str(input_path),
+            "input_bytes": input_path.stat().st_size,
+            "entries": word_count,
+            "repeat": args.repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Results written to {out}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
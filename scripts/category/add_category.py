@@ -1,9 +1,11 @@
-import json
 import argparse
 import uuid
 from pathlib import Path
 import sys
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+
 parser = argparse.ArgumentParser(description="Add a new category.")
 parser.add_argument("--title", required=True, help="Category title in English (default)")
 parser.add_argument("--file", default="word.json", help="Path to the wordlist JSON file")
@@ -15,11 +17,10 @@ if not json_path.exists():
     print(f"❌ File not found: {json_path}")
     sys.exit(1)
 
-with open(json_path, "r", encoding="utf-8") as f:
-    data = json.load(f)
+word_base = WordBase.load(json_path)
 
 # Check for duplicate title in any translation
-for category in data:
+for category in word_base.categories():
     translations = category.get("translations", {})
     if args.title in translations.values():
         print(f"⚠️ Category with title '{args.title}' already exists.")
@@ -35,9 +36,7 @@ new_category = {
     "entries": []
 }
 
-data.append(new_category)
-
-with open(json_path, "w", encoding="utf-8") as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+word_base.add_category(new_category)
+word_base.save()
 
 print(new_category["id"])
\ No newline at end of file
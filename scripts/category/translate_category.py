@@ -2,12 +2,12 @@ import argparse
 import json
 import re
 import asyncio
-import functools
-from aiolimiter import AsyncLimiter
+import sys
+from pathlib import Path
 
-from openai import OpenAI
-
-client = OpenAI()
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+from common.openai_scheduler import RequestScheduler
 
 TARGET_LANGS = ["uk", "ar", "fa", "so", "es", "de", "fr", "pl", "id", "hi", "zh", "it", "tr", "sr", "fi", "et", "be", "lv", "lt", "ru"]
 
@@ -17,13 +17,19 @@ def extract_json(text):
         return match.group(1)
     return text
 
+def parse_translations(content):
+    parsed = json.loads(extract_json(content))
+    if not isinstance(parsed, dict):
+        raise ValueError("the answer is not a JSON dictionary")
+    return parsed
+
 def merge_translations(existing, new):
     for lang, translation in new.items():
         if lang not in existing:
             existing[lang] = translation
     return existing
 
-async def translate_from_en_and_ru(limiter, en_text="", ru_text=""):
+async def translate_from_en_and_ru(scheduler, en_text="", ru_text=""):
     messages = [
         {
             "role": "system",
@@ -40,28 +46,14 @@ async def translate_from_en_and_ru(limiter, en_text="", ru_text=""):
         }
     ]
 
-    await limiter.acquire()
-
     try:
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None,
-            functools.partial(
-                client.chat.completions.create,
-                model="gpt-4o",
-                messages=messages,
-                temperature=0
-            )
-        )
-        content = response.choices[0].message.content
-        cleaned = extract_json(content)
-        parsed = json.loads(cleaned)
-        return parsed
+        content = await scheduler.chat(messages, model="gpt-4o", temperature=0, validate=parse_translations)
+        return parse_translations(content)
     except Exception as e:
         print(f"❌ Error translating '{en_text}': {e}")
         return {}
 
-async def translate_category_only(category, limiter):
+async def translate_category_only(category, scheduler):
     print(f"🛠️ Translating category only: {category.get('id')}")
     translations = category.get("translations", {})
     en_cat = translations.get("en", "")
@@ -73,7 +65,7 @@ async def translate_category_only(category, limiter):
 
     print(f"🔤 Source: en='{en_cat}' | ru='{ru_cat}'")
 
-    translated_cat = await translate_from_en_and_ru(limiter, en_cat, ru_cat or "")
+    translated_cat = await translate_from_en_and_ru(scheduler, en_cat, ru_cat or "")
     print(f"➡️ Translations: {translated_cat}")
     category["translations"] = merge_translations(category.get("translations", {}), translated_cat)
     print(f"📝 After merge: {category['translations']}")
@@ -82,21 +74,23 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--id", help="Category ID to translate")
     parser.add_argument("--file", default="resources/word.json", help="Path to the JSON file")
+    RequestScheduler.add_arguments(parser)
     args = parser.parse_args()
     print(f"🧩 Command-line arguments: {args}")
 
     if args.id:
         input_path = args.file
-        with open(input_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        word_base = WordBase.load(input_path)
 
-        selected_category = next((cat for cat in data if cat.get("id") == args.id), None)
+        selected_category = word_base.category(args.id)
         print(f"🔍 Searching for category with ID: {args.id}")
         if selected_category:
-            limiter = AsyncLimiter(1, 2)
-            asyncio.run(translate_category_only(selected_category, limiter))
-            with open(input_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            async def translate():
+                async with RequestScheduler.from_args(args) as scheduler:
+                    await translate_category_only(selected_category, scheduler)
+
+            asyncio.run(translate())
+            word_base.save()
             print(f"✅ Saved to {input_path}")
         else:
             print("❌ Category with this ID not found")
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = os.getenv("AUDIO_INVENTORY_DIR", ".cache/audio_inventory")
+DEFAULT_WORKERS = 16
+
+
+def clip_entry_id(path):
+    """Entry id of a clip path: <category>/<entry>/<version>/<voice>/... or <category>/<entry>[_formN|_exN].mp3."""
+    parts = path.split("/")
+    if len(parts) > 2:
+        return parts[1]
+    return parts[-1].rsplit(".", 1)[0].split("_", 1)[0]
+
+
+def default_cache_path(root):
+    key = hashlib.sha256(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(DEFAULT_CACHE_DIR) / f"{key}.json"
+
+
+class AudioInventory:
+    """Set of clip files under the audio tree, scanned once with os.scandir and cached between runs.
+
+    The cache keeps every directory with its mtime. On refresh only directories whose mtime changed are
+    listed again; the rest cost one stat each. Tools add the files they write with add(), so the
+    inventory stays current within a run without touching the file system.
+    """
+
+    def __init__(self, root, cache_path=None, suffix=".mp3"):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path(root)
+        self.suffix = suffix
+        # {relative dir ("" for the root): {"mtime_ns": int, "dirs": [names], "files": [names]}}
+        self.dirs = {}
+        self.by_entry = None
+        self.stats = {"listed": 0, "reused": 0}
+
+    @classmethod
+    def load(cls, root, cache_path=None, suffix=".mp3", workers=DEFAULT_WORKERS):
+        inventory = cls(root, cache_path, suffix)
+        if inventory.cache_path.exists():
+            try:
+                with open(inventory.cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("suffix") == suffix:
+                    inventory.dirs = cached["dirs"]
+            except (OSError, ValueError, KeyError):
+                inventory.dirs = {}
+        inventory.refresh(workers)
+        return inventory
+
+    def _scan_dir(self, rel_dir, cached):
+        path = self.root / rel_dir if rel_dir else self.root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if cached is not None and cached["mtime_ns"] == mtime_ns:
+            self.stats["reused"] += 1
+            return cached
+        self.stats["listed"] += 1
+        dirs, files = [], []
+        with os.scandir(path) as it:
+            for item in it:
+                if item.is_dir(follow_symlinks=False):
+                    dirs.append(item.name)
+                elif item.name.endswith(self.suffix):
+                    files.append(item.name)
+        return {"mtime_ns": mtime_ns, "dirs": sorted(dirs), "files": sorted(files)}
+
+    def _scan_subtree(self, rel_dir, old):
+        scanned = {}
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            info = self._scan_dir(current, old.get(current))
+            if info is None:
+                continue
+            scanned[current] = info
+            stack.extend(f"{current}/{name}" if current else name for name in info["dirs"])
+        return scanned
+
+    def refresh(self, workers=DEFAULT_WORKERS):
+        """Brings the inventory up to date, listing top-level directories in parallel."""
+        old, self.dirs = self.dirs, {}
+        self.by_entry = None
+        if not self.root.is_dir():
+            return self
+        top = self._scan_dir("", old.get(""))
+        self.dirs[""] = top
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for scanned in executor.map(lambda name: self._scan_subtree(name, old), top["dirs"]):
+                self.dirs.update(scanned)
+        return self
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"root": str(self.root.resolve()), "suffix": self.suffix, "saved": time.time(), "dirs": self.dirs}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    def _rel(self, path):
+        rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+        return "" if rel == "." else rel
+
+    def has_dir(self, directory):
+        return self._rel(directory) in self.dirs
+
+    def files_in(self, directory):
+        """Clip file names in a directory under root, or an empty set."""
+        info = self.dirs.get(self._rel(directory))
+        return set(info["files"]) if info else set()
+
+    def __contains__(self, path):
+        directory, _, name = self._rel(path).rpartition("/")
+        info = self.dirs.get(directory)
+        return info is not None and name in info["files"]
+
+    def add(self, path):
+        """Records a file written during this run; its directory is re-listed on the next refresh."""
+        rel = self._rel(path)
+        directory, _, name = rel.rpartition("/")
+        parts = directory.split("/") if directory else []
+        for depth in range(len(parts) + 1):
+            current = "/".join(parts[:depth])
+            info = self.dirs.setdefault(current, {"mtime_ns": -1, "dirs": [], "files": []})
+            if depth < len(parts) and parts[depth] not in info["dirs"]:
+                info["dirs"].append(parts[depth])
+                info["mtime_ns"] = -1
+        info = self.dirs[directory]
+        if name not in info["files"]:
+            info["files"].append(name)
+            info["mtime_ns"] = -1
+            if self.by_entry is not None:
+                self.by_entry[clip_entry_id(rel)].append(rel)
+
+    def paths(self):
+        """Root-relative posix paths of every clip."""
+        for directory, info in self.dirs.items():
+            for name in info["files"]:
+                yield f"{directory}/{name}" if directory else name
+
+    def entry_paths(self, entry_id):
+        """Root-relative paths of all clips of an entry, for any version and voice."""
+        if self.by_entry is None:
+            self.by_entry = defaultdict(list)
+            for path in self.paths():
+                self.by_entry[clip_entry_id(path)].append(path)
+        return list(self.by_entry.get(entry_id, []))
+
+    def report(self):
+        files = sum(len(info["files"]) for info in self.dirs.values())
+        print(f"🗂️ Audio inventory: {files} clips in {len(self.dirs)} directories ({self.stats['listed']} listed, {self.stats['reused']} from cache)")
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+DEFAULT_VOICE_ID = "a1e12345-1111-4e00-aaaa-000000000001"
+
+
+def entry_voice_id(entry):
+    """Voice whose clips the app plays for the entry, or None for unversioned entries."""
+    if entry.get("version", -1) <= -1:
+        return None
+    voice_entries = entry.get("voiceEntries")
+    return voice_entries[0] if voice_entries else DEFAULT_VOICE_ID
+
+
+def entry_audio_dir(audio_dir, category_id, entry):
+    """<audio>/<category>/ for unversioned entries, <audio>/<category>/<word>/<version>/<voice>/ otherwise."""
+    base_path = Path(audio_dir) / category_id
+    voice_id = entry_voice_id(entry)
+    if voice_id is not None:
+        base_path = base_path / entry["id"] / str(entry["version"]) / str(voice_id)
+    return base_path
+
+
+def entry_clips(entry):
+    """Yields (kind, index, text, phoneme, file name) for the word, each form and each example."""
+    word_id = entry["id"]
+    yield "word", 0, entry["word"], entry.get("phoneme"), f"{word_id}.mp3"
+    for index, form in enumerate(entry.get("forms") or [], start=1):
+        yield "form", index, form["form"], form.get("phoneme"), f"{word_id}_form{index}.mp3"
+    for index, example in enumerate(entry.get("examples") or [], start=1):
+        yield "example", index, example["text"], example.get("phoneme"), f"{word_id}_ex{index}.mp3"
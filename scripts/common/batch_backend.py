@@ -0,0 +1,149 @@
+import abc
+import importlib
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def batch_request(custom_id, messages, model="gpt-4o", temperature=0, **kwargs):
+    """One line of a Batch API input file."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": dict(model=model, messages=messages, temperature=temperature, **kwargs),
+    }
+
+
+def read_batch_output(path):
+    """Yields (custom_id, content, error) for every line of a Batch API output file."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield None, None, f"line {line_number}: {e}"
+                continue
+            custom_id = record.get("custom_id")
+            response = record.get("response") or {}
+            if record.get("error"):
+                yield custom_id, None, str(record["error"])
+            elif response.get("status_code") != 200:
+                yield custom_id, None, f"status {response.get('status_code')}: {response.get('body')}"
+            else:
+                try:
+                    yield custom_id, response["body"]["choices"][0]["message"]["content"], None
+                except (KeyError, IndexError, TypeError) as e:
+                    yield custom_id, None, f"malformed response body: {e}"
+
+
+def load_responder(spec):
+    """Resolves "package.module:function" to the function; LocalBatchBackend calls it with each request body."""
+    module_name, _, function_name = spec.partition(":")
+    if not module_name or not function_name:
+        raise ValueError(f"responder '{spec}' is not in the form module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class BatchBackend(abc.ABC):
+    """Submits a Batch API input file and fetches its output once the batch is done."""
+
+    @abc.abstractmethod
+    def submit(self, input_path):
+        """Returns the batch id."""
+
+    @abc.abstractmethod
+    def status(self, batch_id):
+        """Returns a dict with at least 'status'; completed batches also carry 'output_file_id'."""
+
+    @abc.abstractmethod
+    def download(self, batch, output_path):
+        """Writes the output (and error) lines of a completed batch to output_path."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    def __init__(self, client=None):
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI()
+        self.client = client
+
+    def submit(self, input_path):
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return batch.id
+
+    def status(self, batch_id):
+        batch = self.client.batches.retrieve(batch_id)
+        return {
+            "id": batch.id,
+            "status": batch.status,
+            "output_file_id": batch.output_file_id,
+            "error_file_id": batch.error_file_id,
+            "request_counts": batch.request_counts.model_dump() if batch.request_counts else None,
+        }
+
+    def download(self, batch, output_path):
+        with open(output_path, "wb") as f:
+            for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+                if file_id:
+                    f.write(self.client.files.content(file_id).read())
+
+
+class LocalBatchBackend(BatchBackend):
+    """File-based stand-in for the Batch API.
+
+    Every submitted batch gets a directory with input.jsonl. The batch completes once output.jsonl
+    appears there. If a responder is given (a function from request body to message content),
+    the output is produced on the first status() call.
+    """
+
+    def __init__(self, root, responder=None):
+        self.root = Path(root)
+        self.responder = responder
+
+    def submit(self, input_path):
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        batch_dir = self.root / batch_id
+        batch_dir.mkdir(parents=True)
+        shutil.copyfile(input_path, batch_dir / "input.jsonl")
+        return batch_id
+
+    def _respond(self, batch_dir):
+        with open(batch_dir / "input.jsonl", encoding="utf-8") as src, open(batch_dir / "output.jsonl", "w", encoding="utf-8") as dst:
+            for line in src:
+                request = json.loads(line)
+                record = {"id": f"req_{uuid.uuid4().hex}", "custom_id": request["custom_id"], "response": None, "error": None}
+                try:
+                    content = self.responder(request["body"])
+                    record["response"] = {
+                        "status_code": 200,
+                        "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+                    }
+                except Exception as e:
+                    record["error"] = {"code": "responder_error", "message": str(e)}
+                dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def status(self, batch_id):
+        batch_dir = self.root / batch_id
+        if not (batch_dir / "input.jsonl").exists():
+            return {"id": batch_id, "status": "failed"}
+        if self.responder and not (batch_dir / "output.jsonl").exists():
+            self._respond(batch_dir)
+        if (batch_dir / "output.jsonl").exists():
+            return {"id": batch_id, "status": "completed", "output_file_id": str(batch_dir / "output.jsonl")}
+        return {"id": batch_id, "status": "in_progress"}
+
+    def download(self, batch, output_path):
+        shutil.copyfile(batch["output_file_id"], output_path)
@@ -0,0 +1,139 @@
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+STORAGE_ACCOUNT_NAME = "algaudio"
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RETRIES = 5
+# For blobs whose name changes whenever their content does: content-hashed or versioned paths.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Well-known development credentials of the local Azurite emulator.
+AZURITE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+
+def container_client(container, account_name=STORAGE_ACCOUNT_NAME, account_key=None, connection_string=None,
+                     pool_size=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES):
+    """Container client whose requests share one keep-alive connection pool sized for the upload concurrency."""
+    import requests
+    from azure.core.pipeline.transport import RequestsTransport
+    from azure.storage.blob import BlobServiceClient
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    options = dict(transport=RequestsTransport(session=session), retry_total=retries)
+
+    connection_string = connection_string or os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+    if connection_string:
+        service = BlobServiceClient.from_connection_string(connection_string, **options)
+    else:
+        account_key = account_key or os.getenv("AZURE_STORAGE_KEY")
+        if not account_key:
+            raise RuntimeError("Environment variable AZURE_STORAGE_KEY is not set.")
+        service = BlobServiceClient(f"https://{account_name}.blob.core.windows.net", credential=account_key, **options)
+    return service.get_container_client(container)
+
+
+def add_storage_arguments(parser, container):
+    parser.add_argument("--container", default=container, help="Blob container name")
+    parser.add_argument("--account-name", default=STORAGE_ACCOUNT_NAME, help="Storage account name")
+    parser.add_argument("--connection-string", help="Storage connection string (default: $AZURE_STORAGE_CONNECTION_STRING)")
+    parser.add_argument("--azurite", action="store_true", help="Use the local Azurite emulator")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Parallel uploads")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per failed request")
+
+
+def container_client_from_args(args):
+    return container_client(
+        args.container,
+        account_name=args.account_name,
+        connection_string=AZURITE_CONNECTION_STRING if args.azurite else args.connection_string,
+        pool_size=args.concurrency,
+        retries=args.retries,
+    )
+
+
+def blob_name(path, source_dir):
+    """The path relative to source_dir, with both made absolute first; raises ValueError for a path outside it."""
+    path, source_dir = Path(os.path.abspath(path)), Path(os.path.abspath(source_dir))
+    if not path.is_relative_to(source_dir):
+        raise ValueError(f"{path} is not inside {source_dir}; blob names are relative to the source directory")
+    return path.relative_to(source_dir).as_posix()
+
+
+def iter_files(source_dir, suffixes):
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            if name.endswith(suffixes):
+                yield Path(root) / name
+
+
+class BlobUploader:
+    """Uploads files concurrently through one container client and reports throughput."""
+
+    def __init__(self, container, concurrency=DEFAULT_CONCURRENCY, overwrite=False, cache_control=None):
+        self.container = container
+        self.concurrency = concurrency
+        self.overwrite = overwrite
+        self.cache_control = cache_control
+        self.lock = threading.Lock()
+        self.stats = {"uploaded": 0, "skipped": 0, "failed": 0, "bytes": 0}
+
+    def upload_file(self, path, name):
+        from azure.core.exceptions import ResourceExistsError
+        from azure.storage.blob import ContentSettings
+
+        # Precompressed variants like word.<hash>.json.br keep the type of the payload and declare their encoding.
+        content_type, content_encoding = mimetypes.guess_type(str(path))
+        content_settings = ContentSettings(
+            content_type=content_type or "application/octet-stream",
+            content_encoding=content_encoding,
+            cache_control=self.cache_control,
+        )
+        size = os.path.getsize(path)
+        try:
+            with open(path, "rb") as f:
+                blob = self.container.get_blob_client(name).upload_blob(
+                    f, length=size, overwrite=self.overwrite, content_settings=content_settings
+                )
+        except ResourceExistsError:
+            return "skipped", 0, None
+        return "uploaded", size, blob.get("etag")
+
+    def upload_all(self, files):
+        """Uploads (path, blob name) pairs; returns {blob name: etag} for the uploaded ones."""
+        started = time.monotonic()
+        etags = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self.upload_file, path, name): name for path, name in files}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    status, size, etag = future.result()
+                except Exception as e:
+                    status, size, etag = "failed", 0, None
+                    print(f"⚠️ Upload failed for {name}: {e}")
+                with self.lock:
+                    self.stats[status] += 1
+                    self.stats["bytes"] += size
+                if status == "uploaded":
+                    etags[name] = etag
+                    print(f"✅ {name} uploaded")
+        self.report(time.monotonic() - started)
+        return etags
+
+    def report(self, elapsed):
+        elapsed = max(elapsed, 1e-6)
+        files = self.stats["uploaded"] + self.stats["skipped"] + self.stats["failed"]
+        print(
+            f"📊 {self.stats['uploaded']} uploaded, {self.stats['skipped']} already present, {self.stats['failed']} failed "
+            f"in {elapsed:.1f}s ({files / elapsed:.1f} files/s, {self.stats['bytes'] / elapsed / 1024 / 1024:.2f} MB/s)"
+        )
@@ -0,0 +1,222 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.blob_storage import IMMUTABLE_CACHE_CONTROL, BlobUploader, add_storage_arguments, container_client_from_args
+
+DEFAULT_MANIFEST_DIR = os.getenv("BLOB_MANIFEST_DIR", ".cache/blob_manifests")
+LIST_PAGE_SIZE = 5000
+
+
+def file_md5(path):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_manifest_path(account_name, container):
+    return Path(DEFAULT_MANIFEST_DIR) / f"{account_name}_{container}.json"
+
+
+class BlobManifest:
+    """Local record of uploaded blobs: {blob name: {size, mtime_ns, md5, etag}}."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, name):
+        return self.entries.get(name)
+
+    def set(self, name, size, mtime_ns, md5, etag):
+        self.entries[name] = {"size": size, "mtime_ns": mtime_ns, "md5": md5, "etag": etag}
+
+    def remove(self, name):
+        self.entries.pop(name, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class BlobSync:
+    """Reconciles a local tree with a container using one paged listing and the local manifest.
+
+    A file is hashed only when its size or mtime differs from the manifest. It is uploaded when the blob is
+    missing, when its content differs, or when the remote ETag no longer matches the one we uploaded.
+    Blobs that exist only remotely are deleted when delete=True.
+    """
+
+    def __init__(self, container, source_dir, manifest, suffixes=(".mp3",), concurrency=16, prefix="", delete=False, cache_control=None):
+        self.container = container
+        self.source_dir = Path(source_dir)
+        self.manifest = manifest
+        self.suffixes = tuple(suffixes)
+        self.concurrency = concurrency
+        self.prefix = prefix
+        self.delete = delete
+        self.cache_control = cache_control
+        self.stats = {"local": 0, "remote": 0, "hashed": 0, "unchanged": 0, "to_upload": 0, "to_delete": 0, "deleted": 0}
+
+    def scan_local(self):
+        """{blob name: (path, size, mtime_ns)} via os.scandir, without reading file contents."""
+        files = {}
+        stack = [self.source_dir]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(self.suffixes):
+                        name = Path(entry.path).relative_to(self.source_dir).as_posix()
+                        if name.startswith(self.prefix):
+                            stat = entry.stat()
+                            files[name] = (Path(entry.path), stat.st_size, stat.st_mtime_ns)
+        self.stats["local"] = len(files)
+        return files
+
+    def list_remote(self):
+        """{blob name: (size, etag, md5 hex or None)} from one paged listing."""
+        blobs = {}
+        for blob in self.container.list_blobs(name_starts_with=self.prefix or None, results_per_page=LIST_PAGE_SIZE):
+            if not blob.name.endswith(self.suffixes):
+                continue
+            content_md5 = blob.content_settings.content_md5 if blob.content_settings else None
+            blobs[blob.name] = (blob.size, blob.etag, bytes(content_md5).hex() if content_md5 else None)
+        self.stats["remote"] = len(blobs)
+        return blobs
+
+    def known_md5(self, name, size, mtime_ns):
+        """The manifest's md5 of a file whose size and mtime did not change since it was hashed, else None."""
+        known = self.manifest.get(name)
+        if known and known["size"] == size and known["mtime_ns"] == mtime_ns:
+            return known["md5"]
+        return None
+
+    def plan(self, local, remote):
+        """Returns ([(path, name)] to upload, [name] to delete)."""
+        hashes = {name: self.known_md5(name, size, mtime_ns) for name, (_, size, mtime_ns) in local.items()}
+        # Only the hashing runs on the pool; the manifest and stats are touched from this thread alone.
+        stale = [name for name, md5 in hashes.items() if md5 is None]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            hashes.update(zip(stale, executor.map(lambda name: file_md5(local[name][0]), stale)))
+        self.stats["hashed"] += len(stale)
+
+        uploads = []
+        for name, (path, size, mtime_ns) in local.items():
+            md5 = hashes[name]
+            known = self.manifest.get(name)
+            blob = remote.get(name)
+            if blob is not None:
+                remote_size, etag, remote_md5 = blob
+                same_as_uploaded = known is not None and known["md5"] == md5 and known["etag"] == etag
+                # Without a manifest entry the listing's Content-MD5 still tells us whether the blob is current.
+                same_as_listed = remote_md5 == md5 and remote_size == size
+                if same_as_uploaded or same_as_listed:
+                    self.manifest.set(name, size, mtime_ns, md5, etag)
+                    self.stats["unchanged"] += 1
+                    continue
+            uploads.append((path, name))
+            self.manifest.set(name, size, mtime_ns, md5, None)
+
+        deletes = sorted(set(remote) - set(local)) if self.delete else []
+        for name in set(self.manifest.entries) - set(local):
+            if name.startswith(self.prefix):
+                self.manifest.remove(name)
+        self.stats["to_upload"] = len(uploads)
+        self.stats["to_delete"] = len(deletes)
+        return uploads, deletes
+
+    def delete_blobs(self, names):
+        # Blob batch requests take at most 256 sub-requests.
+        for start in range(0, len(names), 256):
+            chunk = names[start:start + 256]
+            for name, response in zip(chunk, self.container.delete_blobs(*chunk, raise_on_any_failure=False)):
+                if response.status_code in (202, 404):
+                    self.stats["deleted"] += 1
+                    print(f"🗑️ {name} deleted")
+                else:
+                    print(f"⚠️ Delete failed for {name}: HTTP {response.status_code}")
+
+    def run(self, dry_run=False):
+        started = time.monotonic()
+        local = self.scan_local()
+        remote = self.list_remote()
+        uploads, deletes = self.plan(local, remote)
+        print(
+            f"🔍 {self.stats['local']} local, {self.stats['remote']} remote, {self.stats['hashed']} hashed; "
+            f"{self.stats['to_upload']} to upload, {self.stats['to_delete']} to delete "
+            f"({time.monotonic() - started:.1f}s)"
+        )
+        if dry_run:
+            for _, name in uploads:
+                print(f"⬆️ {name}")
+            for name in deletes:
+                print(f"🗑️ {name}")
+            return 0
+
+        failed = 0
+        if uploads:
+            uploader = BlobUploader(self.container, concurrency=self.concurrency, overwrite=True, cache_control=self.cache_control)
+            etags = uploader.upload_all(uploads)
+            for _, name in uploads:
+                if name in etags:
+                    self.manifest.entries[name]["etag"] = etags[name]
+                else:
+                    self.manifest.remove(name)
+            failed = uploader.stats["failed"]
+        if deletes:
+            self.delete_blobs(deletes)
+            failed += len(deletes) - self.stats["deleted"]
+        self.manifest.save()
+        print(f"✅ Sync finished in {time.monotonic() - started:.1f}s")
+        return failed
+
+
+def add_sync_arguments(parser):
+    parser.add_argument("--delete", action="store_true", help="Delete remote blobs that no longer exist locally")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would be uploaded or deleted")
+    parser.add_argument("--manifest", help="Manifest path (default: .cache/blob_manifests/<account>_<container>.json)")
+    parser.add_argument("--cache-control", help="Cache-Control header of uploaded blobs, e.g. for versioned paths: " + IMMUTABLE_CACHE_CONTROL)
+
+
+def sync_from_args(args, source_dir, suffixes, prefix=""):
+    """Runs a sync configured by add_storage_arguments() and add_sync_arguments(); returns the failure count."""
+    manifest = BlobManifest(args.manifest or default_manifest_path(args.account_name, args.container))
+    sync = BlobSync(
+        container_client_from_args(args),
+        source_dir,
+        manifest,
+        suffixes=suffixes,
+        concurrency=args.concurrency,
+        prefix=prefix,
+        delete=args.delete,
+        cache_control=args.cache_control,
+    )
+    return sync.run(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync a local directory to an Azure Blob Storage container.")
+    parser.add_argument("--source_dir", required=True, help="Local directory; blob names are relative to it")
+    parser.add_argument("--suffix", action="append", help="File suffix to sync (repeatable, default: .mp3)")
+    parser.add_argument("--prefix", default="", help="Only sync blob names starting with this prefix")
+    add_storage_arguments(parser, container="audio")
+    add_sync_arguments(parser)
+    args = parser.parse_args()
+
+    sys.exit(1 if sync_from_args(args, args.source_dir, tuple(args.suffix or [".mp3"]), args.prefix) else 0)
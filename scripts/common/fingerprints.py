@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from common.audio_layout import entry_clips
+
+FORMAT_VERSION = 1
+
+
+def fingerprint(*parts):
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def clip_fingerprints(entry):
+    """{clip file name: fingerprint of its text and phoneme}; the voice is part of the clip path, not of the hash."""
+    return {file_name: fingerprint(text, phoneme or "") for _, _, text, phoneme, file_name in entry_clips(entry)}
+
+
+def level_fingerprint(entry):
+    return fingerprint(entry.get("word", ""), entry.get("translations", {}).get("ru", ""))
+
+
+def translations_fingerprint(entry):
+    translations = entry.get("translations", {})
+    return fingerprint(translations.get("ru", ""), translations.get("en", ""))
+
+
+def default_fingerprints_path(base_path):
+    base_path = Path(base_path)
+    return base_path.with_name(f"{base_path.stem}.fingerprints.json")
+
+
+class Fingerprints:
+    """Input fingerprints of the artifacts derived from each entry, stored next to word.json.
+
+    For every entry id it keeps the fingerprint of the inputs an artifact was last produced from:
+    "audio" ({clip file name: fingerprint}), "level" and "translations". A stage compares them with the
+    current entry and skips artifacts whose inputs did not change.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.dirty = False
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    @classmethod
+    def for_base(cls, base_path):
+        return cls(default_fingerprints_path(base_path))
+
+    def get(self, entry_id, artifact):
+        return self.entries.get(entry_id, {}).get(artifact)
+
+    def record(self, entry_id, artifact, value):
+        if self.get(entry_id, artifact) != value:
+            self.entries.setdefault(entry_id, {})[artifact] = value
+            self.dirty = True
+
+    def unchanged(self, entry_id, artifact, value):
+        return self.get(entry_id, artifact) == value
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": FORMAT_VERSION, "entries": self.entries}, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
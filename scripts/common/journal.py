@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+
+
+def default_journal_path(base_path, job):
+    """<base stem>.<job>.journal.jsonl next to the base; every job has its own, so finishing one never drops another's results."""
+    base_path = Path(base_path)
+    return base_path.with_name(f"{base_path.stem}.{job}.journal.jsonl")
+
+
+def job_journal_paths(base_path):
+    base_path = Path(base_path)
+    return sorted(base_path.parent.glob(f"{base_path.stem}.*.journal.jsonl"))
+
+
+class Journal:
+    """Append-only log of finished results of a bulk job over word.json.
+
+    Each line is one record {"job", "kind", "id", "set"}: the fields in "set" are assigned to the entry
+    (kind "entry") or category (kind "category") with that id. Every record is flushed and fsynced as it is
+    written, so a crash loses only the requests that were still in flight. A partly written last line is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.file = None
+        self.written = 0
+        self.recorded = set()
+
+    def records(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and "id" in record:
+                    yield record
+
+    def replay(self, word_base, job=None):
+        """Applies the journal to word_base; returns the ids of entries and categories finished by job."""
+        done = set()
+        for record in self.records():
+            target = word_base.category(record["id"]) if record.get("kind") == "category" else word_base.entry(record["id"])
+            if target is None:
+                continue
+            target.update(record.get("set", {}))
+            if job is None or record.get("job") == job:
+                done.add(record["id"])
+        if done:
+            print(f"♻️ Replayed {len(done)} finished results from {self.path}")
+        return done
+
+    def record(self, job, item_id, fields, kind="entry"):
+        line = json.dumps({"job": job, "kind": kind, "id": item_id, "set": fields}, ensure_ascii=False) + "\n"
+        with self.lock:
+            if self.file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.written += 1
+            self.recorded.add(item_id)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def discard(self):
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+def compact(base_path, journal_paths=None, output_path=None):
+    """Folds the journals (default: those of every job next to the base) into the word base,
+    writes it atomically and removes the journals."""
+    journals = [Journal(path) for path in (journal_paths or job_journal_paths(base_path))]
+    word_base = WordBase.load(base_path)
+    done = set()
+    for journal in journals:
+        done |= journal.replay(word_base)
+    word_base.save(output_path)
+    for journal in journals:
+        journal.discard()
+    return len(done)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold bulk job journals into word.json.")
+    parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--job", help="Only fold the journal of this job, e.g. level or translate (default: all jobs)")
+    group.add_argument("--journal", help="Journal path (default: <file stem>.<job>.journal.jsonl next to the file)")
+    parser.add_argument("--output", help="Write the result here instead of --file")
+    args = parser.parse_args()
+
+    if args.journal:
+        journal_paths = [args.journal]
+    elif args.job:
+        journal_paths = [default_journal_path(args.file, args.job)]
+    else:
+        journal_paths = job_journal_paths(args.file)
+    count = compact(args.file, journal_paths, args.output)
+    print(f"✅ Compacted {count} results into {args.output or args.file}")
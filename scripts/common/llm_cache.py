@@ -0,0 +1,118 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite")
+DEFAULT_MAX_AGE_DAYS = 180
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def request_key(request):
+    """Content address of a chat request: model, temperature, messages, response schema and any other parameters."""
+    payload = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Disk-backed cache of chat completion contents keyed by request_key()."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age_days=DEFAULT_MAX_AGE_DAYS, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model TEXT, content TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.db.commit()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def get(self, key):
+        row = self.db.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.db.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        self.stats["hits"] += 1
+        return row[0]
+
+    def put(self, key, content, model=None):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses (key, model, content, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, content, len(content.encode("utf-8")), now, now),
+        )
+        self.db.commit()
+        self.stats["stored"] += 1
+
+    def delete(self, key):
+        self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self.db.commit()
+
+    def evict(self):
+        """Drops entries older than max_age_days, then least recently used ones until the cache fits max_bytes."""
+        evicted = 0
+        if self.max_age_days:
+            cursor = self.db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.max_age_days * 86400,))
+            evicted += cursor.rowcount
+        if self.max_bytes:
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    evicted += 1
+        self.db.commit()
+        self.stats["evicted"] += evicted
+        return evicted
+
+    def clear(self):
+        self.db.execute("DELETE FROM responses")
+        self.db.commit()
+
+    def summary(self):
+        count, size, hits = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM responses").fetchone()
+        return {"entries": count, "bytes": size, "lifetime_hits": hits}
+
+    def close(self):
+        self.evict()
+        self.db.close()
+
+    def report(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = self.stats["hits"] / lookups * 100 if lookups else 0
+        print(
+            f"📦 LLM cache: {self.stats['hits']} hits, {self.stats['misses']} misses ({rate:.0f}% hit rate), "
+            f"{self.stats['stored']} stored, {self.stats['evicted']} evicted"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or maintain the LLM response cache.")
+    parser.add_argument("--path", default=DEFAULT_CACHE_PATH, help="Cache database path")
+    parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS, help="Evict entries older than this")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024, help="Evict least recently used entries above this size")
+    parser.add_argument("--evict", action="store_true", help="Run eviction now")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached responses")
+    args = parser.parse_args()
+
+    cache = LLMCache(args.path, max_age_days=args.max_age_days, max_bytes=int(args.max_mb * 1024 * 1024))
+    if args.clear:
+        cache.clear()
+        print("🧹 Cache cleared")
+    elif args.evict:
+        print(f"🧹 Evicted {cache.evict()} entries")
+    print(f"📊 {cache.summary()}")
+    cache.db.close()
@@ -0,0 +1,279 @@
+import asyncio
+import os
+import random
+import re
+import time
+
+from common.llm_cache import DEFAULT_CACHE_PATH, LLMCache, request_key
+
+DEFAULT_MODEL = "gpt-4o"
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM", "300000"))
+DEFAULT_WORKERS = int(os.getenv("OPENAI_WORKERS", "32"))
+DEFAULT_BASE_URL = os.getenv("OPENAI_BASE_URL")
+DEFAULT_COMPLETION_TOKENS = 600
+MAX_RETRIES = 6
+
+
+def parse_reset(value):
+    """Parses reset durations like '1s', '6m0s', '20ms' or '0.5' into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    seconds = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|s|m|h)", value):
+        seconds += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return seconds
+
+
+def retry_after(headers):
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        return float(headers["retry-after-ms"]) / 1000
+    if headers.get("retry-after"):
+        try:
+            return float(headers["retry-after"])
+        except ValueError:
+            return None
+    return None
+
+
+def estimate_tokens(messages, max_tokens=None):
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // 4 + 8 * len(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def is_valid(validate, content):
+    """Whether validate accepts the content; a validator may return False or raise to reject it."""
+    try:
+        return bool(validate(content))
+    except Exception:
+        return False
+
+
+class Budget:
+    """Token bucket refilled continuously over a minute; capacity follows the provider's limit headers."""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.available = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    def wait_time(self, amount):
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0
+        return (amount - self.available) * 60 / self.capacity
+
+    def take(self, amount):
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+    def give_back(self, amount):
+        self._refill()
+        self.available = min(self.capacity, self.available + amount)
+
+    def sync(self, limit, remaining, reset):
+        self._refill()
+        if limit:
+            self.capacity = limit
+        if remaining is not None:
+            # Trust the server, but keep what we have already reserved for in-flight requests.
+            self.available = min(self.available, remaining)
+            if reset and remaining == 0:
+                self.available = -reset * self.capacity / 60
+
+
+class RequestScheduler:
+    """Shared async scheduler for all chat-completion calls.
+
+    Requests go through a bounded queue served by a fixed number of workers. Every request
+    reserves budget for requests per minute and tokens per minute before it is sent. The budgets
+    follow the x-ratelimit-* headers of each response, and a 429 pauses all workers for its Retry-After.
+    Answers the caller validates are looked up in and stored to the optional LLMCache, and identical requests in flight are sent once.
+    """
+
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, workers=DEFAULT_WORKERS, client=None, max_retries=MAX_RETRIES, cache=None, base_url=None, timeout=None):
+        self.cache = cache
+        self.base_url = base_url
+        self.timeout = timeout
+        self.in_flight = {}
+        self.requests = Budget(rpm)
+        self.tokens = Budget(tpm)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.client = client
+        self.queue = None
+        self.tasks = []
+        self.lock = None
+        self.paused_until = 0
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "failed": 0, "tokens": 0}
+
+    @classmethod
+    def from_args(cls, args):
+        cache = None if args.no_cache else LLMCache(args.cache_path)
+        return cls(rpm=args.rpm, tpm=args.tpm, workers=args.workers, cache=cache, base_url=args.openai_base_url, timeout=args.openai_timeout)
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="Initial OpenAI requests-per-minute budget")
+        parser.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="Initial OpenAI tokens-per-minute budget")
+        parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Maximum OpenAI requests in flight")
+        parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
+        parser.add_argument("--cache-path", default=DEFAULT_CACHE_PATH, help="LLM response cache database")
+        parser.add_argument("--openai-base-url", default=DEFAULT_BASE_URL, help="OpenAI-compatible API base URL, e.g. a local fake server")
+        parser.add_argument("--openai-timeout", type=float, help="Per-request timeout in seconds (default: the SDK's)")
+
+    def _start(self):
+        if self.queue is not None:
+            return
+        if self.client is None:
+            from openai import AsyncOpenAI
+            options = {"base_url": self.base_url} if self.base_url else {}
+            if self.timeout:
+                options["timeout"] = self.timeout
+            self.client = AsyncOpenAI(max_retries=0, **options)
+        self.queue = asyncio.Queue(maxsize=self.workers * 2)
+        self.lock = asyncio.Lock()
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.queue = None
+        if self.client is not None:
+            await self.client.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    async def __aenter__(self):
+        self._start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def chat(self, messages, model=DEFAULT_MODEL, temperature=0, validate=None, cache_sampled=False, **kwargs):
+        """Sends one chat completion through the scheduler and returns the message content.
+
+        Only answers that pass validate(content) are cached, so a malformed answer is asked again next time
+        instead of being replayed; a cached answer that no longer validates is evicted. Sampled requests
+        (temperature > 0) are not cached unless cache_sampled is set.
+        """
+        self._start()
+        request = dict(model=model, messages=messages, temperature=temperature, **kwargs)
+        key = request_key(request)
+        if key in self.in_flight:
+            return await asyncio.shield(self.in_flight[key])
+        cacheable = self.cache is not None and validate is not None and (temperature == 0 or cache_sampled)
+        if cacheable:
+            content = self.cache.get(key)
+            if content is not None:
+                if is_valid(validate, content):
+                    return content
+                self.cache.delete(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            await self.queue.put((future, request))
+            content = await asyncio.shield(future)
+        finally:
+            del self.in_flight[key]
+        if cacheable and is_valid(validate, content):
+            self.cache.put(key, content, model)
+        return content
+
+    async def _reserve(self, tokens):
+        async with self.lock:
+            while True:
+                delay = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if delay <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+                await asyncio.sleep(delay)
+
+    def _sync_headers(self, headers):
+        self.requests.sync(
+            int(headers["x-ratelimit-limit-requests"]) if headers.get("x-ratelimit-limit-requests") else None,
+            int(headers["x-ratelimit-remaining-requests"]) if headers.get("x-ratelimit-remaining-requests") else None,
+            parse_reset(headers.get("x-ratelimit-reset-requests")),
+        )
+        self.tokens.sync(
+            int(headers["x-ratelimit-limit-tokens"]) if headers.get("x-ratelimit-limit-tokens") else None,
+            int(headers["x-ratelimit-remaining-tokens"]) if headers.get("x-ratelimit-remaining-tokens") else None,
+            parse_reset(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+    async def _send(self, request):
+        import openai
+
+        estimated = estimate_tokens(request["messages"], request.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            await self._reserve(estimated)
+            self.stats["requests"] += 1
+            try:
+                raw = await self.client.chat.completions.with_raw_response.create(**request)
+            except openai.RateLimitError as e:
+                headers = e.response.headers if e.response is not None else {}
+                delay = retry_after(headers) or min(60, 2 ** attempt)
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                self._sync_headers(headers)
+                self.stats["throttled"] += 1
+                error = e
+            except (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError) as e:
+                self.tokens.give_back(estimated)
+                await asyncio.sleep(min(60, 2 ** attempt) + random.random())
+                error = e
+            else:
+                self._sync_headers(raw.headers)
+                completion = raw.parse()
+                if completion.usage:
+                    self.stats["tokens"] += completion.usage.total_tokens
+                    # Refund the part of the estimate the request did not use.
+                    self.tokens.give_back(max(0, estimated - completion.usage.total_tokens))
+                return completion.choices[0].message.content
+            self.stats["retries"] += 1
+        raise error
+
+    async def _worker(self):
+        while True:
+            future, request = await self.queue.get()
+            try:
+                if not future.cancelled():
+                    future.set_result(await self._send(request))
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    def report(self):
+        print(
+            f"📊 OpenAI: {self.stats['requests']} requests, {self.stats['tokens']} tokens, "
+            f"{self.stats['throttled']} throttled, {self.stats['retries']} retries, {self.stats['failed']} failed"
+        )
+        if self.cache is not None:
+            self.cache.report()
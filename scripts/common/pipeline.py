@@ -0,0 +1,56 @@
+import asyncio
+from collections import Counter
+
+
+class Stage:
+    def __init__(self, name, run, after=(), concurrency=1):
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        self.concurrency = concurrency
+
+
+class Pipeline:
+    """Runs every item through a DAG of async stages; each stage has its own concurrency limit.
+
+    A stage starts for an item as soon as all of its `after` stages succeeded for that item,
+    so many items are in flight at once. A stage that fails or raises skips its dependants.
+    """
+
+    def __init__(self, stages):
+        self.stages = {}
+        for stage in stages:
+            missing = [name for name in stage.after if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown or later stages: {missing}")
+            self.stages[stage.name] = stage
+        self.semaphores = {name: asyncio.Semaphore(stage.concurrency) for name, stage in self.stages.items()}
+        self.stats = {name: Counter() for name in self.stages}
+
+    async def _run_stage(self, stage, item, dependencies):
+        if not all(await asyncio.gather(*dependencies)):
+            self.stats[stage.name]["skipped"] += 1
+            return False
+        async with self.semaphores[stage.name]:
+            try:
+                ok = bool(await stage.run(item))
+            except Exception as e:
+                print(f"❌ Stage '{stage.name}' failed for {item}: {e}")
+                ok = False
+        self.stats[stage.name]["done" if ok else "failed"] += 1
+        return ok
+
+    async def _run_item(self, item):
+        tasks = {}
+        for name, stage in self.stages.items():
+            dependencies = [tasks[dependency] for dependency in stage.after]
+            tasks[name] = asyncio.ensure_future(self._run_stage(stage, item, dependencies))
+        results = await asyncio.gather(*tasks.values())
+        return dict(zip(tasks, results))
+
+    async def run(self, items):
+        return await asyncio.gather(*(self._run_item(item) for item in items))
+
+    def report(self):
+        for name, counter in self.stats.items():
+            print(f"📊 {name}: {counter['done']} done, {counter['failed']} failed, {counter['skipped']} skipped")
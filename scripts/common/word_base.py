@@ -0,0 +1,80 @@
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+
+def normalize_word(text):
+    return " ".join((text or "").lower().split())
+
+
+class WordBase:
+    """word.json loaded once, with O(1) lookups by word id, category id and Swedish word."""
+
+    def __init__(self, data, path=None):
+        self.data = data
+        self.path = Path(path) if path else None
+        self.reindex()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), path)
+
+    def reindex(self):
+        self.entries_by_id = {}
+        self.categories_by_id = {}
+        self.category_by_word_id = {}
+        self.word_ids_by_text = defaultdict(list)
+        for category in self.data:
+            self._index_category(category)
+
+    def _index_category(self, category):
+        self.categories_by_id[category.get("id")] = category
+        for entry in category.get("entries", []):
+            self._index_entry(category, entry)
+
+    def _index_entry(self, category, entry):
+        self.entries_by_id[entry.get("id")] = entry
+        self.category_by_word_id[entry.get("id")] = category
+        self.word_ids_by_text[normalize_word(entry.get("word"))].append(entry.get("id"))
+
+    def entry(self, word_id):
+        return self.entries_by_id.get(word_id)
+
+    def category(self, category_id):
+        return self.categories_by_id.get(category_id)
+
+    def category_of(self, word_id):
+        return self.category_by_word_id.get(word_id)
+
+    def ids_by_word(self, word):
+        return list(self.word_ids_by_text.get(normalize_word(word), []))
+
+    def categories(self):
+        return iter(self.data)
+
+    def entries(self):
+        for category in self.data:
+            for entry in category.get("entries", []):
+                yield category, entry
+
+    def add_category(self, category):
+        self.data.append(category)
+        self._index_category(category)
+        return category
+
+    def add_entry(self, category_id, entry):
+        category = self.category(category_id)
+        if category is None:
+            raise KeyError(category_id)
+        category.setdefault("entries", []).append(entry)
+        self._index_entry(category, entry)
+        return entry
+
+    def save(self, path=None):
+        path = Path(path) if path else self.path
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,163 @@
+import json
+import os
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 16
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Pulls JSON values out of a text file one at a time, keeping only the unread part of a chunk in memory."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of the current chunk, got '{self.peek()}'")
+        self.pos += 1
+
+    def skip(self, char):
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending exactly at the chunk border may continue in the next chunk.
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_categories(path):
+    """Yields (category, entries) for each category of word.json without loading the whole file.
+
+    category holds the fields that precede "entries" in the file (word.json keeps "entries" last).
+    entries is a generator over the category's entries and must be consumed before the next category is read.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f)
+        reader.expect("[")
+        if reader.skip("]"):
+            return
+        while True:
+            reader.expect("{")
+            category = {}
+            entries_seen = False
+            if not reader.skip("}"):
+                while True:
+                    key = reader.value()
+                    reader.expect(":")
+                    if entries_seen:
+                        raise ValueError(f"Field '{key}' of category '{category.get('id')}' follows 'entries'; streaming needs 'entries' last")
+                    if key == "entries" and reader.peek() == "[":
+                        entries_seen = True
+                        yield category, _iter_array(reader)
+                    else:
+                        category[key] = reader.value()
+                    if reader.skip("}"):
+                        break
+                    reader.expect(",")
+            if not entries_seen:
+                yield category, iter(())
+            if reader.skip("]"):
+                return
+            reader.expect(",")
+
+
+def _iter_array(reader):
+    reader.expect("[")
+    if reader.skip("]"):
+        return
+    while True:
+        yield reader.value()
+        if reader.skip("]"):
+            return
+        reader.expect(",")
+
+
+def iter_entries(path):
+    """Yields (category, entry) pairs of word.json one at a time, in file order."""
+    for category, entries in iter_categories(path):
+        for entry in entries:
+            yield category, entry
+
+
+def _indented(value, level):
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace("\n", "\n" + "  " * level)
+
+
+def write_categories(path, categories):
+    """Writes (category, entries) pairs as word.json, formatted like json.dump(indent=2), atomically.
+
+    entries may be any iterable, so a category is written as its entries are produced.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        first_category = True
+        for category, entries in categories:
+            f.write("[\n" if first_category else ",\n")
+            first_category = False
+            f.write("  {")
+            for key, value in category.items():
+                if key != "entries":
+                    f.write(f"\n    {json.dumps(key, ensure_ascii=False)}: {_indented(value, 2)},")
+            f.write('\n    "entries": [')
+            first_entry = True
+            for entry in entries:
+                f.write("\n      " if first_entry else ",\n      ")
+                f.write(_indented(entry, 3))
+                first_entry = False
+            f.write("]" if first_entry else "\n    ]")
+            f.write("\n  }")
+        f.write("[]" if first_category else "\n]")
+    os.replace(tmp_path, path)
+
+
+def rewrite_entries(input_path, output_path, fn):
+    """Streams word.json through fn(category, entry) -> entry, or None to drop the entry.
+
+    Each entry is written as soon as fn returns, so memory stays bounded by one entry and output_path
+    may be input_path.
+    """
+    def mapped(category, entries):
+        for entry in entries:
+            entry = fn(category, entry)
+            if entry is not None:
+                yield entry
+
+    write_categories(output_path, ((category, mapped(category, entries)) for category, entries in iter_categories(input_path)))
@@ -0,0 +1,147 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.audio_layout import entry_audio_dir, entry_clips, entry_voice_id
+from common.fingerprints import clip_fingerprints, fingerprint
+from common.word_stream import iter_categories
+
+HASH_LENGTH = 12
+FORMAT_VERSION = 1
+# A fixed timestamp keeps the archive bytes, and so its hash, identical for identical clips.
+ZIP_DATE = (2020, 1, 1, 0, 0, 0)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pack_clips(audio_dir, category_id, entries):
+    """Clips the app plays for each entry (current version, the entry's voice) as
+    ({entry id: {"version", "voice", "files"}}, [(path in pack, local path, [size, mtime_ns], clip fingerprint)], missing)."""
+    index, clips, missing = {}, [], 0
+    for entry in entries:
+        directory = entry_audio_dir(audio_dir, category_id, entry)
+        fingerprints = clip_fingerprints(entry)
+        files = []
+        for _, _, _, _, file_name in entry_clips(entry):
+            path = directory / file_name
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                missing += 1
+                continue
+            name = path.relative_to(Path(audio_dir) / category_id).as_posix()
+            clips.append((name, path, [stat.st_size, stat.st_mtime_ns], fingerprints[file_name]))
+            files.append(name)
+        if files:
+            index[entry["id"]] = {"version": entry.get("version"), "voice": entry_voice_id(entry), "files": files}
+    return index, clips, missing
+
+
+def write_pack(out_dir, category_id, index, clips):
+    """Writes <category>.<hash>.zip with the clips stored as they are (mp3 does not deflate) and a deflated index.json."""
+    tmp_path = Path(out_dir) / f"{category_id}.zip.tmp"
+    with zipfile.ZipFile(tmp_path, "w") as archive:
+        info = zipfile.ZipInfo("index.json", ZIP_DATE)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        archive.writestr(info, json.dumps({"format": FORMAT_VERSION, "category": category_id, "entries": index}, separators=(",", ":")))
+        for name, path, _, _ in clips:
+            info = zipfile.ZipInfo(name, ZIP_DATE)
+            with open(path, "rb") as f:
+                archive.writestr(info, f.read(), compress_type=zipfile.ZIP_STORED)
+    sha256 = file_sha256(tmp_path)
+    name = f"{category_id}.{sha256[:HASH_LENGTH]}.zip"
+    os.replace(tmp_path, Path(out_dir) / name)
+    return name, sha256
+
+
+def build_pack(audio_dir, out_dir, category_id, entries, previous, force=False):
+    """Returns (manifest item or None, "built" / "current" / "empty", missing clips)."""
+    index, clips, missing = pack_clips(audio_dir, category_id, entries)
+    if not clips:
+        return None, "empty", missing
+    # Clip paths carry the version and voice; the clip fingerprint covers text and phoneme, the stamp re-recorded audio.
+    pack_fingerprint = fingerprint(*((name, clip_fingerprint, stamp) for name, _, stamp, clip_fingerprint in clips))
+    if not force and previous and previous.get("fingerprint") == pack_fingerprint and (Path(out_dir) / previous["file"]).exists():
+        return previous, "current", missing
+    name, sha256 = write_pack(out_dir, category_id, index, clips)
+    item = {
+        "file": name,
+        "sha256": sha256,
+        "size": os.path.getsize(Path(out_dir) / name),
+        "clips": len(clips),
+        "audio_bytes": sum(stamp[0] for _, _, stamp, _ in clips),
+        "fingerprint": pack_fingerprint,
+    }
+    return item, "built", missing
+
+
+def build_packs(input_path, audio_dir, out_dir, workers=8, force=False):
+    """Builds one pack per category in parallel, skipping packs whose clips did not change, and writes manifest.json."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    previous = {}
+    if manifest_path.exists():
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f).get("packs", {})
+
+    stats = {"built": 0, "current": 0, "empty": 0, "missing_clips": 0}
+    packs = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for category, entries in iter_categories(input_path):
+            category_id = category["id"]
+            futures[category_id] = executor.submit(build_pack, audio_dir, out_dir, category_id, list(entries), previous.get(category_id), force)
+        for category_id, future in futures.items():
+            item, result, missing = future.result()
+            stats[result] += 1
+            stats["missing_clips"] += missing
+            if item is not None:
+                packs[category_id] = item
+
+    tmp_path = manifest_path.with_name("manifest.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format": FORMAT_VERSION, "packs": packs}, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    current = {item["file"] for item in packs.values()}
+    for path in out_dir.glob("*.zip"):
+        if path.name not in current:
+            path.unlink()
+    return packs, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Package each category's current audio into an offline pack with a manifest.")
+    parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    parser.add_argument("--audio_dir", default="resources/audio", help="Audio tree to pack, e.g. build/audio/mp3")
+    parser.add_argument("--out", default="build/audio_packs", help="Output directory for packs and manifest.json")
+    parser.add_argument("--workers", type=int, default=8, help="Packs built in parallel")
+    parser.add_argument("--force", action="store_true", help="Rebuild packs whose clips did not change")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.file):
+        print(f"❌ File not found: {args.file}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    packs, stats = build_packs(args.file, args.audio_dir, args.out, args.workers, args.force)
+    total = sum(item["size"] for item in packs.values())
+    print(f"📦 {len(packs)} packs, {total / 1024 / 1024:.1f} MiB in {args.out}")
+    print(
+        f"✅ Done in {time.perf_counter() - started:.1f}s: {stats['built']} built, {stats['current']} unchanged, "
+        f"{stats['empty']} categories without audio, {stats['missing_clips']} clips missing"
+    )
@@ -0,0 +1,267 @@
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_stream import iter_categories
+
+FORMAT_VERSION = 1
+LEVELS = ["a1", "a2", "b1", "b2", "c1", "c2"]
+ARTICLES = ("en ", "ett ")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE langs (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE);
+CREATE TABLE voices (id INTEGER PRIMARY KEY, uuid BLOB NOT NULL UNIQUE);
+CREATE TABLE categories (id INTEGER PRIMARY KEY, uuid BLOB NOT NULL UNIQUE);
+CREATE TABLE category_translations (
+    category INTEGER NOT NULL, lang INTEGER NOT NULL, text TEXT NOT NULL,
+    PRIMARY KEY (category, lang)
+) WITHOUT ROWID;
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY, uuid BLOB NOT NULL UNIQUE, category INTEGER NOT NULL,
+    word TEXT NOT NULL, version INTEGER NOT NULL, level INTEGER, phoneme TEXT
+);
+CREATE TABLE entry_voices (entry INTEGER NOT NULL, position INTEGER NOT NULL, voice INTEGER NOT NULL, PRIMARY KEY (entry, position)) WITHOUT ROWID;
+CREATE TABLE forms (entry INTEGER NOT NULL, position INTEGER NOT NULL, form TEXT NOT NULL, phoneme TEXT, PRIMARY KEY (entry, position)) WITHOUT ROWID;
+CREATE TABLE examples (entry INTEGER NOT NULL, position INTEGER NOT NULL, text TEXT NOT NULL, phoneme TEXT, PRIMARY KEY (entry, position)) WITHOUT ROWID;
+CREATE TABLE translations (entry INTEGER NOT NULL, lang INTEGER NOT NULL, text TEXT NOT NULL, PRIMARY KEY (entry, lang)) WITHOUT ROWID;
+-- Lowercased word and forms (exact = 1) plus their article-less variants (exact = 0).
+-- Exact lookups replace formToIdIndex; range scans on key replace the prefix trie.
+CREATE TABLE word_index (key TEXT NOT NULL, entry INTEGER NOT NULL, exact INTEGER NOT NULL, PRIMARY KEY (key, entry, exact)) WITHOUT ROWID;
+-- Lowercased comma-separated parts of each translation, for translation prefix search.
+CREATE TABLE translation_index (lang INTEGER NOT NULL, key TEXT NOT NULL, entry INTEGER NOT NULL, PRIMARY KEY (lang, key, entry)) WITHOUT ROWID;
+CREATE INDEX entries_category ON entries (category);
+"""
+
+
+def uuid_bytes(value):
+    return uuid.UUID(value).bytes
+
+
+class Interner:
+    """Assigns small integer ids to repeated values (language codes, voice ids) in first-seen order."""
+
+    def __init__(self, db, table, column, convert=lambda value: value):
+        self.db = db
+        self.table = table
+        self.column = column
+        self.convert = convert
+        self.ids = {}
+
+    def __call__(self, value):
+        if value not in self.ids:
+            self.ids[value] = len(self.ids) + 1
+            self.db.execute(f"INSERT INTO {self.table} (id, {self.column}) VALUES (?, ?)", (self.ids[value], self.convert(value)))
+        return self.ids[value]
+
+
+def word_keys(text):
+    lower = text.lower()
+    yield lower, 1
+    for article in ARTICLES:
+        if lower.startswith(article) and len(lower) > len(article):
+            yield lower[len(article):], 0
+
+
+def compile_word_base(input_path, output_path):
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    db = sqlite3.connect(tmp_path)
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    db.executescript(SCHEMA)
+    try:
+        counts = write_tables(db, input_path)
+        db.commit()
+        db.execute("VACUUM")
+    except BaseException:
+        # Whatever stopped the compile (a duplicate id, a malformed entry, I/O), no partial artifact is left behind.
+        db.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    db.close()
+    os.replace(tmp_path, output_path)
+    return counts
+
+
+def write_tables(db, input_path):
+    """Inserts the word base; raises ValueError for a duplicate category or entry id, which the UNIQUE uuid columns cannot hold."""
+    lang = Interner(db, "langs", "code")
+    voice = Interner(db, "voices", "uuid", uuid_bytes)
+    counts = {"categories": 0, "entries": 0}
+    seen_categories, seen_entries = set(), {}
+
+    for category_number, (category, entries) in enumerate(iter_categories(input_path), start=1):
+        if category["id"] in seen_categories:
+            raise ValueError(f"duplicate category id {category['id']}")
+        seen_categories.add(category["id"])
+        db.execute("INSERT INTO categories (id, uuid) VALUES (?, ?)", (category_number, uuid_bytes(category["id"])))
+        db.executemany(
+            "INSERT INTO category_translations VALUES (?, ?, ?)",
+            [(category_number, lang(code), text) for code, text in category.get("translations", {}).items()],
+        )
+        counts["categories"] += 1
+        for entry in entries:
+            if entry["id"] in seen_entries:
+                raise ValueError(f"duplicate entry id {entry['id']} in categories {seen_entries[entry['id']]} and {category['id']}")
+            seen_entries[entry["id"]] = category["id"]
+            counts["entries"] += 1
+            entry_number = counts["entries"]
+            level = entry.get("level")
+            db.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry_number, uuid_bytes(entry["id"]), category_number, entry["word"], entry.get("version", -1),
+                    LEVELS.index(level) if level in LEVELS else None, entry.get("phoneme"),
+                ),
+            )
+            db.executemany(
+                "INSERT INTO entry_voices VALUES (?, ?, ?)",
+                [(entry_number, position, voice(voice_id)) for position, voice_id in enumerate(entry.get("voiceEntries") or [])],
+            )
+            forms = entry.get("forms") or []
+            db.executemany(
+                "INSERT INTO forms VALUES (?, ?, ?, ?)",
+                [(entry_number, position, form["form"], form.get("phoneme")) for position, form in enumerate(forms)],
+            )
+            db.executemany(
+                "INSERT INTO examples VALUES (?, ?, ?, ?)",
+                [(entry_number, position, example["text"], example.get("phoneme")) for position, example in enumerate(entry.get("examples", []))],
+            )
+            translations = entry.get("translations", {})
+            db.executemany(
+                "INSERT INTO translations VALUES (?, ?, ?)",
+                [(entry_number, lang(code), text) for code, text in translations.items()],
+            )
+            keys = set()
+            for text in [entry["word"]] + [form["form"] for form in forms]:
+                keys.update(word_keys(text))
+            db.executemany("INSERT INTO word_index VALUES (?, ?, ?)", [(key, entry_number, exact) for key, exact in keys])
+            parts = {
+                (lang(code), part.strip().lower())
+                for code, text in translations.items()
+                for part in text.split(",")
+                if part.strip()
+            }
+            db.executemany("INSERT INTO translation_index VALUES (?, ?, ?)", [(code, key, entry_number) for code, key in parts])
+
+    db.executemany(
+        "INSERT INTO meta VALUES (?, ?)",
+        [("format_version", str(FORMAT_VERSION)), ("categories", str(counts["categories"])), ("entries", str(counts["entries"]))],
+    )
+    return counts
+
+
+def gzip_size(path):
+    with open(path, "rb") as f:
+        return len(gzip.compress(f.read(), compresslevel=9))
+
+
+def report_sizes(input_path, output_path):
+    json_size, db_size = os.path.getsize(input_path), os.path.getsize(output_path)
+    print(f"📦 word.json: {json_size / 1024:.1f} KiB ({gzip_size(input_path) / 1024:.1f} KiB gzipped)")
+    print(
+        f"📦 artifact:  {db_size / 1024:.1f} KiB ({gzip_size(output_path) / 1024:.1f} KiB gzipped), "
+        f"{db_size / json_size * 100:.0f}% of the JSON"
+    )
+
+
+def load_json_with_indexes(input_path):
+    """What the app does at launch today: decode everything, then build the id, form and category indexes."""
+    with open(input_path, encoding="utf-8") as f:
+        categories = json.load(f)
+    by_id, by_form, category_by_word = {}, {}, {}
+    for category in categories:
+        for entry in category["entries"]:
+            by_id[uuid.UUID(entry["id"])] = entry
+            category_by_word[entry["id"]] = category["id"]
+            for form in [entry["word"]] + [form["form"] for form in entry.get("forms") or []]:
+                by_form.setdefault(form.lower(), []).append(entry["id"])
+    return by_id
+
+
+def load_artifact(output_path):
+    """The same work from the artifact: read every entry with its forms, examples and translations by id."""
+    db = sqlite3.connect(f"file:{output_path}?mode=ro", uri=True)
+    langs = dict(db.execute("SELECT id, code FROM langs"))
+    by_number = {
+        number: {"id": str(uuid.UUID(bytes=entry_uuid)), "word": word, "forms": [], "examples": [], "translations": {}}
+        for number, entry_uuid, word in db.execute("SELECT id, uuid, word FROM entries")
+    }
+    for number, form in db.execute("SELECT entry, form FROM forms ORDER BY entry, position"):
+        by_number[number]["forms"].append({"form": form})
+    for number, text in db.execute("SELECT entry, text FROM examples ORDER BY entry, position"):
+        by_number[number]["examples"].append({"text": text})
+    for number, lang, text in db.execute("SELECT entry, lang, text FROM translations"):
+        by_number[number]["translations"][langs[lang]] = text
+    db.close()
+    return {uuid.UUID(entry["id"]): entry for entry in by_number.values()}
+
+
+def open_artifact_and_lookup(output_path, word_id):
+    """What the app needs at launch with the artifact: open it and read one entry through the prebuilt index."""
+    db = sqlite3.connect(f"file:{output_path}?mode=ro", uri=True)
+    row = db.execute("SELECT id, word FROM entries WHERE uuid = ?", (uuid_bytes(word_id),)).fetchone()
+    db.execute("SELECT lang, text FROM translations WHERE entry = ?", (row[0],)).fetchall()
+    db.close()
+    return row
+
+
+def best_time(load, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def benchmark(input_path, output_path, runs):
+    """Compares loading the whole word base both ways; the single lookup is reported on its own."""
+    first_id = next(entry["id"] for _, entries in iter_categories(input_path) for entry in entries)
+    results = {
+        "json": best_time(lambda: load_json_with_indexes(input_path), runs),
+        "artifact": best_time(lambda: load_artifact(output_path), runs),
+        "lookup": best_time(lambda: open_artifact_and_lookup(output_path, first_id), runs),
+    }
+    print(
+        f"⏱️ Full load, best of {runs}: JSON decode + indexes {results['json'] * 1000:.1f} ms, "
+        f"artifact query of all entries {results['artifact'] * 1000:.1f} ms ({results['artifact'] / max(results['json'], 1e-9):.2f}x the JSON time)"
+    )
+    print(f"⏱️ Artifact open + one entry lookup: {results['lookup'] * 1000:.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile word.json into a compact SQLite artifact for the app.")
+    parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    parser.add_argument("--output", default="build/word_base.sqlite", help="Artifact path")
+    parser.add_argument("--benchmark", action="store_true", help="Compare loading the artifact with loading the raw JSON")
+    parser.add_argument("--runs", type=int, default=5, help="Benchmark repetitions")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.file):
+        print(f"❌ File not found: {args.file}")
+        sys.exit(1)
+
+    started = time.monotonic()
+    try:
+        counts = compile_word_base(args.file, args.output)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Compiled {counts['entries']} entries in {counts['categories']} categories to {args.output} in {time.monotonic() - started:.1f}s")
+    report_sizes(args.file, args.output)
+    if args.benchmark:
+        benchmark(args.file, args.output, args.runs)
@@ -0,0 +1,236 @@
+import argparse
+import copy
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+
+FORMAT_VERSION = 1
+# Ops are listed, and applied, in this order.
+PHASES = [
+    "add_category", "move_entry", "remove_entry", "remove_category", "add_entry",
+    "update_category", "update_entry", "order_categories", "order_entries",
+]
+
+
+def canonical_hash(data):
+    """Hash of the content regardless of key order and formatting; a patch names the bases it goes from and to."""
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def field_changes(old, new, prefix=""):
+    """({dotted path: new value}, [removed dotted paths]); nested objects like translations are diffed per key."""
+    changed, removed = {}, []
+    for key, value in new.items():
+        path = prefix + key
+        if key not in old:
+            changed[path] = value
+        elif old[key] != value:
+            if isinstance(value, dict) and isinstance(old[key], dict) and not any("." in name for name in (*value, *old[key])):
+                nested_changed, nested_removed = field_changes(old[key], value, path + ".")
+                changed.update(nested_changed)
+                removed.extend(nested_removed)
+            else:
+                changed[path] = value
+    removed.extend(prefix + key for key in old if key not in new)
+    return changed, removed
+
+
+def update_op(kind, item_id, old, new):
+    changed, removed = field_changes(old, new)
+    if not changed and not removed:
+        return None
+    op = {"op": kind, "id": item_id}
+    if changed:
+        op["set"] = changed
+    if removed:
+        op["unset"] = removed
+    return op
+
+
+def diff(old_data, new_data):
+    """Ordered patch ops turning old_data into new_data, in time linear in the size of both bases."""
+    old, new = WordBase(old_data), WordBase(new_data)
+    ops = {phase: [] for phase in PHASES}
+
+    for category in new.categories():
+        if category["id"] not in old.categories_by_id:
+            header = {key: value for key, value in category.items() if key != "entries"}
+            if "entries" in category:
+                header["entries"] = []
+            ops["add_category"].append({"op": "add_category", "category": header})
+        else:
+            op = update_op("update_category", category["id"],
+                           {key: value for key, value in old.category(category["id"]).items() if key != "entries"},
+                           {key: value for key, value in category.items() if key != "entries"})
+            if op:
+                ops["update_category"].append(op)
+
+    moved_in, added = defaultdict(list), defaultdict(list)
+    for category, entry in new.entries():
+        old_entry = old.entry(entry["id"])
+        if old_entry is None:
+            ops["add_entry"].append({"op": "add_entry", "category": category["id"], "entry": entry})
+            added[category["id"]].append(entry["id"])
+            continue
+        if old.category_of(entry["id"])["id"] != category["id"]:
+            ops["move_entry"].append({"op": "move_entry", "id": entry["id"], "category": category["id"]})
+            moved_in[category["id"]].append(entry["id"])
+        op = update_op("update_entry", entry["id"], old_entry, entry)
+        if op:
+            ops["update_entry"].append(op)
+
+    for category in old.categories():
+        if category["id"] not in new.categories_by_id:
+            # Its entries go with it; the ones that live on elsewhere were moved out first.
+            ops["remove_category"].append({"op": "remove_category", "id": category["id"]})
+            continue
+        for entry in category.get("entries", []):
+            if entry["id"] not in new.entries_by_id:
+                ops["remove_entry"].append({"op": "remove_entry", "id": entry["id"]})
+
+    # Orders are only sent where appending moved and added items does not already give the new order.
+    kept = [category["id"] for category in old.categories() if category["id"] in new.categories_by_id]
+    new_order = [category["id"] for category in new.categories()]
+    if kept + [op["category"]["id"] for op in ops["add_category"]] != new_order:
+        ops["order_categories"].append({"op": "order_categories", "ids": new_order})
+    for category in new.categories():
+        old_category = old.category(category["id"])
+        stayed = [
+            entry["id"] for entry in (old_category or {}).get("entries", [])
+            if entry["id"] in new.entries_by_id and new.category_of(entry["id"])["id"] == category["id"]
+        ]
+        entry_order = [entry["id"] for entry in category.get("entries", [])]
+        if stayed + moved_in[category["id"]] + added[category["id"]] != entry_order:
+            ops["order_entries"].append({"op": "order_entries", "category": category["id"], "ids": entry_order})
+
+    return {
+        "format": FORMAT_VERSION,
+        "from": canonical_hash(old_data),
+        "to": canonical_hash(new_data),
+        "ops": [op for phase in PHASES for op in ops[phase]],
+    }
+
+
+def set_path(target, path, value):
+    *parents, key = path.split(".")
+    for name in parents:
+        target = target.setdefault(name, {})
+    target[key] = copy.deepcopy(value)
+
+
+def unset_path(target, path):
+    *parents, key = path.split(".")
+    for name in parents:
+        target = target.get(name, {})
+    target.pop(key, None)
+
+
+def apply_update(target, op):
+    for path, value in op.get("set", {}).items():
+        set_path(target, path, value)
+    for path in op.get("unset", []):
+        unset_path(target, path)
+
+
+def apply_patch(data, patch):
+    """Applies a patch to the base data in place and returns it; the patch itself is left untouched.
+    Raises ValueError if the patch is for another base."""
+    if patch.get("format") != FORMAT_VERSION:
+        raise ValueError(f"unsupported patch format {patch.get('format')}")
+    if canonical_hash(data) != patch["from"]:
+        raise ValueError("the patch was made for a different base")
+    base = WordBase(data)
+    ops = defaultdict(list)
+    for op in patch["ops"]:
+        ops[op["op"]].append(op)
+
+    for op in ops["add_category"]:
+        base.add_category(copy.deepcopy(op["category"]))
+    # Moved and removed entries are detached in one pass over the base rather than one list scan each.
+    detached = {op["id"] for op in ops["move_entry"]} | {op["id"] for op in ops["remove_entry"]}
+    if detached:
+        for category in base.categories():
+            if "entries" in category:
+                category["entries"] = [entry for entry in category["entries"] if entry["id"] not in detached]
+    for op in ops["move_entry"]:
+        base.category(op["category"]).setdefault("entries", []).append(base.entry(op["id"]))
+    removed = {op["id"] for op in ops["remove_category"]}
+    if removed:
+        data[:] = [category for category in data if category["id"] not in removed]
+    for op in ops["add_entry"]:
+        base.add_entry(op["category"], copy.deepcopy(op["entry"]))
+    for op in ops["update_category"]:
+        apply_update(base.category(op["id"]), op)
+    for op in ops["update_entry"]:
+        apply_update(base.entry(op["id"]), op)
+    for op in ops["order_categories"]:
+        data[:] = [base.category(category_id) for category_id in op["ids"]]
+    for op in ops["order_entries"]:
+        base.category(op["category"])["entries"] = [base.entry(entry_id) for entry_id in op["ids"]]
+    return data
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_patch(old_path, new_path, out_path, verify=True):
+    started = time.perf_counter()
+    patch = diff(load(old_path), load(new_path))
+    elapsed = time.perf_counter() - started
+    if verify:
+        # The old base is read again, since diff() indexes the loaded data but apply_patch() mutates it.
+        if canonical_hash(apply_patch(load(old_path), patch)) != patch["to"]:
+            raise ValueError("applying the patch to the old base does not reproduce the new one")
+    encoded = json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with open(out_path, "wb") as f:
+        f.write(encoded)
+    counts = Counter(op["op"] for op in patch["ops"])
+    print(f"🧮 Diff in {elapsed:.2f}s: " + (", ".join(f"{counts[phase]} {phase}" for phase in PHASES if counts[phase]) or "no changes"))
+    new_size = os.path.getsize(new_path)
+    print(
+        f"📦 {out_path}: {len(encoded) / 1024:.1f} KiB ({len(gzip.compress(encoded)) / 1024:.1f} KiB gzipped) "
+        f"instead of {new_size / 1024:.1f} KiB" + (", verified" if verify else "")
+    )
+    return patch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff two word.json snapshots into a verified delta patch, or apply one.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = commands.add_parser("diff", help="Write the patch from --old to --new")
+    diff_parser.add_argument("--old", required=True, help="Previous release of the word base")
+    diff_parser.add_argument("--new", default="resources/word.json", help="Current word base")
+    diff_parser.add_argument("--out", required=True, help="Patch JSON to write")
+    diff_parser.add_argument("--no-verify", action="store_true", help="Skip applying the patch to --old and comparing with --new")
+
+    apply_parser = commands.add_parser("apply", help="Apply a patch to a base")
+    apply_parser.add_argument("--base", required=True, help="Word base the patch was made from")
+    apply_parser.add_argument("--patch", required=True, help="Patch JSON")
+    apply_parser.add_argument("--out", required=True, help="Where to write the patched base")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "diff":
+            make_patch(args.old, args.new, args.out, verify=not args.no_verify)
+        else:
+            patch = load(args.patch)
+            word_base = WordBase(apply_patch(load(args.base), patch))
+            if canonical_hash(word_base.data) != patch["to"]:
+                raise ValueError("the patched base does not match the patch's target hash")
+            word_base.save(args.out)
+            print(f"✅ Patched base written to {args.out}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
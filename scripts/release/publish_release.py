@@ -0,0 +1,195 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.blob_storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    BlobUploader,
+    add_storage_arguments,
+    blob_name,
+    container_client_from_args,
+)
+from build_audio_packs import file_sha256
+
+HASH_LENGTH = 12
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# The manifest keeps its name, so clients must revalidate it; its ETag makes that a 304 in the common case.
+MANIFEST_CACHE_CONTROL = "no-cache"
+HASHED_NAME = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.")
+DEFAULT_DIRS = ["build/word_base", "build/audio_packs"]
+
+
+def require_brotli():
+    """Raises RuntimeError when the brotli package (scripts/release/requirements.txt) is missing."""
+    try:
+        import brotli
+    except ImportError:
+        raise RuntimeError(
+            "the brotli package is not installed: pip install -r scripts/release/requirements.txt, "
+            "or pass --no-brotli to publish gzip variants only"
+        )
+
+
+def compress_variants(path, brotli=True):
+    """Writes <name>.gz and, with brotli, <name>.br next to path if they are smaller."""
+    with open(path, "rb") as f:
+        data = f.read()
+    compressors = {"gzip": (".gz", lambda: gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli:
+        require_brotli()
+        import brotli as brotli_module
+        compressors["br"] = (".br", lambda: brotli_module.compress(data, quality=11))
+    encodings = {}
+    for encoding, (suffix, compress) in compressors.items():
+        compressed = compress()
+        if len(compressed) < len(data):
+            variant = path.with_name(path.name + suffix)
+            with open(variant, "wb") as f:
+                f.write(compressed)
+            encodings[encoding] = (variant, len(compressed))
+    return encodings
+
+
+def manifest_item(path, out_dir, sha256, compress=True, brotli=True):
+    """The manifest item of a staged file; compress also writes its .gz / .br variants and records them."""
+    encodings = {
+        encoding: {"file": variant.relative_to(out_dir).as_posix(), "size": size}
+        for encoding, (variant, size) in (compress_variants(path, brotli).items() if compress else ())
+    }
+    return {"file": path.relative_to(out_dir).as_posix(), "sha256": sha256, "size": path.stat().st_size, "encodings": encodings}
+
+
+def write_artifact(data, out_dir, stem, suffix=".json", brotli=True):
+    """Writes data as <stem>.<content hash><suffix> plus its compressed variants; returns its manifest item."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = Path(out_dir) / f"{stem}.{sha256[:HASH_LENGTH]}{suffix}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return manifest_item(path, out_dir, sha256, brotli=brotli)
+
+
+def minified_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.dumps(json.load(f), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def add_directory(out_dir, source_dir, artifacts, brotli=True):
+    """Publishes an export whose files already carry content hashes (locale shards, audio packs) under <dir name>/.
+
+    Files with a hash in their name are copied as they are and listed in the manifest with their compressed
+    variants (JSON only; zips and mp3s do not compress). The unhashed index next to them is published as a
+    content-hashed artifact, so it can be cached like everything else and is found through the manifest.
+    """
+    source_dir = Path(source_dir)
+    target = Path(out_dir) / source_dir.name
+    target.mkdir(parents=True, exist_ok=True)
+    for path in sorted(source_dir.iterdir()):
+        if not path.is_file() or path.name.endswith(".tmp"):
+            continue
+        if HASHED_NAME.search(path.name):
+            shutil.copyfile(path, target / path.name)
+            artifacts[f"{source_dir.name}/{path.name}"] = manifest_item(
+                target / path.name, out_dir, file_sha256(path), compress=path.suffix == ".json", brotli=brotli
+            )
+        elif path.suffix == ".json":
+            item = write_artifact(minified_json(path), out_dir, f"{source_dir.name}/{path.stem}", brotli=brotli)
+            artifacts[f"{source_dir.name}/{path.name}"] = item
+
+
+def check_out_dir(out_dir, inputs):
+    """Raises ValueError if replacing out_dir would delete one of the inputs."""
+    out_dir = Path(os.path.abspath(out_dir))
+    for path in inputs:
+        path = Path(os.path.abspath(path))
+        if path == out_dir or path.is_relative_to(out_dir):
+            raise ValueError(f"--out {out_dir} contains the input {path}; stage the release elsewhere")
+
+
+def build_release(json_files, directories, out_dir, brotli=True):
+    """Stages a release in out_dir: hashed and precompressed JSON artifacts and manifest.json pointing to them.
+
+    The release is built next to out_dir and swapped in when complete, so a failed run leaves the previous one.
+    """
+    out_dir = Path(out_dir)
+    check_out_dir(out_dir, [*json_files, *directories])
+    if brotli:
+        require_brotli()
+    staging = out_dir.with_name(out_dir.name + ".tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+    artifacts = {}
+    for path in json_files:
+        path = Path(path)
+        artifacts[path.name] = write_artifact(minified_json(path), staging, path.stem, brotli=brotli)
+    for directory in directories:
+        add_directory(staging, directory, artifacts, brotli)
+    manifest = {"format": FORMAT_VERSION, "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "artifacts": artifacts}
+    with open(staging / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    os.replace(staging, out_dir)
+    return manifest
+
+
+def upload_release(out_dir, container, concurrency):
+    """Uploads the hashed files as immutable and skips the ones already published, then swaps in the manifest."""
+    out_dir = Path(out_dir)
+    # Hashed names never change content, so whatever is already in the container is skipped without sending it.
+    published = {blob.name for blob in container.list_blobs()}
+    files = [(path, blob_name(path, out_dir)) for path in sorted(out_dir.rglob("*")) if path.is_file() and path.name != MANIFEST_NAME]
+    files = [(path, name) for path, name in files if name not in published]
+    print(f"🚀 Uploading {len(files)} new artifacts ({len(published)} blobs already published)")
+    uploader = BlobUploader(container, concurrency=concurrency, overwrite=False, cache_control=IMMUTABLE_CACHE_CONTROL)
+    uploader.upload_all(files)
+    if uploader.stats["failed"]:
+        print("❌ Some artifacts failed to upload; the manifest was not updated.")
+        return False
+    # Published last, so a client never sees a manifest that points to files that are not there yet.
+    manifest_uploader = BlobUploader(container, concurrency=1, overwrite=True, cache_control=MANIFEST_CACHE_CONTROL)
+    manifest_uploader.upload_all([(out_dir / MANIFEST_NAME, MANIFEST_NAME)])
+    return not manifest_uploader.stats["failed"]
+
+
+def report(manifest):
+    for name, item in manifest["artifacts"].items():
+        variants = ", ".join(f"{encoding} {variant['size'] / 1024:.1f} KiB" for encoding, variant in item["encodings"].items())
+        print(f"📦 {name} → {item['file']}: {item['size'] / 1024:.1f} KiB" + (f" ({variants})" if variants else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage and publish content-hashed, precompressed release artifacts with a manifest.")
+    parser.add_argument("--json", nargs="+", default=["resources/word.json", "resources/voice.json"], help="JSON artifacts to publish")
+    parser.add_argument("--dir", nargs="*", help=f"Exports with content-hashed files to include (default: existing ones of {', '.join(DEFAULT_DIRS)})")
+    parser.add_argument("--out", default="build/release", help="Staging directory, recreated on every run")
+    parser.add_argument("--upload", action="store_true", help="Upload the staged release")
+    parser.add_argument("--no-brotli", action="store_true", help="Publish gzip variants only, without the brotli package")
+    add_storage_arguments(parser, container="release")
+    args = parser.parse_args()
+
+    missing = [path for path in args.json if not os.path.isfile(path)]
+    if missing:
+        print(f"❌ File not found: {', '.join(missing)}")
+        sys.exit(1)
+    directories = args.dir if args.dir is not None else [path for path in DEFAULT_DIRS if os.path.isdir(path)]
+
+    try:
+        manifest = build_release(args.json, directories, args.out, brotli=not args.no_brotli)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    report(manifest)
+    print(f"✅ Release staged in {args.out}")
+    if args.upload:
+        sys.exit(0 if upload_release(args.out, container_client_from_args(args), args.concurrency) else 1)
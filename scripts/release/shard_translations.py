@@ -0,0 +1,116 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_stream import iter_categories
+
+HASH_LENGTH = 12
+
+
+def compact_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class HashedFile:
+    """Writes a file to a temporary name and renames it to <stem>.<content hash><suffix> on close."""
+
+    def __init__(self, out_dir, stem, suffix=".json"):
+        self.out_dir = Path(out_dir)
+        self.stem = stem
+        self.suffix = suffix
+        self.tmp_path = self.out_dir / f"{stem}{suffix}.tmp"
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.file = open(self.tmp_path, "wb")
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        self.digest.update(data)
+        self.size += len(data)
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+        sha256 = self.digest.hexdigest()
+        name = f"{self.stem}.{sha256[:HASH_LENGTH]}{self.suffix}"
+        os.replace(self.tmp_path, self.out_dir / name)
+        return {"file": name, "sha256": sha256, "size": self.size}
+
+
+def write_hashed(out_dir, stem, value):
+    hashed = HashedFile(out_dir, stem)
+    hashed.write(compact_json(value))
+    return hashed.close()
+
+
+def export_shards(input_path, out_dir):
+    """Writes the core file without translations, one translation shard per locale and index.json.
+
+    A shard is {"categories": {id: text}, "entries": {id: text}} for one language. File names carry the
+    content hash, so unchanged files keep their names between exports and can be cached forever.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    shards = {}
+    counts = {"categories": 0, "entries": 0}
+
+    def add(lang, kind, item_id, text):
+        shards.setdefault(lang, {"categories": {}, "entries": {}})[kind][item_id] = text
+
+    core = HashedFile(out_dir, "core")
+    core.write("[")
+    for category, entries in iter_categories(input_path):
+        for lang, text in category.get("translations", {}).items():
+            add(lang, "categories", category["id"], text)
+        header = {key: value for key, value in category.items() if key != "translations"}
+        core.write(("," if counts["categories"] else "") + compact_json(header)[:-1] + ("," if header else "") + '"entries":[')
+        for index, entry in enumerate(entries):
+            for lang, text in entry.get("translations", {}).items():
+                add(lang, "entries", entry["id"], text)
+            core.write(("," if index else "") + compact_json({key: value for key, value in entry.items() if key != "translations"}))
+            counts["entries"] += 1
+        core.write("]}")
+        counts["categories"] += 1
+    core.write("]")
+
+    index = {"core": core.close(), "locales": {}}
+    for lang in sorted(shards):
+        index["locales"][lang] = write_hashed(out_dir, f"translations.{lang}", shards[lang])
+    with open(out_dir / "index.json", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    current = {index["core"]["file"], "index.json"} | {shard["file"] for shard in index["locales"].values()}
+    for path in out_dir.iterdir():
+        if path.name.startswith(("core.", "translations.")) and path.name not in current:
+            path.unlink()
+    return index, counts
+
+
+def report(input_path, index):
+    source_size = os.path.getsize(input_path)
+    shard_sizes = [shard["size"] for shard in index["locales"].values()]
+    core_size = index["core"]["size"]
+    typical = core_size + (max(shard_sizes) if shard_sizes else 0)
+    print(f"📦 core: {core_size / 1024:.1f} KiB, {len(shard_sizes)} locale shards of {min(shard_sizes, default=0) / 1024:.1f}–{max(shard_sizes, default=0) / 1024:.1f} KiB")
+    print(f"📦 one locale downloads {typical / 1024:.1f} KiB instead of {source_size / 1024:.1f} KiB ({typical / source_size * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export word.json as a core file plus one content-hashed translation shard per locale.")
+    parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    parser.add_argument("--out", default="build/word_base", help="Output directory")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.file):
+        print(f"❌ File not found: {args.file}")
+        sys.exit(1)
+
+    started = time.monotonic()
+    index, counts = export_shards(args.file, args.out)
+    print(f"✅ Exported {counts['entries']} entries and {len(index['locales'])} locales to {args.out} in {time.monotonic() - started:.1f}s")
+    report(args.file, index)
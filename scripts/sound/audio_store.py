@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+DEFAULT_STORE_PATH = os.getenv("AUDIO_STORE_PATH", ".cache/audio_store")
+
+
+def utterance_key(text, phoneme, voice_id, output_format):
+    payload = json.dumps([text, phoneme or "", voice_id, output_format], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioStore:
+    """Local content-addressed store of synthesized clips keyed by (text, phoneme, voice id, output format).
+
+    Clips are placed into the app's <category>/<word>/<version>/<voice>/ layout by hardlink, or by copy
+    when the store and the audio tree are on different filesystems.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_PATH, suffix=".mp3"):
+        self.root = Path(root)
+        self.suffix = suffix
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def __contains__(self, key):
+        return self.path(key).exists()
+
+    def put(self, key, audio):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        return path
+
+    def place(self, key, output_path):
+        """Puts the stored clip at output_path. Returns False if the clip is not in the store."""
+        source = self.path(key)
+        if not source.exists():
+            return False
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if output_path.exists() or output_path.is_symlink():
+            if output_path.exists() and os.path.samefile(source, output_path):
+                return True
+            output_path.unlink()
+        try:
+            os.link(source, output_path)
+        except OSError:
+            shutil.copyfile(source, output_path)
+        return True
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.audio_layout import entry_audio_dir, entry_clips, entry_voice_id
+from common.word_stream import iter_entries
+
+DEFAULT_OUT_DIR = "build/audio_sprites"
+SPRITE_SUFFIX = ".sprite.mp3"
+INDEX_SUFFIX = ".sprite.json"
+FORMAT_VERSION = 1
+
+# MPEG audio Layer III tables, indexed by the header's bitrate and sample rate fields.
+BITRATES_V1 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+BITRATES_V2 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def id3v2_size(data):
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+
+def frame_info(data, pos):
+    """(frame length, samples, sample rate) of the Layer III frame header at pos, or None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 3
+    layer = (data[pos + 1] >> 1) & 3
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    padding = (data[pos + 2] >> 1) & 1
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        return 144000 * BITRATES_V1[bitrate_index] // sample_rate + padding, 1152, sample_rate
+    return 72000 * BITRATES_V2[bitrate_index] // sample_rate + padding, 576, sample_rate
+
+
+def is_info_frame(data, pos):
+    """Whether the frame at pos carries a Xing / Info (or VBRI) tag instead of audio.
+
+    Encoders put it in the first frame; it holds the frame count and duration of that one clip.
+    """
+    version = (data[pos + 1] >> 3) & 3
+    mono = data[pos + 3] >> 6 == 3
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    offset = pos + 4 + side_info + (0 if data[pos + 1] & 1 else 2)
+    return data[offset:offset + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def mp3_frames(data):
+    """The audio frames of an mp3 without ID3 tags or the Xing / Info frame, and their duration in seconds.
+
+    Frames are self-contained, so the frame runs of several clips can be concatenated into one playable stream.
+    A clip's Xing / Info frame would be taken for the header of the whole sprite and is silent, so it is dropped.
+    """
+    start = pos = id3v2_size(data)
+    info = frame_info(data, pos)
+    if info is not None and pos + info[0] <= len(data) and is_info_frame(data, pos):
+        start = pos = pos + info[0]
+    duration = 0.0
+    while True:
+        info = frame_info(data, pos)
+        if info is None or pos + info[0] > len(data):
+            break
+        pos += info[0]
+        duration += info[1] / info[2]
+    if pos == start:
+        raise ValueError("no MPEG Layer III frames found")
+    return data[start:pos], duration
+
+
+def sprite_paths(out_dir, category_id, entry):
+    directory = entry_audio_dir(out_dir, category_id, entry)
+    return directory / f"{entry['id']}{SPRITE_SUFFIX}", directory / f"{entry['id']}{INDEX_SUFFIX}"
+
+
+def clip_sources(audio_dir, category_id, entry):
+    """[(kind, index, file name, path, [size, mtime_ns])]; raises FileNotFoundError for a missing clip."""
+    directory = entry_audio_dir(audio_dir, category_id, entry)
+    sources = []
+    for kind, index, _, _, file_name in entry_clips(entry):
+        stat = os.stat(directory / file_name)
+        sources.append((kind, index, file_name, directory / file_name, [stat.st_size, stat.st_mtime_ns]))
+    return sources
+
+
+def build_sprite(audio_dir, out_dir, category_id, entry, force=False):
+    """Writes the sprite and its index for one word; returns "built", "current" or "missing"."""
+    try:
+        sources = clip_sources(audio_dir, category_id, entry)
+    except FileNotFoundError:
+        return "missing"
+    sprite_path, index_path = sprite_paths(out_dir, category_id, entry)
+    stamps = {file_name: stamp for _, _, file_name, _, stamp in sources}
+    if not force and sprite_path.exists() and index_path.exists():
+        with open(index_path, encoding="utf-8") as f:
+            if json.load(f).get("sources") == stamps:
+                return "current"
+
+    index = {
+        "format": FORMAT_VERSION,
+        "id": entry["id"],
+        "version": entry.get("version"),
+        "voice": entry_voice_id(entry),
+        "file": sprite_path.name,
+        "word": None,
+        "forms": [],
+        "examples": [],
+    }
+    offset, start = 0, 0.0
+    sprite_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = sprite_path.with_name(sprite_path.name + ".tmp")
+    with open(tmp_path, "wb") as sprite:
+        for kind, _, file_name, path, _ in sources:
+            with open(path, "rb") as f:
+                frames, duration = mp3_frames(f.read())
+            sprite.write(frames)
+            clip = {"offset": offset, "length": len(frames), "start": round(start, 4), "duration": round(duration, 4)}
+            if kind == "word":
+                index["word"] = clip
+            else:
+                index[f"{kind}s"].append(clip)
+            offset += len(frames)
+            start += duration
+    index.update(bytes=offset, duration=round(start, 4), sources=stamps)
+    os.replace(tmp_path, sprite_path)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    return "built"
+
+
+def build_sprites(input_path, audio_dir, out_dir, category_id=None, workers=16, force=False):
+    stats = {"built": 0, "current": 0, "missing": 0, "failed": 0}
+
+    def build(item):
+        category, entry = item
+        try:
+            return build_sprite(audio_dir, out_dir, category["id"], entry, force)
+        except (OSError, ValueError) as e:
+            print(f"❌ {entry['id']}: {e}")
+            return "failed"
+
+    # Only versioned words have their own directory; unversioned clips stay loose in the category.
+    entries = ((category, entry) for category, entry in iter_entries(input_path)
+               if entry_voice_id(entry) is not None and (category_id is None or category["id"] == category_id))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(build, entries):
+            stats[result] += 1
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concatenate all clips of each word into one mp3 sprite with an offset index.")
+    parser.add_argument("--input", default="resources/word.json", help="Path to the word base JSON file")
+    parser.add_argument("--audio_dir", default="resources/audio", help="Audio tree to read clips from, e.g. build/audio/mp3")
+    parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR, help="Sprites are written here in the same <category>/<word>/<version>/<voice>/ layout")
+    parser.add_argument("--category", help="Only build sprites of this category id")
+    parser.add_argument("--workers", type=int, default=16, help="Words built in parallel")
+    parser.add_argument("--force", action="store_true", help="Rebuild sprites whose clips did not change")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = build_sprites(args.input, args.audio_dir, args.out_dir, args.category, args.workers, args.force)
+    print(
+        f"✅ Sprites in {time.perf_counter() - started:.1f}s: {stats['built']} built, {stats['current']} up to date, "
+        f"{stats['missing']} skipped for missing clips, {stats['failed']} failed"
+    )
+    sys.exit(1 if stats["failed"] else 0)
@@ -11,7 +11,7 @@ if not os.getenv("AWS_ACCESS_KEY_ID") or not os.getenv("AWS_SECRET_ACCESS_KEY"):
     print("❌ AWS credentials are not set (AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY).")
     sys.exit(1)
 
-polly = boto3.client("polly", region_name=REGION)
+polly = boto3.client("polly", region_name=REGION, endpoint_url=os.getenv("AWS_POLLY_ENDPOINT"))
 
 
 def synthesize_speech(text, output_path, phoneme=None):
@@ -26,7 +26,7 @@ def synthesize_speech(text, output_path, phoneme=None):
     print("🧪 SSML:")
     print(ssml)
 
-    url = f"https://{REGION}.tts.speech.microsoft.com/cognitiveservices/v1"
+    url = os.getenv("AZURE_TTS_ENDPOINT") or f"https://{REGION}.tts.speech.microsoft.com/cognitiveservices/v1"
 
     headers = {
         "Ocp-Apim-Subscription-Key": API_KEY,
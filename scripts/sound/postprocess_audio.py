@@ -0,0 +1,168 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.audio_inventory import AudioInventory
+from sound.audio_store import AudioStore
+
+DEFAULT_CACHE_DIR = os.getenv("AUDIO_POST_CACHE_DIR", ".cache/audio_post")
+DEFAULT_OUT_DIR = "build/audio"
+# Mono speech: 24 kHz keeps the consonants intelligible at a fraction of the 48 kHz / 192 kbit/s source.
+VARIANTS = {
+    "mp3": {"suffix": ".mp3", "args": ["-c:a", "libmp3lame", "-b:a", "48k", "-ar", "24000"]},
+    "opus": {"suffix": ".opus", "args": ["-c:a", "libopus", "-b:a", "24k", "-application", "voip", "-ar", "24000"]},
+    "aac": {"suffix": ".m4a", "args": ["-c:a", "aac", "-b:a", "48k", "-ar", "24000", "-movflags", "+faststart"]},
+}
+
+
+def filter_chain(loudness, true_peak, silence_threshold, silence_pad):
+    """Trims leading and trailing silence (the tail by trimming the reversed clip) and normalizes loudness."""
+    trim = f"silenceremove=start_periods=1:start_threshold={silence_threshold}dB:start_silence={silence_pad}"
+    return f"{trim},areverse,{trim},areverse,loudnorm=I={loudness}:TP={true_peak}:LRA=11"
+
+
+def variant_profiles(variants, chain):
+    """{variant: profile string}; the profile is part of the cache key, so changing a setting re-encodes."""
+    return {name: json.dumps([chain, VARIANTS[name]["args"]]) for name in variants}
+
+
+def variant_path(out_dir, name, rel):
+    return Path(out_dir) / name / Path(rel).with_suffix(VARIANTS[name]["suffix"])
+
+
+def run_ffmpeg(source, chain, outputs):
+    """Decodes the source once and encodes every variant in outputs ({variant: path}) from the filtered stream."""
+    labels = [f"[a{index}]" for index in range(len(outputs))]
+    split = f",asplit={len(outputs)}" if len(outputs) > 1 else ""
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin", "-y", "-i", str(source),
+               "-filter_complex", f"[0:a]{chain}{split}{''.join(labels)}"]
+    for label, (name, path) in zip(labels, outputs.items()):
+        command += ["-map", label, "-map_metadata", "-1", "-ac", "1", *VARIANTS[name]["args"], str(path)]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"ffmpeg exited with {result.returncode}")
+
+
+def process_clip(source_dir, rel, chain, profiles, cache_dir, out_dir):
+    """Runs in a worker process. Returns (rel, input bytes, {variant: output bytes}, encoded variants, error)."""
+    source = Path(source_dir) / rel
+    try:
+        with open(source, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        stores = {name: AudioStore(Path(cache_dir) / name, VARIANTS[name]["suffix"]) for name in profiles}
+        keys = {name: hashlib.sha256(f"{digest}:{profile}".encode("utf-8")).hexdigest() for name, profile in profiles.items()}
+
+        missing = {name: stores[name].path(keys[name]) for name in profiles if keys[name] not in stores[name]}
+        if missing:
+            tmp_paths = {}
+            for name, path in missing.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_paths[name] = path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+            try:
+                run_ffmpeg(source, chain, tmp_paths)
+                for name, tmp_path in tmp_paths.items():
+                    os.replace(tmp_path, missing[name])
+            finally:
+                for tmp_path in tmp_paths.values():
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+
+        sizes = {}
+        for name in profiles:
+            stores[name].place(keys[name], variant_path(out_dir, name, rel))
+            sizes[name] = stores[name].path(keys[name]).stat().st_size
+        return rel, len(data), sizes, len(missing), None
+    except Exception as e:
+        return rel, 0, {}, 0, str(e)
+
+
+def postprocess_tree(source_dir, out_dir, variants, chain, cache_dir=DEFAULT_CACHE_DIR, workers=None, prefix=""):
+    """Post-processes every clip under source_dir on a process pool; returns per-category byte totals and stats."""
+    inventory = AudioInventory.load(source_dir)
+    inventory.save()
+    clips = sorted(path for path in inventory.paths() if path.startswith(prefix))
+    profiles = variant_profiles(variants, chain)
+
+    totals = defaultdict(lambda: {"clips": 0, "input": 0, **{name: 0 for name in variants}})
+    stats = {"clips": len(clips), "encoded": 0, "cached": 0, "failed": 0}
+    workers = workers or os.cpu_count()
+    worker = partial(process_clip, str(source_dir), chain=chain, profiles=profiles, cache_dir=str(cache_dir), out_dir=str(out_dir))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(worker, clips, chunksize=max(1, min(64, len(clips) // (workers * 8))))
+        for index, (rel, input_size, sizes, encoded, error) in enumerate(results, 1):
+            if error:
+                stats["failed"] += 1
+                print(f"❌ {rel}: {error}")
+                continue
+            stats["encoded" if encoded else "cached"] += 1
+            category = totals[rel.split("/", 1)[0]]
+            category["clips"] += 1
+            category["input"] += input_size
+            for name, size in sizes.items():
+                category[name] += size
+            if index % 1000 == 0:
+                print(f"⏳ {index}/{len(clips)} clips processed")
+    return dict(totals), stats
+
+
+def print_report(totals, variants):
+    def line(label, values):
+        saved = ", ".join(
+            f"{name} {values[name] / 1024 / 1024:.1f} MiB (-{(1 - values[name] / values['input']) * 100:.0f}%)" if values["input"] else f"{name} 0 MiB"
+            for name in variants
+        )
+        print(f"  {label}: {values['clips']} clips, source {values['input'] / 1024 / 1024:.1f} MiB → {saved}")
+
+    print("📉 Bytes saved per category:")
+    for category, values in sorted(totals.items(), key=lambda item: -item[1]["input"]):
+        line(category, values)
+    overall = {"clips": 0, "input": 0, **{name: 0 for name in variants}}
+    for values in totals.values():
+        for key in overall:
+            overall[key] += values[key]
+    line("total", overall)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trim, loudness-normalize and transcode the audio tree into smaller variants.")
+    parser.add_argument("--source_dir", default="resources/audio", help="Audio tree written by the TTS stage")
+    parser.add_argument("--out_dir", default=DEFAULT_OUT_DIR, help="Variants are written to <out_dir>/<variant>/ in the same layout")
+    parser.add_argument("--variants", nargs="+", choices=sorted(VARIANTS), default=["mp3"], help="Output variants (mp3 plus optional opus / aac)")
+    parser.add_argument("--category", default="", help="Only process clips of this category id")
+    parser.add_argument("--loudness", type=float, default=-16.0, help="Target integrated loudness in LUFS")
+    parser.add_argument("--true-peak", type=float, default=-1.5, help="Maximum true peak in dBTP")
+    parser.add_argument("--silence-threshold", type=float, default=-50.0, help="Level in dB below which leading and trailing audio counts as silence")
+    parser.add_argument("--silence-pad", type=float, default=0.05, help="Seconds of silence kept at each end")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Encoded clips keyed by input hash and settings")
+    parser.add_argument("--report-json", help="Also write the per-category byte totals to this JSON file")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        print("❌ ffmpeg is not installed or not on PATH.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    chain = filter_chain(args.loudness, args.true_peak, args.silence_threshold, args.silence_pad)
+    totals, stats = postprocess_tree(args.source_dir, args.out_dir, args.variants, chain, args.cache_dir, args.workers,
+                                     prefix=f"{args.category}/" if args.category else "")
+    print_report(totals, args.variants)
+    print(
+        f"✅ {stats['clips']} clips in {time.perf_counter() - started:.1f}s: {stats['encoded']} encoded, "
+        f"{stats['cached']} from cache, {stats['failed']} failed"
+    )
+    if args.report_json:
+        with open(args.report_json, "w", encoding="utf-8") as f:
+            json.dump({"variants": args.variants, "stats": stats, "categories": totals}, f, indent=2)
+    sys.exit(1 if stats["failed"] else 0)
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from common.audio_layout import DEFAULT_VOICE_ID
+from sound.audio_store import utterance_key
+
+DEFAULT_CONCURRENCY = {"azure": 8, "aws": 4}
+# Endpoint overrides, e.g. to run against scripts/benchmarks/fake_providers.py
+AZURE_TTS_ENDPOINT = os.getenv("AZURE_TTS_ENDPOINT")
+AWS_POLLY_ENDPOINT = os.getenv("AWS_POLLY_ENDPOINT")
+
+
+def phoneme_ssml(text, phoneme=None):
+    if phoneme:
+        return f"<phoneme alphabet='ipa' ph='{phoneme}'>{text}</phoneme>"
+    return text
+
+
+class AzureProvider:
+    name = "azure"
+    region = "swedencentral"
+    output_format = "audio-48khz-192kbitrate-mono-mp3"
+
+    def __init__(self, pool_size):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        api_key = os.getenv("AZURE_TTS_KEY")
+        if not api_key:
+            raise RuntimeError("Environment variable AZURE_TTS_KEY is not set.")
+
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["POST"])
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Ocp-Apim-Subscription-Key": api_key,
+            "Content-Type": "application/ssml+xml",
+            "X-Microsoft-OutputFormat": self.output_format,
+            "User-Agent": "SvenskaGlosorApp"
+        })
+        self.url = AZURE_TTS_ENDPOINT or f"https://{self.region}.tts.speech.microsoft.com/cognitiveservices/v1"
+
+    def synthesize(self, text, voice_name, phoneme=None):
+        ssml = f"""
+    <speak version='1.0' xml:lang='sv-SE'>
+        <voice name='{voice_name}'>{phoneme_ssml(text, phoneme)}</voice>
+    </speak>
+    """
+        response = self.session.post(self.url, data=ssml.encode("utf-8"))
+        if response.status_code != 200:
+            raise RuntimeError(f"Azure TTS error {response.status_code}: {response.text}")
+        return response.content
+
+    def close(self):
+        self.session.close()
+
+
+class AwsProvider:
+    name = "aws"
+    region = "us-east-1"
+    output_format = "mp3"
+
+    def __init__(self, pool_size):
+        import boto3
+        from botocore.config import Config
+
+        if not os.getenv("AWS_ACCESS_KEY_ID") or not os.getenv("AWS_SECRET_ACCESS_KEY"):
+            raise RuntimeError("AWS credentials are not set (AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY).")
+
+        config = Config(max_pool_connections=pool_size, retries={"max_attempts": 3, "mode": "adaptive"})
+        self.client = boto3.client("polly", region_name=self.region, config=config, endpoint_url=AWS_POLLY_ENDPOINT)
+
+    def synthesize(self, text, voice_name, phoneme=None):
+        ssml = f"""<speak xmlns="http://www.w3.org/2001/10/synthesis" version="1.0" xml:lang="sv-SE">
+    {phoneme_ssml(text, phoneme)}
+</speak>"""
+        response = self.client.synthesize_speech(
+            Text=ssml,
+            VoiceId=voice_name,
+            OutputFormat=self.output_format,
+            TextType="ssml",
+            Engine="neural"
+        )
+        if "AudioStream" not in response:
+            raise RuntimeError("Polly returned no audio stream")
+        return response["AudioStream"].read()
+
+    def close(self):
+        self.client.close()
+
+
+PROVIDERS = {provider.name: provider for provider in (AzureProvider, AwsProvider)}
+
+
+class TTSEngine:
+    """In-process speech synthesis: voices are read once from voice.json, and every provider
+    keeps one pooled client that is shared by all requests, bounded by a per-provider limit.
+    With an AudioStore, a provider is only called for utterances the store has not seen yet."""
+
+    def __init__(self, voice_config_path, concurrency=None, store=None):
+        with open(voice_config_path, encoding="utf-8") as f:
+            self.voices = {voice["id"]: voice for voice in json.load(f)}
+        self.concurrency = dict(DEFAULT_CONCURRENCY, **(concurrency or {}))
+        self.providers = {}
+        self.limits = {name: threading.BoundedSemaphore(limit) for name, limit in self.concurrency.items()}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=sum(self.concurrency.values()))
+        self.store = store
+        self.utterance_locks = defaultdict(threading.Lock)
+        self.stats = {"synthesized": 0, "reused": 0}
+
+    def voice(self, voice_id):
+        """The voice.json entry of voice_id (the default voice for None); raises ValueError for an unknown id,
+        since clips of a stand-in voice would be stored under the requested voice's directory."""
+        voice = self.voices.get(voice_id or DEFAULT_VOICE_ID)
+        if voice is None:
+            raise ValueError(f"unknown voice id {voice_id}, it is not in voice.json")
+        return voice
+
+    def provider(self, name):
+        with self.lock:
+            if name not in self.providers:
+                self.providers[name] = PROVIDERS[name](self.concurrency[name])
+            return self.providers[name]
+
+    def synthesize(self, text, phoneme=None, voice_id=None):
+        voice = self.voice(voice_id)
+        provider = self.provider(voice["provider"])
+        with self.limits[provider.name]:
+            return provider.synthesize(text, voice["voiceName"], phoneme)
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def synthesize_to_file(self, text, phoneme, output_path, voice_id=None):
+        if self.store is None:
+            audio = self.synthesize(text, phoneme, voice_id)
+            self._count("synthesized")
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "wb") as f:
+                f.write(audio)
+            return output_path
+
+        voice = self.voice(voice_id)
+        key = utterance_key(text, phoneme, voice["id"], PROVIDERS[voice["provider"]].output_format)
+        with self.lock:
+            utterance_lock = self.utterance_locks[key]
+        # Identical utterances in flight (e.g. a form shared by several entries) are synthesized once.
+        with utterance_lock:
+            if self.store.place(key, output_path):
+                self._count("reused")
+                return output_path
+            self.store.put(key, self.synthesize(text, phoneme, voice["id"]))
+            self._count("synthesized")
+        self.store.place(key, output_path)
+        return output_path
+
+    def submit(self, text, phoneme, output_path, voice_id=None):
+        return self.executor.submit(self.synthesize_to_file, text, phoneme, output_path, voice_id)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for provider in self.providers.values():
+            provider.close()
+
+    def report(self):
+        print(f"📊 TTS: {self.stats['synthesized']} clips synthesized, {self.stats['reused']} reused from the audio store")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
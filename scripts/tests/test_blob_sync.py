@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common import blob_sync
+from common.blob_sync import BlobManifest, BlobSync, file_md5
+
+
+def write_files(source_dir, files):
+    for name, content in files.items():
+        path = source_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def synced(source_dir, manifest_path, remote, delete=False):
+    """Plans a sync of source_dir against the listed remote blobs; returns (sync, upload names, deletes)."""
+    sync = BlobSync(None, source_dir, BlobManifest(manifest_path), delete=delete)
+    uploads, deletes = sync.plan(sync.scan_local(), remote)
+    return sync, sorted(name for _, name in uploads), deletes
+
+
+def uploaded(sync, names):
+    """What run() records after a successful upload: the remote listing and the manifest ETags."""
+    remote = {}
+    for name in names:
+        entry = sync.manifest.get(name)
+        entry["etag"] = f"etag-{name}"
+        remote[name] = (entry["size"], entry["etag"], None)
+    sync.manifest.save()
+    return remote
+
+
+def test_second_sync_uploads_nothing_and_hashes_nothing(tmp_path, monkeypatch):
+    write_files(tmp_path / "audio", {"a/1.mp3": b"one", "a/2.mp3": b"two", "b/3.mp3": b"three", "notes.txt": b"skip"})
+    sync, uploads, _ = synced(tmp_path / "audio", tmp_path / "manifest.json", {})
+    assert uploads == ["a/1.mp3", "a/2.mp3", "b/3.mp3"]
+    remote = uploaded(sync, uploads)
+
+    hashed = []
+    monkeypatch.setattr(blob_sync, "file_md5", lambda path: hashed.append(path) or file_md5(path))
+    sync, uploads, deletes = synced(tmp_path / "audio", tmp_path / "manifest.json", remote, delete=True)
+
+    assert (uploads, deletes, hashed) == ([], [], [])
+    assert sync.stats["unchanged"] == 3
+
+
+def test_changed_missing_and_replaced_blobs_are_uploaded(tmp_path):
+    write_files(tmp_path / "audio", {"1.mp3": b"one", "2.mp3": b"two", "3.mp3": b"three"})
+    sync, uploads, _ = synced(tmp_path / "audio", tmp_path / "manifest.json", {})
+    remote = uploaded(sync, uploads)
+
+    write_files(tmp_path / "audio", {"1.mp3": b"one, longer"})
+    del remote["2.mp3"]
+    remote["3.mp3"] = (remote["3.mp3"][0], "etag-from-someone-else", None)
+    sync, uploads, _ = synced(tmp_path / "audio", tmp_path / "manifest.json", remote)
+
+    assert uploads == ["1.mp3", "2.mp3", "3.mp3"]
+    assert sync.stats["hashed"] == 1
+
+
+def test_listing_md5_replaces_a_missing_manifest(tmp_path):
+    write_files(tmp_path / "audio", {"1.mp3": b"one", "2.mp3": b"two"})
+    remote = {
+        "1.mp3": (3, "etag-1", file_md5(tmp_path / "audio" / "1.mp3")),
+        "2.mp3": (3, "etag-2", "0" * 32),
+    }
+
+    sync, uploads, _ = synced(tmp_path / "audio", tmp_path / "manifest.json", remote)
+
+    assert uploads == ["2.mp3"]
+    assert sync.manifest.get("1.mp3")["etag"] == "etag-1"
+
+
+def test_remote_only_blobs_are_deleted_only_on_request(tmp_path):
+    write_files(tmp_path / "audio", {"1.mp3": b"one", "2.mp3": b"two"})
+    sync, uploads, _ = synced(tmp_path / "audio", tmp_path / "manifest.json", {})
+    remote = uploaded(sync, uploads)
+
+    (tmp_path / "audio" / "2.mp3").unlink()
+    _, _, kept = synced(tmp_path / "audio", tmp_path / "manifest.json", remote)
+    sync, _, deletes = synced(tmp_path / "audio", tmp_path / "manifest.json", remote, delete=True)
+
+    assert (kept, deletes) == ([], ["2.mp3"])
+    assert set(sync.manifest.entries) == {"1.mp3"}
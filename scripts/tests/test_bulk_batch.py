@@ -0,0 +1,108 @@
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "word"))
+from benchmarks.fake_providers import LEVELS, batch_responder
+from common.batch_backend import LocalBatchBackend, batch_request, read_batch_output
+import bulk_batch
+
+
+def entry(name, **fields):
+    return {"id": f"entry-{name}", "word": name, "translations": {"ru": f"ru {name}"}, **fields}
+
+
+def write_base(path):
+    base = [{
+        "id": "category-1",
+        "translations": {"en": "Food"},
+        "entries": [
+            entry("bröd", version=2, voiceEntries=["voice"], examples=[{"text": "Gammalt exempel."}]),
+            entry("mjölk", version=-1),
+        ],
+    }]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(base, f, ensure_ascii=False, indent=2)
+
+
+def run_job(tmp_path, job, responder=batch_responder, overwrite=True):
+    """export, submit, poll and merge one job through the local backend; returns the merged base."""
+    args = argparse.Namespace(
+        job=job, file=str(tmp_path / "word.json"), out=str(tmp_path / f"{job}.jsonl"), input=str(tmp_path / f"{job}.jsonl"),
+        overwrite=overwrite, fallback_to_word_only=False, backend="local", local_dir=str(tmp_path / "local"),
+        responder=responder, wait=False, interval=0, results=None, failed_out=None,
+    )
+    bulk_batch.export(args)
+    bulk_batch.submit(args)
+    bulk_batch.poll(args)
+    args.results = str(tmp_path / f"{job}.output.jsonl")
+    bulk_batch.merge(args)
+    with open(tmp_path / "word.json", encoding="utf-8") as f:
+        return {item["word"]: item for item in json.load(f)[0]["entries"]}
+
+
+def test_local_backend_completes_with_a_responder(tmp_path):
+    with open(tmp_path / "input.jsonl", "w", encoding="utf-8") as f:
+        for custom_id in ("ok", "broken"):
+            f.write(json.dumps(batch_request(custom_id, [{"role": "user", "content": custom_id}])) + "\n")
+
+    def responder(body):
+        if body["messages"][0]["content"] == "broken":
+            raise ValueError("no answer")
+        return "answer"
+
+    backend = LocalBatchBackend(tmp_path / "local", responder)
+    batch = backend.status(backend.submit(tmp_path / "input.jsonl"))
+    backend.download(batch, tmp_path / "output.jsonl")
+
+    assert batch["status"] == "completed"
+    assert [(custom_id, content, error is None) for custom_id, content, error in read_batch_output(tmp_path / "output.jsonl")] == [
+        ("ok", "answer", True), ("broken", None, False),
+    ]
+
+
+def test_local_backend_waits_for_output_without_a_responder(tmp_path):
+    (tmp_path / "input.jsonl").write_text("", encoding="utf-8")
+    backend = LocalBatchBackend(tmp_path / "local")
+
+    assert backend.status(backend.submit(tmp_path / "input.jsonl"))["status"] == "in_progress"
+
+
+def test_level_merge_is_idempotent(tmp_path):
+    write_base(tmp_path / "word.json")
+    random.seed(1)
+    first = run_job(tmp_path, "level")
+    before = (tmp_path / "word.json").read_bytes()
+
+    bulk_batch.merge(argparse.Namespace(file=str(tmp_path / "word.json"), results=str(tmp_path / "level.output.jsonl"), failed_out=None))
+
+    assert {item["level"] for item in first.values()} <= set(LEVELS)
+    assert (tmp_path / "word.json").read_bytes() == before
+
+
+def test_details_merge_bumps_existing_versions_once(tmp_path):
+    write_base(tmp_path / "word.json")
+    merged = run_job(tmp_path, "details")
+
+    # "bröd" has clips of version 2 for its old examples, so the new examples get version 3; "mjölk" had no audio.
+    assert merged["bröd"]["version"] == 3
+    assert merged["mjölk"]["version"] == 1
+    assert len(merged["bröd"]["examples"]) >= 10
+
+    before = (tmp_path / "word.json").read_bytes()
+    bulk_batch.merge(argparse.Namespace(file=str(tmp_path / "word.json"), results=str(tmp_path / "details.output.jsonl"), failed_out=None))
+    assert (tmp_path / "word.json").read_bytes() == before
+
+
+def test_merge_reports_failed_lines(tmp_path):
+    write_base(tmp_path / "word.json")
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_job(tmp_path, "level", responder=lambda body: "not json")
+
+    assert exit_info.value.code == 1
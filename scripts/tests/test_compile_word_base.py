@@ -0,0 +1,46 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "release"))
+from compile_word_base import compile_word_base
+
+
+def entry(number, **fields):
+    return {"id": f"00000000-0000-4000-8000-{number:012d}", "word": f"ord{number}", "version": 1,
+            "translations": {"ru": "слово"}, "examples": [], **fields}
+
+
+def write_base(path, entries):
+    categories = [{"id": "10000000-0000-4000-8000-000000000001", "translations": {"en": "Food"}, "entries": entries}]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(categories, f, ensure_ascii=False)
+
+
+def test_compiles_entries(tmp_path):
+    write_base(tmp_path / "word.json", [entry(1), entry(2, level="a1")])
+
+    counts = compile_word_base(tmp_path / "word.json", tmp_path / "out.sqlite")
+
+    assert counts == {"categories": 1, "entries": 2}
+    db = sqlite3.connect(tmp_path / "out.sqlite")
+    assert db.execute("SELECT word, level FROM entries ORDER BY id").fetchall() == [("ord1", None), ("ord2", 0)]
+    db.close()
+
+
+@pytest.mark.parametrize("entries, error", [
+    ([entry(1), entry(1)], ValueError),
+    ([entry(1), {"id": "00000000-0000-4000-8000-000000000002"}], KeyError),
+    ([entry(1), entry(2, id="not-a-uuid")], ValueError),
+], ids=["duplicate_id", "missing_word", "bad_uuid"])
+def test_failed_compile_leaves_no_artifact(tmp_path, entries, error):
+    write_base(tmp_path / "word.json", entries)
+
+    with pytest.raises(error):
+        compile_word_base(tmp_path / "word.json", tmp_path / "out.sqlite")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["word.json"]
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "word"))
+from benchmarks.fake_providers import chat_answer
+from common.fingerprints import Fingerprints, level_fingerprint
+from common.journal import Journal, default_journal_path
+from common.openai_scheduler import RequestScheduler
+import compute_level_word
+
+
+class FakeClient:
+    async def close(self):
+        pass
+
+
+def fake_scheduler(args):
+    scheduler = RequestScheduler(workers=2, client=FakeClient())
+
+    async def send(request):
+        return json.dumps(chat_answer(request["messages"]))
+
+    scheduler._send = send
+    return scheduler
+
+
+def run(monkeypatch, *argv):
+    monkeypatch.setattr(compute_level_word.RequestScheduler, "from_args", staticmethod(fake_scheduler))
+    monkeypatch.setattr(sys, "argv", ["compute_level_word.py", *argv])
+    asyncio.run(compute_level_word.main())
+
+
+def write_base(path):
+    entries = [{"id": f"entry-{index}", "word": f"ord{index}", "translations": {"ru": f"слово {index}"}} for index in range(3)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"id": "category-1", "translations": {}, "entries": entries}], f, ensure_ascii=False, indent=2)
+    return entries
+
+
+def test_no_compact_keeps_levels_in_the_journal_and_saves_fingerprints(tmp_path, monkeypatch):
+    base = tmp_path / "word.json"
+    entries = write_base(base)
+    original = base.read_bytes()
+
+    run(monkeypatch, "--all", "--batch", "--no-compact", "--file", str(base))
+
+    assert base.read_bytes() == original
+    journal = Journal(default_journal_path(base, "level"))
+    assert {record["id"] for record in journal.records()} == {entry["id"] for entry in entries}
+    fingerprints = Fingerprints.for_base(base)
+    assert all(fingerprints.get(entry["id"], "level") == level_fingerprint(entry) for entry in entries)
+
+
+def test_compacting_run_writes_levels_and_drops_the_journal(tmp_path, monkeypatch):
+    base = tmp_path / "word.json"
+    write_base(base)
+
+    run(monkeypatch, "--all", "--file", str(base))
+
+    with open(base, encoding="utf-8") as f:
+        assert all(entry["level"] in compute_level_word.LEVELS for entry in json.load(f)[0]["entries"])
+    assert not default_journal_path(base, "level").exists()
@@ -0,0 +1,127 @@
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "release"))
+from diff_word_base import apply_patch, canonical_hash, diff, load, make_patch
+
+
+def entry(name, **fields):
+    return {
+        "id": f"entry-{name}",
+        "version": 1,
+        "word": name,
+        "forms": [{"form": f"{name}en"}],
+        "translations": {"ru": f"ru {name}", "en": f"en {name}"},
+        "examples": [{"text": f"Ett exempel med {name}."}],
+        "voiceEntries": [],
+        **fields,
+    }
+
+
+def category(name, entries, **fields):
+    return {"id": f"category-{name}", "translations": {"en": name}, **fields, "entries": entries}
+
+
+def old_base():
+    return [
+        category("food", [entry("bröd"), entry("mjölk", level="a1"), entry("ost")]),
+        category("animals", [entry("hund"), entry("katt"), entry("häst")]),
+        category("numbers", [entry("ett"), entry("två")]),
+    ]
+
+
+def round_trip(old, new):
+    """Diffs, sends the patch through JSON and applies it to a fresh copy of old; returns (patch, patched base)."""
+    patch = json.loads(json.dumps(diff(copy.deepcopy(old), copy.deepcopy(new)), ensure_ascii=False))
+    sent = copy.deepcopy(patch)
+    patched = apply_patch(copy.deepcopy(old), patch)
+    assert patch == sent, "apply_patch must not modify the patch"
+    return patch, patched
+
+
+def ops(patch, kind):
+    return [op for op in patch["ops"] if op["op"] == kind]
+
+
+def test_identical_bases_give_an_empty_patch():
+    patch, patched = round_trip(old_base(), old_base())
+
+    assert patch["ops"] == []
+    assert patch["from"] == patch["to"] == canonical_hash(old_base())
+    assert patched == old_base()
+
+
+def test_field_updates_are_diffed_per_translation():
+    new = old_base()
+    food = new[0]["entries"]
+    food[0]["translations"]["de"] = "Brot"
+    del food[0]["translations"]["ru"]
+    food[1]["level"] = "a2"
+    del food[2]["examples"]
+    new[1]["translations"]["sv"] = "djur"
+
+    patch, patched = round_trip(old_base(), new)
+
+    assert canonical_hash(patched) == patch["to"]
+    assert patched == new
+    update = ops(patch, "update_entry")[0]
+    assert update["set"] == {"translations.de": "Brot"} and update["unset"] == ["translations.ru"]
+
+
+def test_moves_into_a_new_category_and_removed_categories():
+    old, new = old_base(), old_base()
+    food, animals, numbers = new
+    pets = category("pets", [animals["entries"][1], animals["entries"][0], entry("kanin")], icon="paw")
+    # "numbers" is removed, but "två" lives on in "food"; "ett" goes with its category.
+    food["entries"].insert(1, numbers["entries"][1])
+    animals["entries"] = [animals["entries"][2]]
+    new[:] = [pets, food, animals]
+
+    patch, patched = round_trip(old, new)
+
+    assert canonical_hash(patched) == patch["to"] == canonical_hash(new)
+    assert patched == new
+    assert [op["category"]["id"] for op in ops(patch, "add_category")] == ["category-pets"]
+    assert sorted(op["id"] for op in ops(patch, "move_entry")) == ["entry-hund", "entry-katt", "entry-två"]
+    assert [op["id"] for op in ops(patch, "remove_category")] == ["category-numbers"]
+    assert [op["entry"]["id"] for op in ops(patch, "add_entry")] == ["entry-kanin"]
+
+
+def test_removed_entries_and_reordering():
+    new = old_base()
+    new[0]["entries"] = [new[0]["entries"][2], new[0]["entries"][0]]
+    new[2]["entries"].append(entry("tre"))
+    new.reverse()
+
+    patch, patched = round_trip(old_base(), new)
+
+    assert canonical_hash(patched) == patch["to"]
+    assert patched == new
+    assert [op["id"] for op in ops(patch, "remove_entry")] == ["entry-mjölk"]
+    assert ops(patch, "order_categories") and ops(patch, "order_entries")
+
+
+def test_apply_rejects_a_patch_for_another_base():
+    new = old_base()
+    new[0]["entries"].pop()
+    patch = diff(old_base(), new)
+
+    with pytest.raises(ValueError):
+        apply_patch(new, patch)
+
+
+def test_make_patch_writes_a_verified_patch(tmp_path):
+    new = old_base()
+    new[1]["entries"].append(entry("räv"))
+    for name, data in (("old.json", old_base()), ("new.json", new)):
+        with open(tmp_path / name, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    make_patch(tmp_path / "old.json", tmp_path / "new.json", tmp_path / "patch.json")
+
+    assert canonical_hash(apply_patch(load(tmp_path / "old.json"), load(tmp_path / "patch.json"))) == canonical_hash(new)
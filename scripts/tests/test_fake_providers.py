@@ -0,0 +1,64 @@
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.fake_providers import FakeProviders, parse_latency, serve
+
+
+@pytest.fixture
+def server():
+    fixed = parse_latency("fixed:0")
+    server = serve(FakeProviders(fixed, fixed), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, path, body):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_address[1]}{path}", data=body, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_chat_answers_a_prompt(server):
+    body = json.dumps({"messages": [{"role": "user", "content": "Translate to the following languages: en, de."}]}).encode()
+
+    status, answer = post(server, "/v1/chat/completions", body)
+
+    assert status == 200
+    assert set(json.loads(json.loads(answer)["choices"][0]["message"]["content"])) == {"en", "de"}
+
+
+@pytest.mark.parametrize("body", [b"not json", b"[1, 2]", b'{"messages": "hi"}', b'{"messages": ["hi"]}', b'{"messages": [{"content": 5}]}'])
+def test_malformed_chat_requests_get_a_400(server, body):
+    status, answer = post(server, "/v1/chat/completions", body)
+
+    assert status == 400
+    assert json.loads(answer)["error"]["type"] == "invalid_request_error"
+    assert server.fakes.stats == {"openai.invalid": 1}
+
+
+@pytest.mark.parametrize("body", [b"not json", b'"text"', b'{"Text": ["hej"]}'])
+def test_malformed_polly_requests_get_a_400(server, body):
+    status, _ = post(server, "/v1/speech", body)
+
+    assert status == 400
+    assert server.fakes.stats == {"polly.invalid": 1}
+
+
+def test_polly_speaks_the_text(server):
+    status, audio = post(server, "/v1/speech", json.dumps({"Text": "<speak>Hej</speak>"}).encode())
+
+    assert status == 200 and audio
+    assert server.fakes.stats == {"polly.ok": 1}
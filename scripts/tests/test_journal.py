@@ -0,0 +1,90 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.journal import Journal, compact, default_journal_path, job_journal_paths
+from common.word_base import WordBase
+
+
+def write_base(path):
+    entries = [{"id": f"entry-{index}", "word": f"ord{index}", "translations": {"ru": f"слово {index}"}} for index in range(3)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"id": "category-1", "translations": {}, "entries": entries}], f, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return {entry["id"]: entry for entry in json.load(f)[0]["entries"]}
+
+
+def test_every_job_has_its_own_journal(tmp_path):
+    base = tmp_path / "word.json"
+    for job in ("translate", "level"):
+        with Journal(default_journal_path(base, job)) as journal:
+            journal.record(job, "entry-0", {job: True})
+    with Journal(tmp_path / "other.level.journal.jsonl") as journal:
+        journal.record("level", "entry-0", {})
+
+    assert [path.name for path in job_journal_paths(base)] == ["word.level.journal.jsonl", "word.translate.journal.jsonl"]
+
+
+def test_replay_applies_records_and_skips_a_torn_last_line(tmp_path):
+    write_base(tmp_path / "word.json")
+    journal = Journal(default_journal_path(tmp_path / "word.json", "level"))
+    journal.record("level", "entry-0", {"level": "a1"})
+    journal.record("translate", "entry-1", {"translations": {"ru": "новое", "en": "new"}})
+    journal.record("level", "category-1", {"order": 2}, kind="category")
+    journal.record("level", "entry-gone", {"level": "b1"})
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"job": "level", "id": "entry-2", "set": {"lev')
+
+    word_base = WordBase.load(tmp_path / "word.json")
+    done = journal.replay(word_base, "level")
+
+    assert done == {"entry-0", "category-1"}
+    assert word_base.entry("entry-0")["level"] == "a1"
+    assert word_base.entry("entry-1")["translations"] == {"ru": "новое", "en": "new"}
+    assert word_base.category("category-1")["order"] == 2
+    assert "level" not in word_base.entry("entry-2")
+
+
+def test_later_records_win(tmp_path):
+    write_base(tmp_path / "word.json")
+    journal = Journal(tmp_path / "word.level.journal.jsonl")
+    journal.record("level", "entry-0", {"level": "a1"})
+    journal.record("level", "entry-0", {"level": "b2"})
+
+    word_base = WordBase.load(tmp_path / "word.json")
+    journal.replay(word_base)
+
+    assert word_base.entry("entry-0")["level"] == "b2"
+    journal.close()
+
+
+def test_compact_folds_every_job_and_removes_the_journals(tmp_path):
+    base = tmp_path / "word.json"
+    write_base(base)
+    with Journal(default_journal_path(base, "level")) as journal:
+        journal.record("level", "entry-0", {"level": "a2"})
+    with Journal(default_journal_path(base, "translate")) as journal:
+        journal.record("translate", "entry-1", {"translations": {"en": "word"}})
+
+    assert compact(base) == 2
+    assert load(base)["entry-0"]["level"] == "a2"
+    assert load(base)["entry-1"]["translations"] == {"en": "word"}
+    assert job_journal_paths(base) == []
+
+
+def test_compacting_one_job_leaves_the_others(tmp_path):
+    base = tmp_path / "word.json"
+    write_base(base)
+    for job in ("level", "translate"):
+        with Journal(default_journal_path(base, job)) as journal:
+            journal.record(job, "entry-0", {job: "done"})
+
+    compact(base, [default_journal_path(base, "level")], tmp_path / "out.json")
+
+    assert load(tmp_path / "out.json")["entry-0"] == dict(load(base)["entry-0"], level="done")
+    assert [path.name for path in job_journal_paths(base)] == ["word.translate.journal.jsonl"]
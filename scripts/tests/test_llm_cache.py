@@ -0,0 +1,96 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.llm_cache import LLMCache, request_key
+from common.openai_scheduler import RequestScheduler
+
+
+class FakeClient:
+    async def close(self):
+        pass
+
+
+def ask(cache_path, answers, sent, **chat_options):
+    """One chat through a fresh scheduler on the cache at cache_path; the fake model gives the next of `answers`."""
+    scheduler = RequestScheduler(workers=1, client=FakeClient(), cache=LLMCache(cache_path))
+
+    async def send(request):
+        sent.append(request)
+        return answers.pop(0)
+
+    scheduler._send = send
+
+    async def run():
+        async with scheduler:
+            return await scheduler.chat([{"role": "user", "content": "Which CEFR level is 'bröd'?"}], **chat_options)
+
+    return asyncio.run(run())
+
+
+def valid_level(content):
+    return json.loads(content)["level"]
+
+
+def test_request_key_ignores_key_order_but_not_parameters():
+    request = {"model": "gpt-4o", "temperature": 0, "messages": [{"role": "user", "content": "hej"}]}
+
+    assert request_key(request) == request_key(dict(reversed(list(request.items()))))
+    assert request_key(request) != request_key(dict(request, temperature=0.7))
+
+
+def test_put_get_delete(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite")
+    cache.put("key", "svar", "gpt-4o")
+
+    assert (cache.get("key"), cache.get("other")) == ("svar", None)
+    cache.delete("key")
+    assert cache.get("key") is None
+    assert (cache.stats["hits"], cache.stats["misses"], cache.stats["stored"]) == (1, 2, 1)
+    cache.close()
+
+
+def test_evicts_old_entries_then_least_recently_used(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite", max_age_days=30, max_bytes=10)
+    for number, key in enumerate(("old", "used", "unused", "newest")):
+        cache.put(key, "1234")
+        cache.db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (number, key))
+    cache.db.execute("UPDATE responses SET created = 0 WHERE key = 'old'")
+    cache.get("used")
+
+    assert cache.evict() == 2
+    assert {key for key in ("old", "used", "unused", "newest") if cache.get(key)} == {"used", "newest"}
+    assert cache.summary()["bytes"] == 8
+    cache.close()
+
+
+def test_only_validated_answers_are_cached(tmp_path):
+    cache_path, sent = tmp_path / "cache.sqlite", []
+
+    # The malformed answer is returned to the caller, who retries it, but it is not replayed from the cache.
+    assert ask(cache_path, ["Sure! a1"], sent, validate=valid_level) == "Sure! a1"
+    assert ask(cache_path, ['{"level": "a1"}'], sent, validate=valid_level) == '{"level": "a1"}'
+    assert ask(cache_path, [], sent, validate=valid_level) == '{"level": "a1"}'
+    assert len(sent) == 2
+
+
+def test_a_cached_answer_that_no_longer_validates_is_asked_again(tmp_path):
+    cache_path, sent = tmp_path / "cache.sqlite", []
+    ask(cache_path, ['{"level": "a1"}'], sent, validate=valid_level)
+
+    assert ask(cache_path, ['{"level": "A1"}'], sent, validate=lambda content: valid_level(content) == "A1") == '{"level": "A1"}'
+    assert len(sent) == 2
+
+
+def test_unvalidated_and_sampled_requests_are_not_cached(tmp_path):
+    cache_path, sent = tmp_path / "cache.sqlite", []
+    for _ in range(2):
+        ask(cache_path, ['{"level": "a1"}'], sent)
+        ask(cache_path, ['{"level": "a1"}'], sent, validate=valid_level, temperature=0.7)
+    assert len(sent) == 4
+
+    ask(cache_path, ['{"level": "b1"}'], sent, validate=valid_level, temperature=0.7, cache_sampled=True)
+    assert ask(cache_path, [], sent, validate=valid_level, temperature=0.7, cache_sampled=True) == '{"level": "b1"}'
+    assert len(sent) == 5
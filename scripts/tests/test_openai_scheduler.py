@@ -0,0 +1,153 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from benchmarks.fake_providers import LEVELS, FakeProviders, chat_answer, parse_latency, serve
+from common.openai_scheduler import Budget, RequestScheduler, estimate_tokens, parse_reset, retry_after
+
+
+class FakeClient:
+    async def close(self):
+        pass
+
+
+def fake_scheduler(sent, delay=0.01, **kwargs):
+    """A scheduler whose requests never leave the process; every request sent is appended to `sent`."""
+    scheduler = RequestScheduler(client=FakeClient(), **kwargs)
+
+    async def send(request):
+        sent.append(request)
+        await asyncio.sleep(delay)
+        return json.dumps(chat_answer(request["messages"]))
+
+    scheduler._send = send
+    return scheduler
+
+
+def messages(text):
+    return [{"role": "user", "content": text}]
+
+
+@pytest.mark.parametrize("value, seconds", [("1s", 1), ("6m0s", 360), ("20ms", 0.02), ("0.5", 0.5), ("1h2m", 3720)])
+def test_parse_reset(value, seconds):
+    assert parse_reset(value) == pytest.approx(seconds)
+    assert parse_reset("") is None
+
+
+def test_retry_after_prefers_milliseconds():
+    assert retry_after({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+    assert retry_after({"retry-after": "2"}) == 2
+    assert retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert retry_after(None) is None
+
+
+def test_budget_refills_over_a_minute():
+    budget = Budget(60)
+    budget.take(60)
+
+    assert budget.wait_time(1) == pytest.approx(1, abs=0.01)
+    # A request larger than the whole budget waits for a full bucket instead of forever.
+    assert budget.wait_time(1000) == pytest.approx(60, abs=0.01)
+
+    budget.updated -= 30
+    assert budget.wait_time(30) == 0
+    budget.give_back(1000)
+    assert budget.available == 60
+
+
+def test_budget_follows_the_limit_headers():
+    budget = Budget(500)
+    budget.take(100)
+
+    budget.sync(limit=1000, remaining=900, reset=None)
+    assert (budget.capacity, budget.available) == (1000, pytest.approx(400, abs=1))
+
+    # An exhausted window means waiting for its reset, however much we thought was left.
+    budget.sync(limit=None, remaining=0, reset=6)
+    assert budget.wait_time(1) == pytest.approx(6 + 0.06, abs=0.01)
+
+
+def test_estimate_tokens_counts_prompt_and_completion():
+    assert estimate_tokens(messages("x" * 400), max_tokens=100) == 100 + 8 + 100
+    assert estimate_tokens(messages("")) == 8 + 600
+
+
+def test_identical_requests_in_flight_are_sent_once():
+    sent = []
+
+    async def run():
+        async with fake_scheduler(sent, workers=4) as scheduler:
+            same = [scheduler.chat(messages("Which CEFR level?")) for _ in range(5)]
+            other = scheduler.chat(messages("Which CEFR level?"), temperature=0.7)
+            answers = await asyncio.gather(*same, other)
+            again = await scheduler.chat(messages("Which CEFR level?"))
+            return answers, again, scheduler.in_flight
+
+    answers, again, in_flight = asyncio.run(run())
+
+    assert len(set(answers[:5])) == 1
+    assert len(sent) == 3
+    assert json.loads(again)["level"] in LEVELS
+    assert in_flight == {}
+
+
+def test_a_pause_holds_back_every_worker():
+    sent = []
+
+    async def run():
+        async with fake_scheduler(sent, workers=4, delay=0) as scheduler:
+            # What a 429 does: one Retry-After pauses the whole scheduler, not only the throttled worker.
+            scheduler.paused_until = time.monotonic() + 0.2
+            started = time.monotonic()
+            await asyncio.gather(*(scheduler._reserve(10) for _ in range(4)))
+            return time.monotonic() - started, scheduler
+
+    elapsed, scheduler = asyncio.run(run())
+
+    assert elapsed >= 0.19
+    assert scheduler.requests.capacity - scheduler.requests.available == pytest.approx(4, abs=0.1)
+
+
+def test_the_request_budget_spaces_requests_out():
+    async def run():
+        async with fake_scheduler([], rpm=600, workers=4) as scheduler:
+            scheduler.requests.available = 0
+            started = time.monotonic()
+            await asyncio.gather(*(scheduler._reserve(1) for _ in range(3)))
+            return time.monotonic() - started
+
+    # 600 per minute is one every 0.1s.
+    assert asyncio.run(run()) == pytest.approx(0.3, abs=0.08)
+
+
+@pytest.fixture
+def throttling_server(monkeypatch):
+    pytest.importorskip("openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "fake")
+    fixed = parse_latency("fixed:0")
+    server = serve(FakeProviders(fixed, fixed, throttle_rate=0.5, retry_after=0.05, seed=3), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_throttled_requests_are_retried_against_the_fake_server(throttling_server):
+    base_url = f"http://127.0.0.1:{throttling_server.server_address[1]}/v1"
+
+    async def run():
+        async with RequestScheduler(workers=4, base_url=base_url, max_retries=20) as scheduler:
+            answers = await asyncio.gather(*(scheduler.chat(messages(f"Which CEFR level is ord {n}?")) for n in range(20)))
+            return answers, scheduler.stats
+
+    answers, stats = asyncio.run(run())
+
+    assert all("level" in json.loads(answer) for answer in answers)
+    assert stats["throttled"] == throttling_server.fakes.stats["openai.throttle"] > 0
+    assert stats["failed"] == 0
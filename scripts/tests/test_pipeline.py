@@ -0,0 +1,73 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.pipeline import Pipeline, Stage
+
+
+class Tracker:
+    """Async stage function that records what ran and how many calls overlapped."""
+
+    def __init__(self, name, log, result=True):
+        self.name = name
+        self.log = log
+        self.result = result
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, item):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        self.log.append((self.name, item))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result(item) if callable(self.result) else self.result
+
+
+def test_stages_follow_their_dependencies_and_concurrency_limits():
+    log = []
+    fetch, speak, save = Tracker("fetch", log), Tracker("speak", log), Tracker("save", log)
+    pipeline = Pipeline([
+        Stage("fetch", fetch, concurrency=3),
+        Stage("speak", speak, after=["fetch"], concurrency=2),
+        Stage("save", save, after=["fetch", "speak"]),
+    ])
+
+    results = asyncio.run(pipeline.run(range(6)))
+
+    assert results == [{"fetch": True, "speak": True, "save": True}] * 6
+    assert (fetch.peak, speak.peak, save.peak) == (3, 2, 1)
+    for item in range(6):
+        assert log.index(("fetch", item)) < log.index(("speak", item)) < log.index(("save", item))
+    assert {name: dict(counter) for name, counter in pipeline.stats.items()} == {name: {"done": 6} for name in ("fetch", "speak", "save")}
+
+
+@pytest.mark.parametrize("failure", [lambda item: item != 1, RuntimeError("boom")], ids=["returns_false", "raises"])
+def test_a_failed_stage_skips_only_its_dependants(failure):
+    log = []
+    translate = Tracker("translate", log, failure)
+    pipeline = Pipeline([
+        Stage("translate", translate, concurrency=2),
+        Stage("speak", Tracker("speak", log), after=["translate"]),
+        Stage("image", Tracker("image", log)),
+    ])
+
+    results = asyncio.run(pipeline.run([0, 1]))
+
+    failed = [item for item in (0, 1) if not results[item]["translate"]]
+    assert failed == ([1] if callable(failure) else [0, 1])
+    for item in failed:
+        assert results[item] == {"translate": False, "speak": False, "image": True}
+        assert ("speak", item) not in log
+    assert pipeline.stats["speak"]["skipped"] == len(failed)
+    assert pipeline.stats["translate"]["failed"] == len(failed)
+
+
+def test_stages_may_only_depend_on_earlier_stages():
+    with pytest.raises(ValueError):
+        Pipeline([Stage("speak", Tracker("speak", []), after=["translate"]), Stage("translate", Tracker("translate", []))])
@@ -0,0 +1,103 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "word"))
+from common import audio_inventory
+from common.audio_layout import entry_audio_dir, entry_clips
+from validate_word_base import Validator, entry_schema_errors
+
+FOOD = "10000000-0000-4000-8000-000000000001"
+ANIMALS = "10000000-0000-4000-8000-000000000002"
+VOICE = "20000000-0000-4000-8000-000000000001"
+
+
+def entry(number, **fields):
+    return {
+        "id": f"00000000-0000-4000-8000-{number:012d}", "word": f"ord{number}", "version": 1, "voiceEntries": [VOICE],
+        "forms": [{"form": f"orden{number}"}], "translations": {"ru": "слово"}, "examples": [{"text": "Ett exempel."}], **fields,
+    }
+
+
+def write_clips(audio_dir, category_id, item):
+    directory = entry_audio_dir(audio_dir, category_id, item)
+    directory.mkdir(parents=True, exist_ok=True)
+    for _, _, _, _, file_name in entry_clips(item):
+        (directory / file_name).write_bytes(b"mp3")
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def inventory_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_inventory, "DEFAULT_CACHE_DIR", str(tmp_path / "inventory"))
+
+
+def codes(issues):
+    return sorted((issue["code"], issue["entry"] or issue["path"] or issue["category"]) for issue in issues)
+
+
+def test_a_consistent_tree_has_no_issues(tmp_path):
+    voiced, unversioned = entry(1), entry(2, version=-1, voiceEntries=[])
+    with open(tmp_path / "word.json", "w", encoding="utf-8") as f:
+        json.dump([{"id": FOOD, "translations": {"en": "Food"}, "entries": [voiced, unversioned]}], f, ensure_ascii=False)
+    for item in (voiced, unversioned):
+        write_clips(tmp_path / "audio", FOOD, item)
+    (tmp_path / "images" / FOOD).mkdir(parents=True)
+    (tmp_path / "images" / FOOD / f"{voiced['id']}.png").write_bytes(b"png")
+
+    validator = Validator(tmp_path / "audio", tmp_path / "images", {VOICE})
+
+    assert validator.run(tmp_path / "word.json") == []
+    assert validator.summary() == {"categories": 1, "entries": 2, "clips": 6, "errors": 0, "warnings": 0, "by_code": {}}
+
+
+def test_finds_every_kind_of_issue_in_one_pass(tmp_path):
+    good, missing_clip, bad_level, unknown_voice = entry(1), entry(2), entry(3, level="z9"), entry(4, voiceEntries=["30000000-0000-4000-8000-000000000001"])
+    duplicate = entry(1, word="dublett")
+    base = [
+        {"id": FOOD, "translations": {"en": "Food"}, "entries": [good, missing_clip, bad_level]},
+        {"id": ANIMALS, "translations": {"en": "Animals"}, "entries": [unknown_voice, duplicate]},
+    ]
+    with open(tmp_path / "word.json", "w", encoding="utf-8") as f:
+        json.dump(base, f, ensure_ascii=False)
+    write_clips(tmp_path / "audio", FOOD, good)
+    (write_clips(tmp_path / "audio", FOOD, missing_clip) / f"{missing_clip['id']}_ex1.mp3").unlink()
+    # The clips of an entry that fails the schema are neither expected nor orphans.
+    write_clips(tmp_path / "audio", FOOD, bad_level)
+    write_clips(tmp_path / "audio", ANIMALS, unknown_voice)
+    (tmp_path / "audio" / ANIMALS / "stray.mp3").write_bytes(b"mp3")
+    (tmp_path / "images" / FOOD).mkdir(parents=True)
+    (tmp_path / "images" / FOOD / f"{good['id']}.png").write_bytes(b"png")
+    (tmp_path / "images" / FOOD / f"{unknown_voice['id']}.png").write_bytes(b"png")
+
+    issues = Validator(tmp_path / "audio", tmp_path / "images", {VOICE}).run(tmp_path / "word.json")
+
+    missing_path = f"{entry_audio_dir('', FOOD, missing_clip).as_posix()}/{missing_clip['id']}_ex1.mp3"
+    assert codes(issues) == sorted([
+        ("missing_audio", missing_clip["id"]),
+        ("schema", bad_level["id"]),
+        ("unknown_voice", unknown_voice["id"]),
+        ("duplicate_entry_id", good["id"]),
+        ("orphan_audio", f"{ANIMALS}/stray.mp3"),
+        ("orphan_image", f"{FOOD}/{unknown_voice['id']}.png"),
+        ("missing_category_images", ANIMALS),
+    ])
+    assert next(issue for issue in issues if issue["code"] == "missing_audio")["path"] == missing_path
+
+
+@pytest.mark.parametrize("fields, error", [
+    ({"id": "not-a-uuid"}, "id is not a UUID"),
+    ({"version": True}, "version is not an integer"),
+    ({"voiceEntries": ["voice"]}, "voiceEntries is not a list of UUIDs"),
+    ({"forms": [{"phoneme": "x"}]}, "forms is not a list of {form, phoneme?}"),
+    ({"translations": {"ru": 1}}, "translations is not a string map"),
+    ({"level": "A1"}, "level 'A1' is not a CEFRLevel"),
+    ({"examples": None}, "examples is not a list of {text, phoneme?}"),
+    ({"phoneme": 1}, "phoneme is not a string"),
+])
+def test_schema_errors_match_the_app_model(fields, error):
+    assert entry_schema_errors(entry(1)) == []
+    assert entry_schema_errors(entry(1, **fields)) == [error]
@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common import word_stream
+from common.word_stream import iter_categories, iter_entries, rewrite_entries, write_categories
+
+
+def entry(number, **fields):
+    return {
+        "id": f"00000000-0000-4000-8000-{number:012d}",
+        "version": 1,
+        "word": f"ord {number}",
+        "forms": [{"form": f"orden {number}", "phoneme": None}],
+        "translations": {"ru": f"слово {number}", "en": f"word {number}", "zh": "词"},
+        "examples": [{"text": f"Det här är ord {number}. \"Citat\" och \\ tecken"}],
+        "voiceEntries": [],
+        **fields,
+    }
+
+
+def word_base():
+    return [
+        {"id": "c1", "translations": {"ru": "Еда", "en": "Food"}, "entries": [entry(1), entry(2, level="a1", phoneme="ɔːrd")]},
+        {"id": "c2", "translations": {}, "entries": []},
+        {"id": "c3", "translations": {"en": "Numbers"}, "order": 3.5, "entries": [entry(3, extra={"nested": [], "empty": {}}), entry(4)]},
+    ]
+
+
+def dumped(data):
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+@pytest.fixture(params=[word_stream.CHUNK_SIZE, 7], ids=["default_chunks", "tiny_chunks"])
+def chunk_size(request, monkeypatch):
+    # Tiny chunks make values, strings and numbers straddle chunk borders.
+    monkeypatch.setattr(word_stream, "CHUNK_SIZE", request.param)
+    return request.param
+
+
+def test_iter_categories_matches_json_load(tmp_path, chunk_size):
+    data = word_base()
+    write_json(tmp_path / "word.json", data)
+
+    streamed = [dict(category, entries=list(entries)) for category, entries in iter_categories(tmp_path / "word.json")]
+
+    assert streamed == data
+    assert [entry["id"] for _, entry in iter_entries(tmp_path / "word.json")] == [entry(n)["id"] for n in range(1, 5)]
+
+
+def test_iter_categories_requires_entries_last(tmp_path):
+    write_json(tmp_path / "word.json", [{"id": "c1", "entries": [], "translations": {}}])
+
+    with pytest.raises(ValueError):
+        for _, entries in iter_categories(tmp_path / "word.json"):
+            list(entries)
+
+
+@pytest.mark.parametrize("data", [word_base(), []], ids=["base", "empty"])
+def test_write_categories_is_byte_identical_to_json_dump(tmp_path, data):
+    write_categories(tmp_path / "word.json", ((category, iter(category["entries"])) for category in data))
+
+    assert (tmp_path / "word.json").read_bytes() == dumped(data)
+
+
+def test_rewrite_entries_unchanged_is_byte_identical(tmp_path, chunk_size):
+    data = word_base()
+    write_json(tmp_path / "word.json", data)
+
+    rewrite_entries(tmp_path / "word.json", tmp_path / "out.json", lambda category, entry: entry)
+
+    assert (tmp_path / "out.json").read_bytes() == (tmp_path / "word.json").read_bytes() == dumped(data)
+
+
+def test_rewrite_entries_in_place_matches_json_dump_of_the_edit(tmp_path, chunk_size):
+    data = word_base()
+    write_json(tmp_path / "word.json", data)
+
+    def edit(category, item):
+        if item["word"] == "ord 2":
+            return None
+        item["translations"]["de"] = f"Wort {category['id']}"
+        return item
+
+    rewrite_entries(tmp_path / "word.json", tmp_path / "word.json", edit)
+
+    expected = word_base()
+    for category in expected:
+        category["entries"] = [edit(category, item) for item in category["entries"] if item["word"] != "ord 2"]
+    assert (tmp_path / "word.json").read_bytes() == dumped(expected)
+    assert not (tmp_path / "word.json.tmp").exists()
@@ -4,6 +4,9 @@ import uuid
 from pathlib import Path
 import sys
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+
 parser = argparse.ArgumentParser(description="Add a new word to an existing category.")
 parser.add_argument("--category-id", required=True, help="ID of the category to add the word to")
 parser.add_argument("--word", required=True, help="Main word in Swedish")
@@ -18,13 +21,12 @@ if not json_path.exists():
     print(f"❌ File not found: {json_path}", file=sys.stderr)
     sys.exit(1)
 
-with open(json_path, "r", encoding="utf-8") as f:
-    data = json.load(f)
+word_base = WordBase.load(json_path)
 
 if not args.quiet:
     print(f"🔍 Searching for category ID: {args.category_id}", file=sys.stderr)
 
-category = next((cat for cat in data if cat["id"] == args.category_id), None)
+category = word_base.category(args.category_id)
 if not category:
     print(f"❌ Category with ID '{args.category_id}' not found.", file=sys.stderr)
     sys.exit(1)
@@ -39,14 +41,15 @@ new_word = {
     "forms": [],
     "translations": {},
     "examples": [],
-    "voiceEntries": [],
-    "level": ""
+    "voiceEntries": []
 }
 
-category["entries"].append(new_word)
+existing_ids = word_base.ids_by_word(args.word)
+if existing_ids and not args.quiet:
+    print(f"⚠️ Word '{args.word}' already exists with ID(s): {', '.join(existing_ids)}", file=sys.stderr)
 
-with open(json_path, "w", encoding="utf-8") as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+word_base.add_entry(category["id"], new_word)
+word_base.save()
 
 if args.json:
     print(json.dumps({"id": new_word["id"]}))
@@ -1,16 +1,142 @@
 import argparse
-import subprocess
-
-parser = argparse.ArgumentParser()
-parser.add_argument('--file', required=True, help='Input file with first line as category_id, followed by words')
-args = parser.parse_args()
-
-with open(args.file, encoding="utf-8") as f:
-    lines = [line.strip() for line in f if line.strip()]
-    category_id = lines[0]
-    for word in lines[1:]:
-        print(f"\n📘 Adding word: {word}")
-        result = subprocess.run(
-            ["task", "add-word-full", f"CATEGORY_ID={category_id}", f"WORD={word}"],
-            capture_output=False,
-        )
\ No newline at end of file
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+from common.pipeline import Pipeline, Stage
+from common.openai_scheduler import RequestScheduler
+from common.blob_storage import BlobUploader, blob_name, container_client
+from common.audio_layout import entry_audio_dir, entry_clips
+
+from fill_word_details import fill_word_details
+from translate_word_only import translate_word_only
+from compute_level_word import determine_word_level
+from generate_audio_for_words import generate_entry_audio
+from sound.tts_engine import TTSEngine
+from sound.audio_store import AudioStore, DEFAULT_STORE_PATH
+
+DEFAULT_CONCURRENCY = {
+    "add": 1,
+    "fill": 8,
+    "translate": 8,
+    "level": 8,
+    "audio": 4,
+    "upload": 4,
+}
+
+
+class WordJob:
+    def __init__(self, category_id, word):
+        self.category_id = category_id
+        self.word = word
+        self.entry = None
+
+    def __str__(self):
+        return f"'{self.word}'"
+
+
+def parse_concurrency(values):
+    concurrency = dict(DEFAULT_CONCURRENCY)
+    for value in values or []:
+        name, _, limit = value.partition("=")
+        if name not in concurrency or not limit.isdigit():
+            raise SystemExit(f"❌ Invalid --concurrency value '{value}', expected one of {list(concurrency)}=N")
+        concurrency[name] = int(limit)
+    return concurrency
+
+
+def build_pipeline(args, word_base, scheduler, tts_engine, concurrency):
+    audio_container = None if args.skip_audio or args.skip_upload else container_client("audio", pool_size=concurrency["upload"] * 4)
+
+    async def add(job):
+        job.entry = word_base.add_entry(job.category_id, {
+            "id": str(uuid.uuid4()),
+            "version": 1,
+            "word": job.word,
+            "forms": [],
+            "translations": {},
+            "examples": [],
+            "voiceEntries": []
+        })
+        print(f"➕ Added '{job.word}' with ID {job.entry['id']}")
+        return True
+
+    async def fill(job):
+        return await fill_word_details(scheduler, job.entry)
+
+    async def translate(job):
+        return await translate_word_only(job.entry, scheduler)
+
+    async def level(job):
+        return await determine_word_level(job.entry, scheduler, fallback_to_word_only=True)
+
+    async def audio(job):
+        return await asyncio.to_thread(
+            generate_entry_audio, tts_engine, job.category_id, job.entry, args.audio_dir, True
+        )
+
+    async def upload(job):
+        # The clips were just written by the audio stage, so their paths follow from the layout.
+        directory = entry_audio_dir(args.audio_dir, job.category_id, job.entry)
+        files = [(directory / name, blob_name(directory / name, args.audio_dir)) for *_, name in entry_clips(job.entry)]
+        uploader = BlobUploader(audio_container, concurrency=4, overwrite=True)
+        await asyncio.to_thread(uploader.upload_all, files)
+        return uploader.stats["failed"] == 0
+
+    stages = [
+        Stage("add", add, concurrency=concurrency["add"]),
+        Stage("fill", fill, after=["add"], concurrency=concurrency["fill"]),
+        Stage("translate", translate, after=["fill"], concurrency=concurrency["translate"]),
+        Stage("level", level, after=["translate"], concurrency=concurrency["level"]),
+    ]
+    if not args.skip_audio:
+        stages.append(Stage("audio", audio, after=["fill"], concurrency=concurrency["audio"]))
+        if not args.skip_upload:
+            stages.append(Stage("upload", upload, after=["audio"], concurrency=concurrency["upload"]))
+    return Pipeline(stages)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Add many words to a category with full metadata in one process.")
+    parser.add_argument("--file", required=True, help="Input file with first line as category_id, followed by words")
+    parser.add_argument("--word-base", default="resources/word.json", help="Path to the word base JSON file")
+    parser.add_argument("--audio_dir", default="resources/audio", help="Directory to save audio files")
+    parser.add_argument("--voice_config", default="resources/voice.json", help="Voice configuration file")
+    parser.add_argument("--audio-store", default=DEFAULT_STORE_PATH, help="Content-addressed store of synthesized clips")
+    parser.add_argument("--concurrency", nargs="*", metavar="STAGE=N", help="Per-stage concurrency overrides, e.g. fill=16 audio=2")
+    parser.add_argument("--skip-audio", action="store_true", help="Do not generate or upload audio")
+    parser.add_argument("--skip-upload", action="store_true", help="Generate audio but do not upload it")
+    RequestScheduler.add_arguments(parser)
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    category_id, words = lines[0], lines[1:]
+
+    word_base = WordBase.load(args.word_base)
+    if not word_base.category(category_id):
+        print(f"❌ Category with ID '{category_id}' not found.")
+        sys.exit(1)
+
+    # One scheduler shared by all GPT stages, so the batch as a whole stays within the account rate limits.
+    scheduler = RequestScheduler.from_args(args)
+    tts_engine = TTSEngine(args.voice_config, store=AudioStore(args.audio_store))
+    pipeline = build_pipeline(args, word_base, scheduler, tts_engine, parse_concurrency(args.concurrency))
+    print(f"📘 Adding {len(words)} words to category {category_id}")
+    try:
+        await pipeline.run([WordJob(category_id, word) for word in words])
+    finally:
+        await scheduler.close()
+        tts_engine.close()
+        print(f"💾 Saving updated word base to {args.word_base}")
+        word_base.save()
+    pipeline.report()
+    scheduler.report()
+    tts_engine.report()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
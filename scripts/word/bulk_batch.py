@@ -0,0 +1,195 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+from common.word_stream import iter_entries
+from common.batch_backend import (
+    DONE_STATUSES,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+    batch_request,
+    load_responder,
+    read_batch_output,
+)
+
+from compute_level_word import apply_level, can_determine_level, level_messages
+from translate_word_only import TARGET_LANGS, apply_translations, translation_messages
+from fill_word_details import apply_details, details_messages, parse_details
+
+
+def apply_bulk_details(word, content):
+    """apply_details for a merge. An entry that already has a version keeps it, or gets the next one when
+    its text changed, so its recorded clips are regenerated instead of served for the new examples under version 1.
+    Merging the same results again leaves the version alone."""
+    version = word.get("version", -1)
+    before = (word.get("translations", {}).get("en"), word.get("forms") or [], word.get("examples"))
+    if not apply_details(word, *parse_details(word.get("word"), content)):
+        return False
+    if version > -1:
+        changed = (word["translations"].get("en"), word["forms"], word["examples"]) != before
+        word["version"] = version + 1 if changed else version
+    return True
+
+
+class BulkJob:
+    def __init__(self, name, select, messages, apply, temperature=0):
+        self.name = name
+        self.select = select
+        self.messages = messages
+        self.apply = apply
+        self.temperature = temperature
+
+
+JOBS = {job.name: job for job in (
+    BulkJob(
+        "level",
+        select=lambda word, args: (args.overwrite or "level" not in word) and can_determine_level(word, args.fallback_to_word_only),
+        messages=level_messages,
+        apply=apply_level,
+    ),
+    BulkJob(
+        "translate",
+        select=lambda word, args: bool(word.get("translations", {}).get("en"))
+        and any(lang not in word["translations"] for lang in TARGET_LANGS),
+        messages=translation_messages,
+        apply=apply_translations,
+    ),
+    BulkJob(
+        "details",
+        select=lambda word, args: args.overwrite or not word.get("examples"),
+        messages=lambda word: details_messages(word.get("word")),
+        apply=apply_bulk_details,
+        temperature=0.7,
+    ),
+)}
+
+
+def state_path(input_path):
+    return Path(str(input_path) + ".batch.json")
+
+
+def make_backend(args):
+    if args.backend == "local":
+        return LocalBatchBackend(args.local_dir, args.responder)
+    return OpenAIBatchBackend()
+
+
+def export(args):
+    job = JOBS[args.job]
+    output = Path(args.out)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for _, word in iter_entries(args.file):
+            if not job.select(word, args):
+                continue
+            request = batch_request(f"{job.name}:{word['id']}", job.messages(word), temperature=job.temperature)
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+            count += 1
+    print(f"📤 Exported {count} '{job.name}' requests to {output}")
+
+
+def submit(args):
+    batch_id = make_backend(args).submit(args.input)
+    with open(state_path(args.input), "w", encoding="utf-8") as f:
+        json.dump({"batch_id": batch_id, "backend": args.backend}, f, indent=2)
+    print(f"🚀 Submitted batch {batch_id}")
+    print(batch_id)
+
+
+def poll(args):
+    with open(state_path(args.input), encoding="utf-8") as f:
+        state = json.load(f)
+    backend = make_backend(args)
+    while True:
+        batch = backend.status(state["batch_id"])
+        print(f"⏳ Batch {state['batch_id']}: {batch['status']} {batch.get('request_counts') or ''}")
+        if batch["status"] in DONE_STATUSES or not args.wait:
+            break
+        time.sleep(args.interval)
+    if batch["status"] != "completed":
+        sys.exit(0 if batch["status"] not in DONE_STATUSES else 1)
+    results = Path(args.results or Path(args.input).with_suffix(".output.jsonl"))
+    backend.download(batch, results)
+    print(f"📥 Results saved to {results}")
+
+
+def merge(args):
+    word_base = WordBase.load(args.file)
+    merged, failed = 0, []
+    for custom_id, content, error in read_batch_output(args.results):
+        job_name, _, word_id = (custom_id or "").partition(":")
+        word = word_base.entry(word_id)
+        if error is None and (job_name not in JOBS or word is None):
+            error = "unknown job or entry id"
+        if error is None:
+            try:
+                if JOBS[job_name].apply(word, content):
+                    merged += 1
+                    continue
+                error = "response could not be applied"
+            except Exception as e:
+                error = str(e)
+        failed.append({"custom_id": custom_id, "error": error})
+
+    word_base.save()
+    print(f"✅ Merged {merged} results into {args.file}")
+    if failed:
+        print(f"⚠️ {len(failed)} failed lines:")
+        for failure in failed:
+            print(f"  - {failure['custom_id']}: {failure['error']}")
+        if args.failed_out:
+            with open(args.failed_out, "w", encoding="utf-8") as f:
+                for failure in failed:
+                    f.write(json.dumps(failure, ensure_ascii=False) + "\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run full-base GPT passes offline through the Batch API.")
+    parser.add_argument("--backend", choices=["openai", "local"], default="openai", help="Where batches are submitted")
+    parser.add_argument("--local-dir", default="batches/local", help="Directory used by the local backend")
+    parser.add_argument(
+        "--local-responder",
+        help="module:function answering each request body of a local batch, "
+             "e.g. benchmarks.fake_providers:batch_responder (default: wait for output.jsonl to be written)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Write all pending prompts of a job to a JSONL batch file")
+    export_parser.add_argument("--job", choices=sorted(JOBS), required=True)
+    export_parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    export_parser.add_argument("--out", required=True, help="Batch input JSONL to write")
+    export_parser.add_argument("--overwrite", action="store_true", help="Include entries that already have a result")
+    export_parser.add_argument("--fallback-to-word-only", action="store_true", help="Level job: include words without a Russian translation")
+    export_parser.set_defaults(func=export)
+
+    submit_parser = commands.add_parser("submit", help="Submit a batch input file")
+    submit_parser.add_argument("--input", required=True, help="Batch input JSONL")
+    submit_parser.set_defaults(func=submit)
+
+    poll_parser = commands.add_parser("poll", help="Check a submitted batch and download its results when done")
+    poll_parser.add_argument("--input", required=True, help="Batch input JSONL that was submitted")
+    poll_parser.add_argument("--results", help="Where to save the output JSONL (default: <input>.output.jsonl)")
+    poll_parser.add_argument("--wait", action="store_true", help="Keep polling until the batch is done")
+    poll_parser.add_argument("--interval", type=int, default=60, help="Seconds between polls with --wait")
+    poll_parser.set_defaults(func=poll)
+
+    merge_parser = commands.add_parser("merge", help="Merge a batch output file into the word base by entry id")
+    merge_parser.add_argument("--results", required=True, help="Batch output JSONL")
+    merge_parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    merge_parser.add_argument("--failed-out", help="Write failed lines to this JSONL file")
+    merge_parser.set_defaults(func=merge)
+
+    args = parser.parse_args()
+    args.responder = None
+    if args.local_responder:
+        try:
+            args.responder = load_responder(args.local_responder)
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error(f"--local-responder: {e}")
+    args.func(args)
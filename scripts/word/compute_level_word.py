@@ -1,13 +1,21 @@
 import argparse
 import json
 import asyncio
-import functools
 import os
-from aiolimiter import AsyncLimiter
-from openai import OpenAI
+import sys
+from pathlib import Path
 import re
 
-client = OpenAI()
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+from common.journal import Journal, default_journal_path
+from common.fingerprints import Fingerprints, level_fingerprint
+from common.openai_scheduler import RequestScheduler
+
+LEVELS = {"a1", "a2", "b1", "b2", "c1", "c2"}
+BATCH_SIZE = 50
+BATCH_TOKENS = 2000
+BATCH_ATTEMPTS = 3
 
 def extract_json(text):
     match = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL)
@@ -15,6 +23,12 @@ def extract_json(text):
         return match.group(1)
     return text
 
+def extract_json_array(text):
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if match:
+        return match.group(0)
+    return text
+
 def merge_translations(existing, new):
     for lang, translation in new.items():
         if lang not in existing:
@@ -22,14 +36,9 @@ def merge_translations(existing, new):
     return existing
 
 
-async def determine_word_level(word, limiter, fallback_to_word_only=False):
+def level_messages(word):
     word_text = word.get("word", "")
-    translations = word.get("translations", {})
-    ru_text = translations.get("ru", "")
-
-    if not ru_text and not fallback_to_word_only:
-        print(f"⚠️ Missing Russian translation for word '{word_text}', cannot determine level.")
-        return
+    ru_text = word.get("translations", {}).get("ru", "")
 
     if ru_text:
         # Use system prompt for Swedish + Russian translation
@@ -46,7 +55,7 @@ async def determine_word_level(word, limiter, fallback_to_word_only=False):
         )
         user_content = f"Swedish word: {word_text}"
 
-    messages = [
+    return [
         {
             "role": "system",
             "content": system_prompt
@@ -57,30 +66,138 @@ async def determine_word_level(word, limiter, fallback_to_word_only=False):
         }
     ]
 
-    await limiter.acquire()
+def can_determine_level(word, fallback_to_word_only=False):
+    return bool(word.get("translations", {}).get("ru")) or fallback_to_word_only
+
+def record_level(word, journal):
+    if journal is not None:
+        journal.record("level", word.get("id"), {"level": word["level"]})
+
+def parse_level(content):
+    level = str(json.loads(extract_json(content)).get("level", "")).lower()
+    if level not in LEVELS:
+        raise ValueError(f"no valid level in the answer: {content!r}")
+    return level
+
+def apply_level(word, content, journal=None):
+    try:
+        level = parse_level(content)
+    except ValueError:
+        level = None
+    if level:
+        word["level"] = level
+        record_level(word, journal)
+        print(f"🔤 Determined level for '{word.get('word', '')}': {level}")
+        return True
+    print(f"❌ Could not determine level for word '{word.get('word', '')}'.")
+    return False
+
+async def determine_word_level(word, scheduler, fallback_to_word_only=False, journal=None):
+    if not can_determine_level(word, fallback_to_word_only):
+        print(f"⚠️ Missing Russian translation for word '{word.get('word', '')}', cannot determine level.")
+        return False
 
     try:
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None,
-            functools.partial(
-                client.chat.completions.create,
-                model="gpt-4o",
-                messages=messages,
-                temperature=0
+        content = await scheduler.chat(level_messages(word), model="gpt-4o", temperature=0, validate=parse_level)
+        return apply_level(word, content, journal)
+    except Exception as e:
+        print(f"❌ Error during level determination: {e}")
+    return False
+
+def batch_item(word):
+    item = {"id": word.get("id"), "word": word.get("word", "")}
+    ru_text = word.get("translations", {}).get("ru", "")
+    if ru_text:
+        item["ru"] = ru_text
+    return item
+
+def item_tokens(item):
+    # Prompt tokens for the item plus roughly 20 tokens for its line in the answer.
+    return len(json.dumps(item, ensure_ascii=False)) // 3 + 20
+
+def pack_batches(words, batch_size=BATCH_SIZE, batch_tokens=BATCH_TOKENS):
+    batch, tokens = [], 0
+    for word in words:
+        cost = item_tokens(batch_item(word))
+        if batch and (len(batch) >= batch_size or tokens + cost > batch_tokens):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(word)
+        tokens += cost
+    if batch:
+        yield batch
+
+def parse_batch_levels(content):
+    """{id: level} for the items of a batch answer that carry a valid level."""
+    parsed = json.loads(extract_json_array(content))
+    levels = {}
+    for item in parsed if isinstance(parsed, list) else []:
+        if isinstance(item, dict) and str(item.get("level", "")).lower() in LEVELS:
+            levels[item.get("id")] = str(item["level"]).lower()
+    return levels
+
+async def determine_levels_batch(words, scheduler, journal=None):
+    """Classifies a batch of words in one request and returns the words that got no valid level back."""
+    items = [batch_item(word) for word in words]
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are a language proficiency assessor. You will be given a JSON array of Swedish words. Each item has an 'id', "
+                "the Swedish 'word' and, when available, its Russian translation 'ru'. Determine the CEFR language level of each word "
+                "(one of A1, A2, B1, B2, C1, C2). Reply only with a JSON array like [{\"id\": \"...\", \"level\": \"a1\"}] "
+                "with levels in lowercase and exactly one item for every id, without any markdown or additional text."
             )
+        },
+        {
+            "role": "user",
+            "content": json.dumps(items, ensure_ascii=False)
+        }
+    ]
+
+    ids = {item["id"] for item in items}
+    # Only complete answers are cached; a partial one is asked again rather than replayed on the retry.
+    try:
+        content = await scheduler.chat(
+            messages, model="gpt-4o", temperature=0, max_tokens=30 * len(items) + 50,
+            validate=lambda content: ids <= set(parse_batch_levels(content)),
         )
-        content = response.choices[0].message.content
-        cleaned = extract_json(content)
-        parsed = json.loads(cleaned)
-        level = parsed.get("level")
-        if level:
+        levels = parse_batch_levels(content)
+    except Exception as e:
+        print(f"❌ Error during batch level determination ({len(words)} words): {e}")
+        return words
+
+    pending = {word.get("id"): word for word in words}
+    for word_id, level in levels.items():
+        word = pending.pop(word_id, None)
+        if word is not None:
             word["level"] = level
-            print(f"🔤 Determined level for '{word_text}': {level}")
+            record_level(word, journal)
+            print(f"🔤 Determined level for '{word.get('word', '')}': {level}")
+    return list(pending.values())
+
+async def determine_levels_batched(words, scheduler, fallback_to_word_only=False, batch_size=BATCH_SIZE, batch_tokens=BATCH_TOKENS, journal=None):
+    pending = []
+    for word in words:
+        if not can_determine_level(word, fallback_to_word_only):
+            print(f"⚠️ Missing Russian translation for word '{word.get('word', '')}', cannot determine level.")
         else:
-            print(f"❌ Could not determine level for word '{word_text}'.")
-    except Exception as e:
-        print(f"❌ Error during level determination: {e}")
+            pending.append(word)
+
+    for attempt in range(BATCH_ATTEMPTS):
+        if not pending:
+            break
+        # Each retry packs the leftovers into smaller batches, so it is a different request than the one that failed.
+        batches = list(pack_batches(pending, max(1, batch_size >> attempt), max(1, batch_tokens >> attempt)))
+        print(f"📦 Attempt {attempt + 1}: {len(pending)} words in {len(batches)} batch requests")
+        missing = await asyncio.gather(*(determine_levels_batch(batch, scheduler, journal) for batch in batches))
+        pending = [word for batch in missing for word in batch]
+        if pending:
+            print(f"🔁 {len(pending)} words missing from batch answers, re-queuing")
+
+    # Words that repeatedly fall out of batch answers are classified one by one.
+    if pending:
+        await asyncio.gather(*(determine_word_level(word, scheduler, fallback_to_word_only, journal) for word in pending))
 
 async def main():
     parser = argparse.ArgumentParser(description="Translate a single word to multiple languages or determine word levels.")
@@ -90,6 +207,12 @@ async def main():
     parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
     parser.add_argument("--overwrite", action="store_true", default=False, help="Overwrite existing level values")
     parser.add_argument("--fallback-to-word-only", action="store_true", default=False, help="Fallback to using only the word if Russian translation is missing")
+    parser.add_argument("--batch", action="store_true", default=False, help="With --all, classify many words per request")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Maximum words per batch request")
+    parser.add_argument("--batch-tokens", type=int, default=BATCH_TOKENS, help="Token budget per batch request")
+    parser.add_argument("--journal", help="With --all, journal path (default: <file stem>.level.journal.jsonl next to the file)")
+    parser.add_argument("--no-compact", action="store_true", default=False, help="With --all, keep results in the journal instead of writing the word base")
+    RequestScheduler.add_arguments(parser)
     args = parser.parse_args()
 
     file_path = args.file
@@ -98,44 +221,74 @@ async def main():
         print(f"❌ File not found: {file_path}")
         return
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    limiter = AsyncLimiter(1, 2)
-
-    if args.id:
-        word_id = args.id
-        found_word = None
-        for category in data:
-            for word in category.get("entries", []):
-                if word.get("id") == word_id:
-                    found_word = word
-                    break
-            if found_word:
-                break
-
-        if not found_word:
-            print(f"❌ Word with ID '{word_id}' not found.")
-            return
-
-        # Check for existing level unless overwrite is specified
-        if not args.overwrite and "level" in found_word:
-            print(f"⏭️ Skipping '{found_word.get('word', '')}', already has level: {found_word['level']}")
-        else:
-            await determine_word_level(found_word, limiter, fallback_to_word_only=args.fallback_to_word_only)
+    word_base = WordBase.load(file_path)
+    journal = Journal(args.journal or default_journal_path(file_path, "level")) if args.all else None
+    # Results of an interrupted run are replayed so that finished words are not sent again.
+    done = journal.replay(word_base, job="level") if journal else set()
+    fingerprints = Fingerprints.for_base(file_path)
+    # Ids whose level was determined in this run or in the interrupted run replayed from the journal.
+    determined = set(done)
+
+    def level_is_current(word):
+        # A level is redone when the word or its Russian translation changed since it was determined.
+        return "level" in word and fingerprints.get(word.get("id"), "level") in (None, level_fingerprint(word))
+
+    async with RequestScheduler.from_args(args) as scheduler:
+        if args.id:
+            word_id = args.id
+            found_word = word_base.entry(word_id)
+
+            if not found_word:
+                print(f"❌ Word with ID '{word_id}' not found.")
+                return
 
-    elif args.all:
-        for category in data:
-            for word in category.get("entries", []):
-                if not args.overwrite and "level" in word:
+            # Check for existing level unless overwrite is specified
+            if not args.overwrite and level_is_current(found_word):
+                print(f"⏭️ Skipping '{found_word.get('word', '')}', already has level: {found_word['level']}")
+            elif await determine_word_level(found_word, scheduler, fallback_to_word_only=args.fallback_to_word_only):
+                determined.add(word_id)
+
+        elif args.all:
+            words = []
+            for _, word in word_base.entries():
+                if word.get("id") in done:
+                    continue
+                if not args.overwrite and level_is_current(word):
                     print(f"⏭️ Skipping '{word.get('word', '')}', already has level: {word['level']}")
                     continue
-                await determine_word_level(word, limiter, fallback_to_word_only=args.fallback_to_word_only)
+                words.append(word)
+            if args.batch:
+                await determine_levels_batched(
+                    words, scheduler,
+                    fallback_to_word_only=args.fallback_to_word_only,
+                    batch_size=args.batch_size,
+                    batch_tokens=args.batch_tokens,
+                    journal=journal
+                )
+            else:
+                await asyncio.gather(*(determine_word_level(word, scheduler, fallback_to_word_only=args.fallback_to_word_only, journal=journal) for word in words))
+            journal.close()
+            determined |= journal.recorded
+
+        scheduler.report()
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    for _, word in word_base.entries():
+        if "level" in word and (word.get("id") in determined or fingerprints.get(word.get("id"), "level") is None):
+            fingerprints.record(word.get("id"), "level", level_fingerprint(word))
 
-    print("✅ Word levels updated.")
+    if journal is None:
+        word_base.save()
+    elif not args.no_compact:
+        # word_base already holds the replayed and the new results, so saving it folds the journal in.
+        word_base.save()
+        journal.discard()
+    # Saved with --no-compact too: the fingerprints cover the word and its translation, not the level kept in the journal.
+    fingerprints.save()
+
+    if journal is not None and args.no_compact:
+        print(f"📒 Results kept in {journal.path}, fold them in with scripts/common/journal.py")
+    else:
+        print("✅ Word levels updated.")
 
 if __name__ == "__main__":
     asyncio.run(main())
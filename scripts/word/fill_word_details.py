@@ -1,13 +1,14 @@
 import argparse
 import json
 import asyncio
-import functools
-from aiolimiter import AsyncLimiter
-from openai import OpenAI
+import sys
+from pathlib import Path
 
-client = OpenAI()
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+from common.openai_scheduler import RequestScheduler
 
-async def generate_translation_and_details(limiter, word):
+def details_messages(word):
     prompt_all = (
         f"You are a helpful assistant specialized in Swedish. For the word '{word}', do the following:\n"
         f"\n"
@@ -24,96 +25,94 @@ async def generate_translation_and_details(limiter, word):
         f"  \"examples\": [...]\n"
         f"}}"
     )
+    return [{"role": "user", "content": prompt_all}]
+
+def parse_details(word, raw_content):
+    raw_content = raw_content.lstrip("\ufeff").strip()
+    if raw_content.startswith("```json"):
+        raw_content = raw_content[len("```json"):].strip()
+    if raw_content.endswith("```"):
+        raw_content = raw_content[:-3].strip()
+    if not raw_content:
+        print(f"❌ Empty response from OpenAI for word '{word}'")
+        return None, None, None
+    try:
+        response_json = json.loads(raw_content)
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON decode error for word '{word}': {e}")
+        print("🔎 BEGIN RAW CONTENT (repr):\n" + repr(raw_content) + "\n🔎 END RAW CONTENT")
+        return None, None, None
+    en_translation = response_json.get("en")
+    forms = response_json.get("forms", [])
+    example_sentences = response_json.get("examples", [])
+    return en_translation, forms, example_sentences
 
-    await limiter.acquire()
+async def generate_translation_and_details(scheduler, word):
     try:
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None,
-            functools.partial(
-                client.chat.completions.create,
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt_all}],
-                temperature=0.7,
-            )
+        raw_content = await scheduler.chat(
+            details_messages(word),
+            model="gpt-4o",
+            temperature=0.7,
         )
-        raw_content = response.choices[0].message.content
-        raw_content = raw_content.lstrip("\ufeff").strip()
-        if raw_content.startswith("```json"):
-            raw_content = raw_content[len("```json"):].strip()
-        if raw_content.endswith("```"):
-            raw_content = raw_content[:-3].strip()
-        if not raw_content:
-            print(f"❌ Empty response from OpenAI for word '{word}'")
-            return None, None, None
-        try:
-            response_json = json.loads(raw_content)
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON decode error for word '{word}': {e}")
-            print("🔎 BEGIN RAW CONTENT (repr):\n" + repr(raw_content) + "\n🔎 END RAW CONTENT")
-            return None, None, None
-        en_translation = response_json.get("en")
-        forms = response_json.get("forms", [])
-        example_sentences = response_json.get("examples", [])
-        return en_translation, forms, example_sentences
+        return parse_details(word, raw_content)
     except Exception as e:
         print(f"❌ Error generating details for word '{word}': {e}")
         print("🔎 BEGIN RAW CONTENT\n" + (raw_content if 'raw_content' in locals() else '(no content)') + "\n🔎 END RAW CONTENT")
         return None, None, None
 
-def find_word_by_id(data, word_id):
-    for category in data:
-        words = category.get("entries", [])
-        for word in words:
-            if word.get("id") == word_id:
-                return word
-    return None
+def apply_details(word, en_translation, forms, example_sentences):
+    if en_translation is None or example_sentences is None:
+        return False
+
+    if forms is None:
+        forms = []
+
+    print(f"✅ Setting version to 1")
+    word["version"] = 1
+
+    print(f"✅ Setting English translation to: {en_translation}")
+    translations = word.get("translations", {})
+    translations["en"] = en_translation
+    word["translations"] = translations
+
+    print(f"✅ Setting inflected forms")
+    word["forms"] = forms
+
+    print(f"✅ Setting example sentences (at least 10)")
+    word["examples"] = example_sentences
+    return True
+
+async def fill_word_details(scheduler, word):
+    return apply_details(word, *await generate_translation_and_details(scheduler, word.get("word")))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--id", required=True, help="UUID of the word to fill")
     parser.add_argument("--file", default="word.json", help="Path to the word base JSON file")
+    RequestScheduler.add_arguments(parser)
     args = parser.parse_args()
 
     print(f"🔍 Loading word base from {args.file}")
-    with open(args.file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    word_base = WordBase.load(args.file)
 
     print(f"🔍 Searching for word with ID: {args.id}")
-    word = find_word_by_id(data, args.id)
+    word = word_base.entry(args.id)
 
     if not word:
         print(f"❌ Word with ID {args.id} not found")
         exit(1)
 
     print(f"📝 Found word: {word.get('word')} (ID: {args.id})")
-    limiter = AsyncLimiter(1, 2)
 
-    en_translation, forms, example_sentences = asyncio.run(generate_translation_and_details(limiter, word.get("word")))
+    async def fill():
+        async with RequestScheduler.from_args(args) as scheduler:
+            return await fill_word_details(scheduler, word)
 
-    if en_translation is None or example_sentences is None:
+    if not asyncio.run(fill()):
         print("❌ Failed to generate word details")
         exit(1)
 
-    if forms is None:
-        forms = []
-
-    print(f"✅ Setting version to 1")
-    word["version"] = 1
-
-    print(f"✅ Setting English translation to: {en_translation}")
-    translations = word.get("translations", {})
-    translations["en"] = en_translation
-    word["translations"] = translations
-
-    print(f"✅ Setting inflected forms")
-    word["forms"] = forms
-
-    print(f"✅ Setting example sentences (at least 10)")
-    word["examples"] = example_sentences
-
     print(f"💾 Saving updated word base to {args.file}")
-    with open(args.file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    word_base.save()
 
     print("✅ Done")
@@ -1,119 +1,114 @@
-import json
-import subprocess
-import os
 from pathlib import Path
 import sys
 import argparse
 
-DEFAULT_VOICE_ID = "a1e12345-1111-4e00-aaaa-000000000001"
-
-def generate_audio(text, phoneme, output_path, voice_id, voice_config_path):
-    # Определяем провайдера по voice_id (если есть)
-    tts_script = "generate_azure_tts.py"  # по умолчанию
-    if voice_id is not None:
-        with open(voice_config_path, encoding="utf-8") as vf:
-            voices = json.load(vf)
-            voice_info = next((v for v in voices if v.get("id") == voice_id), None)
-            if voice_info:
-                provider = voice_info.get("provider")
-                if provider == "azure":
-                    tts_script = "./scripts/sound/generate_azure_tts.py"
-                elif provider == "aws":
-                    tts_script = "./scripts/sound/generate_aws_tts.py"
-    command = [sys.executable, tts_script, text, str(output_path)]
-    if phoneme:
-        command += ["--phoneme", phoneme]
-    subprocess.run(command, check=True)
-
-def main(input_path, audio_dir, voice_config, category_filter=None, overwrite=False, single_id=None):
-    from copy import deepcopy
-    with open(input_path, encoding="utf-8") as f:
-        data = json.load(f)
-    original_data = deepcopy(data)
-
-    if single_id:
-        data = [category for category in data if any(entry["id"] == single_id for entry in category["entries"])]
-        for category in data:
-            category["entries"] = [entry for entry in category["entries"] if entry["id"] == single_id]
-
-    for category in data:
-        category_id = category["id"]
-        category_name = category.get("translations", {}).get("ru") or category.get("translations", {}).get("en") or "Unnamed"
-
-        if category_filter and category_name not in category_filter:
-            continue
-
-        for entry in category["entries"]:
-            word_base = entry["id"]
-            word = entry["word"]
-            phoneme = entry.get("phoneme")
-            version = entry.get("version", -1)
-            voice_entries = entry.get("voiceEntries")
-
-            if version > -1 and not voice_entries:
-                voice_entries = [DEFAULT_VOICE_ID]
-                entry["voiceEntries"] = voice_entries
-
-            voice_id = voice_entries[0] if version > -1 and voice_entries else DEFAULT_VOICE_ID
-            base_path = Path(audio_dir) / category_id
-            if version > -1:
-                base_path = base_path / word_base / str(version) / str(voice_id)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_stream import iter_entries, rewrite_entries
+from common.audio_inventory import AudioInventory
+from common.fingerprints import Fingerprints, clip_fingerprints
+from common.audio_layout import DEFAULT_VOICE_ID, entry_audio_dir, entry_clips, entry_voice_id
+from sound.tts_engine import TTSEngine
+from sound.audio_store import AudioStore, DEFAULT_STORE_PATH
+
+CLIP_KINDS = {"word": "слова", "form": "формы", "example": "примера"}
+
+def generate_entry_audio(engine, category_id, entry, audio_dir, overwrite=False, inventory=None, force=()):
+    if entry.get("version", -1) > -1 and not entry.get("voiceEntries"):
+        entry["voiceEntries"] = [DEFAULT_VOICE_ID]
+
+    voice_id = entry_voice_id(entry) or DEFAULT_VOICE_ID
+    try:
+        engine.voice(voice_id)
+    except ValueError as e:
+        print(f"❌ Пропуск '{entry.get('word')}': {e}")
+        return False
+    base_path = entry_audio_dir(audio_dir, category_id, entry)
+    # С инвентарём наличие файлов берётся из одного сканирования дерева, а не из exists() на каждый клип
+    if inventory is None:
+        base_path.mkdir(parents=True, exist_ok=True)
+        existing = {path.name for path in base_path.iterdir()}
+    else:
+        if not inventory.has_dir(base_path):
             base_path.mkdir(parents=True, exist_ok=True)
-
-            # Основное слово
-            word_filename = f"{word_base}.mp3"
-            word_output_path = base_path / word_filename
-            if not word_output_path.exists() or overwrite:
-                try:
-                    print(f"▶️ Генерация слова: {word_output_path}")
-                    generate_audio(word, phoneme, word_output_path, voice_id, voice_config)
-                except subprocess.CalledProcessError as e:
-                    print(f"⚠️ Ошибка генерации для слова '{word}': {e}")
-            else:
-                print(f"✅ Уже существует: {word_output_path}")
-
-            # Формы
-            for index, form in enumerate(entry.get("forms", [])):
-                form_text = form["form"]
-                form_phoneme = form.get("phoneme")
-                form_filename = f"{word_base}_form{index + 1}.mp3"
-                form_output_path = base_path / form_filename
-                if not form_output_path.exists() or overwrite:
-                    try:
-                        print(f"▶️ Генерация формы: {form_output_path}")
-                        generate_audio(form_text, form_phoneme, form_output_path, voice_id, voice_config)
-                    except subprocess.CalledProcessError as e:
-                        print(f"⚠️ Ошибка генерации формы '{form_text}': {e}")
-                else:
-                    print(f"✅ Уже существует: {form_output_path}")
-
-            # Примеры
-            for index, example in enumerate(entry.get("examples", [])):
-                example_text = example["text"]
-                example_phoneme = example.get("phoneme")
-                example_filename = f"{word_base}_ex{index + 1}.mp3"
-                example_output_path = base_path / example_filename
-                if not example_output_path.exists() or overwrite:
-                    try:
-                        print(f"▶️ Генерация примера: {example_output_path}")
-                        generate_audio(example_text, example_phoneme, example_output_path, voice_id, voice_config)
-                    except subprocess.CalledProcessError as e:
-                        print(f"⚠️ Ошибка генерации примера '{example_text}': {e}")
-                else:
-                    print(f"✅ Уже существует: {example_output_path}")
-
-    # Обновление только voiceEntries без перезаписи других данных
-    for category in data:
-        original_category = next((c for c in original_data if c["id"] == category["id"]), None)
-        if not original_category:
+        existing = inventory.files_in(base_path)
+
+    # Все клипы слова синтезируются параллельно через общие соединения движка
+    pending = []
+    for kind, _, text, phoneme, file_name in entry_clips(entry):
+        kind, output_path = CLIP_KINDS[kind], base_path / file_name
+        if file_name not in existing or overwrite or file_name in force:
+            print(f"▶️ Генерация {kind}: {output_path}")
+            pending.append((kind, text, engine.submit(text, phoneme, output_path, voice_id)))
+        else:
+            print(f"✅ Уже существует: {output_path}")
+
+    failed = 0
+    for kind, text, future in pending:
+        try:
+            output_path = future.result()
+            if inventory is not None:
+                inventory.add(output_path)
+            print(f"✅ Audio saved: {output_path}")
+        except Exception as e:
+            print(f"⚠️ Ошибка генерации {kind} '{text}': {e}")
+            failed += 1
+    return failed == 0
+
+def category_name(category):
+    return category.get("translations", {}).get("ru") or category.get("translations", {}).get("en") or "Unnamed"
+
+def selected_entries(input_path, category_filter=None, single_id=None):
+    for category, entry in iter_entries(input_path):
+        if single_id and entry["id"] != single_id:
             continue
-        for entry in category.get("entries", []):
-            original_entry = next((e for e in original_category.get("entries", []) if e["id"] == entry["id"]), None)
-            if original_entry:
-                original_entry["voiceEntries"] = entry.get("voiceEntries", [])
-
-    with open(input_path, "w", encoding="utf-8") as f:
-        json.dump(original_data, f, ensure_ascii=False, indent=2)
+        if category_filter and category_name(category) not in category_filter:
+            continue
+        yield category, entry
+        if single_id:
+            return
+
+def apply_entry_patch(input_path, patch):
+    """Writes {entry id: {field: value}} into the base in one streaming pass."""
+    def patched(_, entry):
+        entry.update(patch.get(entry["id"], {}))
+        return entry
+
+    rewrite_entries(input_path, input_path, patched)
+
+def changed_clips(fingerprints, entry):
+    """Clips whose text or phoneme changed since they were generated; new clips are simply missing files."""
+    stored = fingerprints.get(entry["id"], "audio") or {}
+    return {name for name, value in clip_fingerprints(entry).items() if name in stored and stored[name] != value}
+
+def main(input_path, audio_dir, voice_config, category_filter=None, overwrite=False, single_id=None, tts_concurrency=None, audio_store=None):
+    inventory = AudioInventory.load(audio_dir)
+    fingerprints = Fingerprints.for_base(input_path)
+    # База читается потоково; изменения voiceEntries и version копятся в небольшом патче по id записи
+    patch = {}
+    with TTSEngine(voice_config, concurrency=tts_concurrency, store=audio_store) as engine:
+        for category, entry in selected_entries(input_path, category_filter, single_id):
+            before = {"voiceEntries": entry.get("voiceEntries"), "version": entry.get("version")}
+            force = changed_clips(fingerprints, entry)
+            if force and entry.get("version", -1) > -1:
+                # Изменился текст клипа: новая версия, чтобы приложение не играло старый закэшированный файл
+                entry["version"] += 1
+                print(f"🆕 '{entry['word']}': изменились {len(force)} клипов, версия {entry['version']}")
+            if generate_entry_audio(engine, category["id"], entry, audio_dir, overwrite, inventory, force):
+                fingerprints.record(entry["id"], "audio", clip_fingerprints(entry))
+            elif entry.get("version") != before["version"]:
+                # Без полного набора клипов новая версия не публикуется; следующий запуск повторит попытку
+                entry["version"] = before["version"]
+            changes = {key: entry.get(key) for key, value in before.items() if entry.get(key) != value}
+            if changes:
+                patch[entry["id"]] = changes
+    engine.report()
+    inventory.report()
+    inventory.save()
+
+    if patch:
+        apply_entry_patch(input_path, patch)
+        print(f"📝 voiceEntries и version обновлены у {len(patch)} записей")
+    fingerprints.save()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate audio for words, forms, and examples.")
@@ -123,6 +118,10 @@ if __name__ == "__main__":
     parser.add_argument("--categories", nargs="*", help="List of category names (by name)")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing files")
     parser.add_argument("--id", help="Generate audio only for a specific word by ID")
+    parser.add_argument("--azure-concurrency", type=int, default=8, help="Parallel requests to Azure TTS")
+    parser.add_argument("--aws-concurrency", type=int, default=4, help="Parallel requests to AWS Polly")
+    parser.add_argument("--audio-store", default=DEFAULT_STORE_PATH, help="Content-addressed store of synthesized clips")
+    parser.add_argument("--no-audio-store", action="store_true", help="Always call the TTS provider, bypassing the audio store")
     args = parser.parse_args()
 
     main(
@@ -131,5 +130,7 @@ if __name__ == "__main__":
         voice_config=args.voice_config,
         category_filter=args.categories,
         overwrite=args.overwrite,
-        single_id=args.id
+        single_id=args.id,
+        tts_concurrency={"azure": args.azure_concurrency, "aws": args.aws_concurrency},
+        audio_store=None if args.no_audio_store else AudioStore(args.audio_store)
     )
@@ -1,13 +1,14 @@
 import argparse
 import json
 import asyncio
-import functools
 import os
-from aiolimiter import AsyncLimiter
-from openai import OpenAI
+import sys
+from pathlib import Path
 import re
 
-client = OpenAI()
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.word_base import WordBase
+from common.openai_scheduler import RequestScheduler
 TARGET_LANGS = ["uk", "ar", "fa", "so", "es", "de", "fr", "pl", "id", "hi", "zh", "it", "tr", "sr", "fi", "et", "be", "lv", "lt", "ru"]
 
 def extract_json(text):
@@ -22,17 +23,9 @@ def merge_translations(existing, new):
             existing[lang] = translation
     return existing
 
-async def translate_word_only(word, limiter):
-    word_text = word.get("word", "")
+def translation_messages(word):
     translations = word.get("translations", {})
-    en_text = translations.get("en", "")
-    ru_text = translations.get("ru", "")
-
-    if not en_text:
-        print(f"⚠️ Missing English translation for word '{word_text}', cannot proceed.")
-        return
-
-    messages = [
+    return [
         {
             "role": "system",
             "content": (
@@ -44,35 +37,39 @@ async def translate_word_only(word, limiter):
         },
         {
             "role": "user",
-            "content": f"Swedish word: {word_text}\nEnglish: {en_text}\nRussian: {ru_text}"
+            "content": f"Swedish word: {word.get('word', '')}\nEnglish: {translations.get('en', '')}\nRussian: {translations.get('ru', '')}"
         }
     ]
 
-    await limiter.acquire()
+def parse_translations(content):
+    parsed = json.loads(extract_json(content))
+    if not isinstance(parsed, dict):
+        raise ValueError("the answer is not a JSON dictionary")
+    return parsed
+
+def apply_translations(word, content):
+    parsed = parse_translations(content)
+    print(f"🌍 New translations: {parsed}")
+    word["translations"] = merge_translations(word.get("translations", {}), parsed)
+    return True
+
+async def translate_word_only(word, scheduler):
+    if not word.get("translations", {}).get("en"):
+        print(f"⚠️ Missing English translation for word '{word.get('word', '')}', cannot proceed.")
+        return False
 
     try:
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None,
-            functools.partial(
-                client.chat.completions.create,
-                model="gpt-4o",
-                messages=messages,
-                temperature=0
-            )
-        )
-        content = response.choices[0].message.content
-        cleaned = extract_json(content)
-        parsed = json.loads(cleaned)
-        print(f"🌍 New translations: {parsed}")
-        word["translations"] = merge_translations(translations, parsed)
+        content = await scheduler.chat(translation_messages(word), model="gpt-4o", temperature=0, validate=parse_translations)
+        return apply_translations(word, content)
     except Exception as e:
         print(f"❌ Error during translation: {e}")
+        return False
 
 async def main():
     parser = argparse.ArgumentParser(description="Translate a single word to multiple languages.")
     parser.add_argument("--id", required=True, help="UUID of the word")
     parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    RequestScheduler.add_arguments(parser)
     args = parser.parse_args()
 
     file_path = args.file
@@ -82,27 +79,18 @@ async def main():
         print(f"❌ File not found: {file_path}")
         return
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    word_base = WordBase.load(file_path)
 
-    found_word = None
-    for category in data:
-        for word in category.get("entries", []):
-            if word.get("id") == word_id:
-                found_word = word
-                break
-        if found_word:
-            break
+    found_word = word_base.entry(word_id)
 
     if not found_word:
         print(f"❌ Word with ID '{word_id}' not found.")
         return
 
-    limiter = AsyncLimiter(1, 2)
-    await translate_word_only(found_word, limiter)
+    async with RequestScheduler.from_args(args) as scheduler:
+        await translate_word_only(found_word, scheduler)
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    word_base.save()
 
     print("✅ Word translations updated.")
 
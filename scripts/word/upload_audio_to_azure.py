@@ -0,0 +1,67 @@
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.blob_storage import (
+    BlobUploader,
+    add_storage_arguments,
+    blob_name,
+    container_client_from_args,
+)
+from common.audio_inventory import AudioInventory
+from common.blob_sync import add_sync_arguments, sync_from_args
+
+
+def word_files(source_dir, word_ids):
+    """mp3 files of the given word ids, for any version and voice, looked up in the cached audio inventory."""
+    inventory = AudioInventory.load(source_dir)
+    inventory.save()
+    for word_id in word_ids:
+        for path in inventory.entry_paths(word_id):
+            yield Path(source_dir) / path
+
+
+def collect_files(args):
+    source_dir = Path(args.source_dir)
+    if args.file:
+        if args.blob_name:
+            return [(Path(args.file), args.blob_name)]
+        paths = [Path(args.file)]
+    elif args.id:
+        paths = list(word_files(source_dir, args.id))
+        if not paths:
+            print(f"⚠️ No files found for id(s): {', '.join(args.id)}")
+    else:
+        inventory = AudioInventory.load(source_dir)
+        inventory.save()
+        paths = [source_dir / path for path in inventory.paths()]
+    return [(path, blob_name(path, source_dir)) for path in paths]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload audio files to Azure Blob Storage in parallel.")
+    parser.add_argument("--source_dir", default="./resources/audio", help="Local audio directory; blob names are relative to it")
+    parser.add_argument("--id", action="append", help="Upload only files of this word id (repeatable)")
+    parser.add_argument("--file", help="Upload a single file")
+    parser.add_argument("--blob-name", help="With --file, the blob name to upload it as (default: its path relative to --source_dir)")
+    parser.add_argument("--overwrite", action="store_true", help="Replace blobs that already exist")
+    parser.add_argument("--sync", action="store_true", help="Upload only new or changed files, tracked in a local manifest")
+    add_storage_arguments(parser, container="audio")
+    add_sync_arguments(parser)
+    args = parser.parse_args()
+
+    if args.sync:
+        sys.exit(1 if sync_from_args(args, args.source_dir, (".mp3",)) else 0)
+
+    if args.blob_name and not args.file:
+        parser.error("--blob-name requires --file")
+    try:
+        files = collect_files(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"🚀 Uploading {len(files)} mp3 files to container '{args.container}'...")
+    uploader = BlobUploader(container_client_from_args(args), concurrency=args.concurrency, overwrite=args.overwrite)
+    uploader.upload_all(files)
+    sys.exit(1 if uploader.stats["failed"] else 0)
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.audio_inventory import AudioInventory, clip_entry_id
+from common.audio_layout import entry_audio_dir, entry_clips
+from common.word_stream import iter_categories
+
+CEFR_LEVELS = {"a1", "a2", "b1", "b2", "c1", "c2"}
+DEFAULT_WORKERS = 16
+
+
+def is_uuid(value):
+    if not isinstance(value, str):
+        return False
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def is_string_map(value):
+    return isinstance(value, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in value.items())
+
+
+def is_optional_string(value):
+    return value is None or isinstance(value, str)
+
+
+def entry_schema_errors(entry):
+    """Fields that would make JSONDecoder fail on the Swift WordEntry model."""
+    if not isinstance(entry, dict):
+        return ["entry is not an object"]
+    errors = []
+    if not is_uuid(entry.get("id")):
+        errors.append("id is not a UUID")
+    if not isinstance(entry.get("word"), str):
+        errors.append("word is not a string")
+    if not isinstance(entry.get("version"), int) or isinstance(entry.get("version"), bool):
+        errors.append("version is not an integer")
+    voice_entries = entry.get("voiceEntries")
+    if voice_entries is not None and not (isinstance(voice_entries, list) and all(is_uuid(v) for v in voice_entries)):
+        errors.append("voiceEntries is not a list of UUIDs")
+    forms = entry.get("forms")
+    if forms is not None and not (
+        isinstance(forms, list)
+        and all(isinstance(f, dict) and isinstance(f.get("form"), str) and is_optional_string(f.get("phoneme")) for f in forms)
+    ):
+        errors.append("forms is not a list of {form, phoneme?}")
+    if not is_string_map(entry.get("translations")):
+        errors.append("translations is not a string map")
+    if entry.get("level") is not None and entry.get("level") not in CEFR_LEVELS:
+        errors.append(f"level '{entry.get('level')}' is not a CEFRLevel")
+    examples = entry.get("examples")
+    if not (
+        isinstance(examples, list)
+        and all(isinstance(e, dict) and isinstance(e.get("text"), str) and is_optional_string(e.get("phoneme")) for e in examples)
+    ):
+        errors.append("examples is not a list of {text, phoneme?}")
+    if not is_optional_string(entry.get("phoneme")):
+        errors.append("phoneme is not a string")
+    return errors
+
+
+def category_schema_errors(category):
+    errors = []
+    if not is_uuid(category.get("id")):
+        errors.append("id is not a UUID")
+    if not is_string_map(category.get("translations")):
+        errors.append("translations is not a string map")
+    return errors
+
+
+def list_files(root, suffix):
+    """Relative posix paths of all files with the suffix under root."""
+    found = set()
+    stack = [Path(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.is_dir(follow_symlinks=False):
+                        stack.append(Path(item.path))
+                    elif item.name.endswith(suffix):
+                        found.add(Path(item.path).relative_to(root).as_posix())
+        except FileNotFoundError:
+            pass
+    return found
+
+
+def list_tree(root, suffix, workers):
+    """Lists every top-level directory of root in parallel; returns {top-level dir: {relative paths}}."""
+    root = Path(root)
+    with os.scandir(root) as it:
+        top_dirs = [item.name for item in it if item.is_dir(follow_symlinks=False)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        listings = executor.map(lambda name: {f"{name}/{path}" for path in list_files(root / name, suffix)}, top_dirs)
+        return dict(zip(top_dirs, listings))
+
+
+class Validator:
+    """Checks word.json, voice.json, the audio tree and the image tree in one pass over the base."""
+
+    def __init__(self, audio_dir=None, images_dir=None, voice_ids=None):
+        self.audio_dir = Path(audio_dir) if audio_dir else None
+        self.images_dir = Path(images_dir) if images_dir else None
+        self.voice_ids = voice_ids
+        self.issues = []
+        self.stats = {"categories": 0, "entries": 0, "clips": 0}
+        self.unchecked_entry_ids = set()
+
+    def issue(self, severity, code, message, category=None, entry=None, path=None):
+        self.issues.append({
+            "severity": severity, "code": code, "message": message,
+            "category": category, "entry": entry, "path": path,
+        })
+
+    def run(self, input_path, workers=DEFAULT_WORKERS):
+        # The file system is listed in the background while the base is streamed.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            audio_listing = executor.submit(self.load_audio_inventory, workers) if self.audio_dir else None
+            image_listing = executor.submit(list_tree, self.images_dir, ".png", workers) if self.images_dir else None
+            expected_audio, category_ids, entry_ids = self.check_base(input_path)
+            if audio_listing is not None:
+                self.check_audio(expected_audio, audio_listing.result())
+            if image_listing is not None:
+                self.check_images(category_ids, entry_ids, image_listing.result())
+        return self.issues
+
+    def load_audio_inventory(self, workers):
+        inventory = AudioInventory.load(self.audio_dir, workers=workers)
+        inventory.save()
+        return set(inventory.paths())
+
+    def check_base(self, input_path):
+        expected_audio = {}
+        category_ids, entry_ids = set(), {}
+        for category, entries in iter_categories(input_path):
+            self.stats["categories"] += 1
+            category_id = category.get("id")
+            for error in category_schema_errors(category):
+                self.issue("error", "schema", f"category: {error}", category=category_id)
+            if category_id in category_ids:
+                self.issue("error", "duplicate_category_id", f"category id {category_id} is used more than once", category=category_id)
+            category_ids.add(category_id)
+            for entry in entries:
+                self.stats["entries"] += 1
+                errors = entry_schema_errors(entry)
+                entry_id = entry.get("id") if isinstance(entry, dict) else None
+                for error in errors:
+                    self.issue("error", "schema", f"entry '{entry.get('word') if isinstance(entry, dict) else ''}': {error}", category=category_id, entry=entry_id)
+                if entry_id in entry_ids:
+                    self.issue(
+                        "error", "duplicate_entry_id",
+                        f"entry id {entry_id} is in categories {entry_ids[entry_id]} and {category_id}",
+                        category=category_id, entry=entry_id,
+                    )
+                    continue
+                entry_ids[entry_id] = category_id
+                if errors:
+                    # Their clips cannot be listed, but they are not orphans either.
+                    self.unchecked_entry_ids.add(entry_id)
+                    continue
+                for voice_id in entry.get("voiceEntries") or []:
+                    if self.voice_ids is not None and voice_id not in self.voice_ids:
+                        self.issue("error", "unknown_voice", f"voiceEntries id {voice_id} is not in voice.json", category=category_id, entry=entry_id)
+                if self.audio_dir and is_uuid(category_id):
+                    if entry.get("version", -1) > -1 and not entry.get("voiceEntries"):
+                        self.issue("warning", "missing_voice_entries", "versioned entry has no voiceEntries", category=category_id, entry=entry_id)
+                    directory = entry_audio_dir("", category_id, entry).as_posix()
+                    for _, _, _, _, file_name in entry_clips(entry):
+                        expected_audio[f"{directory}/{file_name}"] = (category_id, entry_id)
+        self.stats["clips"] = len(expected_audio)
+        return expected_audio, category_ids, entry_ids
+
+    def check_audio(self, expected_audio, present):
+        for path, (category_id, entry_id) in expected_audio.items():
+            if path not in present:
+                self.issue("error", "missing_audio", "clip is missing", category=category_id, entry=entry_id, path=path)
+        for path in sorted(present - expected_audio.keys()):
+            if clip_entry_id(path) in self.unchecked_entry_ids:
+                continue
+            self.issue("warning", "orphan_audio", "clip belongs to no word, form or example", category=path.split("/", 1)[0], path=path)
+
+    def check_images(self, category_ids, entry_ids, listing):
+        for category_id in sorted(category_ids - listing.keys(), key=str):
+            self.issue("warning", "missing_category_images", "category has no image directory", category=category_id)
+        for paths in listing.values():
+            for path in sorted(paths):
+                category_id, _, file_name = path.partition("/")
+                entry_id = file_name[: -len(".png")]
+                if entry_ids.get(entry_id) != category_id:
+                    self.issue("warning", "orphan_image", "image belongs to no entry of this category", category=category_id, path=path)
+
+    def summary(self):
+        counts = {}
+        for issue in self.issues:
+            counts[issue["code"]] = counts.get(issue["code"], 0) + 1
+        return dict(self.stats, errors=sum(i["severity"] == "error" for i in self.issues),
+                    warnings=sum(i["severity"] == "warning" for i in self.issues), by_code=counts)
+
+
+def load_voice_ids(path):
+    with open(path, encoding="utf-8") as f:
+        return {voice["id"] for voice in json.load(f)}
+
+
+def print_text(summary, issues, limit):
+    for issue in issues[:limit]:
+        icon = "❌" if issue["severity"] == "error" else "⚠️"
+        where = " ".join(f"{key}={issue[key]}" for key in ("category", "entry", "path") if issue[key])
+        print(f"{icon} {issue['code']}: {issue['message']} ({where})")
+    if len(issues) > limit:
+        print(f"… {len(issues) - limit} more issues, use --format json to get all of them")
+    print(
+        f"🔍 {summary['categories']} categories, {summary['entries']} entries, {summary['clips']} clips checked: "
+        f"{summary['errors']} errors, {summary['warnings']} warnings"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the word base, voices, audio tree and category images.")
+    parser.add_argument("--file", default="resources/word.json", help="Path to the word base JSON file")
+    parser.add_argument("--voice_config", default="resources/voice.json", help="Voice configuration file")
+    parser.add_argument("--audio_dir", default="resources/audio", help="Audio tree to check against the base")
+    parser.add_argument("--images_dir", default="resources/images", help="Category image tree")
+    parser.add_argument("--no-audio", action="store_true", help="Skip audio checks")
+    parser.add_argument("--no-images", action="store_true", help="Skip image checks")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero on warnings too")
+    parser.add_argument("--limit", type=int, default=200, help="Issues to print in text format")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel directory listings")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    audio_dir, images_dir = None, None
+    if not args.no_audio:
+        if os.path.isdir(args.audio_dir):
+            audio_dir = args.audio_dir
+        else:
+            print(f"⚠️ Audio directory not found, skipping audio checks: {args.audio_dir}", file=sys.stderr)
+    if not args.no_images:
+        if os.path.isdir(args.images_dir):
+            images_dir = args.images_dir
+        else:
+            print(f"⚠️ Images directory not found, skipping image checks: {args.images_dir}", file=sys.stderr)
+
+    try:
+        validator = Validator(audio_dir, images_dir, load_voice_ids(args.voice_config))
+        issues = validator.run(args.file, workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read the input: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    summary = validator.summary()
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    if args.format == "json":
+        json.dump({"summary": summary, "issues": issues}, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_text(summary, issues, args.limit)
+
+    failed = summary["errors"] or (args.strict and summary["warnings"])
+    sys.exit(1 if failed else 0)